@@ -11,6 +11,7 @@
 """
 This file contains simple to use functionalities for creating
 Kratos input based on Salome meshes.
+Meshes that were exported to DAT or MED files can be used without Salome (see "DatMesh" and "MedMesh")
 """
 
 # python imports
@@ -23,12 +24,22 @@ import logging
 os.environ["KRATOS_SALOME_PLUGIN_LOG_FILE_PATH"] = os.getcwd()
 
 # plugin imports
-from kratos_salome_plugin.model_part import ModelPart
+from kratos_salome_plugin.model_part import ModelPart, numpy_available
 from kratos_salome_plugin import geometries_io
-from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin.dat_mesh_interface import DatMeshInterface
+from kratos_salome_plugin.med_mesh_interface import MedMeshInterface
 from kratos_salome_plugin.write_mdpa import WriteMdpa
-from kratos_salome_plugin import salome_utilities
-from kratos_salome_plugin import salome_mesh_utilities
+from kratos_salome_plugin.stream_mdpa import StreamMeshesToMdpa
+from kratos_salome_plugin.mesh_disk_cache import MeshDiskCache, DEFAULT_MAX_CACHE_SIZE
+
+# salome imports (not needed when using meshes from DAT files)
+try:
+    from kratos_salome_plugin.mesh_interface import MeshInterface
+    from kratos_salome_plugin import salome_utilities
+    from kratos_salome_plugin import salome_mesh_utilities
+    salome_available = True
+except ImportError:
+    salome_available = False
 
 logger = logging.getLogger(__name__) # done after importing the plugin, which initializes the logging
 
@@ -36,12 +47,15 @@ logger = logging.getLogger(__name__) # done after importing the plugin, which in
 class SalomeMesh(geometries_io.Mesh):
     """Specialized version of Mesh to make access to Salome-meshes easier"""
 
-    def __init__(self, salome_mesh, mesh_description, model_part_name=""):
+    def __init__(self, salome_mesh, mesh_description, model_part_name="", disk_cache=None):
         """Keyword arguments:
         salome_mesh -- the Salome mesh to access. Depending on the type the corresponding conversion is performed before creating a MeshInterface that is then passed to the base class
         mesh_description -- see base class
         model_part_name -- see base class
+        disk_cache -- a cache in which the extracted mesh is stored, such that unchanged meshes are not extracted again (see "CreateMeshDiskCache")
         """
+        if not salome_available:
+            raise ImportError('Salome is required for using meshes from Salome, use "DatMesh" for meshes exported to DAT files!')
 
         if isinstance(salome_mesh, str):
             mesh_identifier = salome_mesh
@@ -54,22 +68,79 @@ class SalomeMesh(geometries_io.Mesh):
             err_msg += 'No mesh can be retrieved from this input!'.format(type(salome_mesh))
             raise Exception(err_msg)
 
-        mesh_interface = MeshInterface(mesh_identifier)
+        mesh_interface = MeshInterface(mesh_identifier, disk_cache=disk_cache)
 
         super().__init__(mesh_interface, mesh_description, model_part_name)
 
 
-def CreateModelPart(meshes):
-    """Creates a ModelPart given meshes as input"""
+class DatMesh(geometries_io.Mesh):
+    """Specialized version of Mesh for meshes that were exported from Salome to DAT files ("ExportDAT")
+    This does not require Salome
+    """
+
+    def __init__(self, file_name, mesh_description, model_part_name="", main_mesh_file_name=None):
+        """Keyword arguments:
+        file_name -- the DAT file containing the mesh
+        mesh_description -- see base class
+        model_part_name -- see base class
+        main_mesh_file_name -- the DAT file of the main mesh, see "DatMeshInterface"
+        """
+        mesh_interface = DatMeshInterface(file_name, main_mesh_file_name)
+
+        super().__init__(mesh_interface, mesh_description, model_part_name)
+
+
+class MedMesh(geometries_io.Mesh):
+    """Specialized version of Mesh for meshes (or groups of meshes) in MED files
+    This does not require Salome, but h5py
+    """
+
+    def __init__(self, file_name, mesh_description, model_part_name="", group_name=None, mesh_name=None):
+        """Keyword arguments:
+        file_name -- the MED file containing the mesh
+        mesh_description -- see base class
+        model_part_name -- see base class
+        group_name -- the name of the group in the mesh, by default the entire mesh is used
+        mesh_name -- the name of the mesh, only required if the file contains more than one mesh
+        """
+        mesh_interface = MedMeshInterface(file_name, group_name, mesh_name)
+
+        super().__init__(mesh_interface, mesh_description, model_part_name)
+
+
+def CreateMeshDiskCache(study_file_name, max_size=DEFAULT_MAX_CACHE_SIZE):
+    """Creates a cache for the extracted meshes in a directory next to the study (e.g. "my_study_mesh_cache" for "my_study.hdf")
+    It can be used for the SalomeMeshes, such that meshes that did not change are not extracted again when the script is executed again
+    The least recently used meshes are removed if the size of the cache (in bytes) exceeds "max_size"
+    """
+    return MeshDiskCache(os.path.splitext(study_file_name)[0] + "_mesh_cache", max_size)
+
+
+def CreateModelPart(meshes, use_array_storage=False):
+    """Creates a ModelPart given meshes as input
+    If "use_array_storage" is True then the entities are stored in arrays (requires NumPy), this is much faster
+    and uses less memory, but the nodes and geometrical objects are views into the arrays (see "ModelPart")
+    """
     logger.debug('Calling "CreateModelPart"')
-    model_part = ModelPart()
+    model_part = ModelPart(use_array_storage=use_array_storage)
     geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
 
     return model_part
 
 
-def CreateMdpaFile(meshes, mdpa_file_name):
-    """Creates a mdpa-file given meshes as input"""
+def CreateMdpaFile(meshes, mdpa_file_name, streaming=False, dry_run=False):
+    """Creates a mdpa-file given meshes as input
+    If "streaming" is True then the entities are written directly to the file without creating a ModelPart,
+    this requires much less memory (see "stream_mdpa.StreamMeshesToMdpa")
+    If "dry_run" is True then neither the meshes are extracted nor the file is written, only the expected number
+    of entities and the estimated memory are reported and returned (see "geometries_io.GeometriesIO.DryRun")
+    """
     logger.debug('Calling "CreateMdpaFile"')
-    model_part = CreateModelPart(meshes)
-    WriteMdpa(model_part, mdpa_file_name)
+    if dry_run:
+        return geometries_io.GeometriesIO.DryRun(meshes)
+    if streaming:
+        StreamMeshesToMdpa(meshes, mdpa_file_name)
+    else:
+        # the ModelPart is only used for writing, hence the entities are stored in arrays if possible
+        model_part = CreateModelPart(meshes, use_array_storage=numpy_available)
+        WriteMdpa(model_part, mdpa_file_name)
@@ -0,0 +1,77 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+'''Script to measure how requesting the entities separately from Salome scales with the number of threads
+This shows from which number of threads on the server of Salome (CORBA) stops scaling
+It has to be executed in Salome:
+Usage: salome -t benchmark_mesh_extraction.py args:[max_mesh_size],[max_num_workers],[chunk_size]
+The number of threads is doubled until max_num_workers is reached
+'''
+
+# python imports
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# salome imports
+import salome
+salome.salome_init()
+import GEOM
+from salome.geom import geomBuilder
+import SMESH
+from salome.smesh import smeshBuilder
+
+# plugin imports
+from kratos_salome_plugin import mesh_interface
+
+
+def CreateMesh(max_mesh_size):
+    geompy = geomBuilder.New()
+    box = geompy.MakeBoxDXDYDZ(200, 200, 200)
+
+    smesh = smeshBuilder.New()
+    mesh = smesh.Mesh(box)
+    mesh.Segment().MaxSize(max_mesh_size)
+    mesh.Triangle()
+    mesh.Tetrahedron()
+    mesh.Compute()
+
+    return mesh
+
+
+def RunBenchmark(mesh, num_workers, chunk_size):
+    node_ids = mesh.GetNodesId()
+    tetra_ids = mesh.GetIdsFromFilter(smeshBuilder.New().GetFilter(SMESH.ALL, SMESH.FT_EntityType, '=', SMESH.Entity_Tetra))
+
+    start_time = time.time()
+    with mesh_interface._EntitiesRequests(num_workers, chunk_size) as requests:
+        requested_nodes = requests.Submit(mesh.GetNodeXYZ, node_ids)
+        requested_tetras = requests.Submit(mesh.GetElemNodes, tetra_ids)
+        requested_nodes.Results()
+        requested_tetras.Results()
+    duration = time.time() - start_time
+
+    num_requests = len(node_ids) + len(tetra_ids)
+    print('Workers: {:>2} | Chunk size: {:>6} | Nodes: {:>8} | Tetras: {:>8} | Time: {:7.2f} s | Throughput: {:8.0f} requests/s'.format(
+        num_workers, chunk_size, len(node_ids), len(tetra_ids), duration, num_requests/duration))
+
+
+if __name__ == '__main__':
+    max_mesh_size = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    max_num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else mesh_interface.REQUESTS_CHUNK_SIZE
+
+    mesh = CreateMesh(max_mesh_size)
+    num_workers = 1
+    while num_workers <= max_num_workers:
+        RunBenchmark(mesh, num_workers, chunk_size)
+        num_workers *= 2
@@ -0,0 +1,75 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+'''Script to measure the throughput (in MB/s) of writing mdpa files
+Usage: python benchmark_write_mdpa.py [num_nodes] [max_num_workers]
+The number of processes used for writing is doubled until max_num_workers is reached
+'''
+
+# python imports
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# plugin imports
+from kratos_salome_plugin.model_part import ModelPart, numpy_available
+from kratos_salome_plugin.write_mdpa import WriteMdpa
+
+
+def CreateModelPart(num_nodes, use_array_storage):
+    # creating a ModelPart similar to a tetrahedral mesh (~5 elements per node)
+    random.seed(42)
+    model_part = ModelPart(use_array_storage=use_array_storage)
+    props = model_part.CreateNewProperties(1)
+    smp = model_part.CreateSubModelPart("domain")
+
+    node_ids = list(range(1, num_nodes+1))
+    coordinates = [[random.uniform(-100, 100) for _ in range(3)] for _ in node_ids]
+    model_part.CreateNewNodes(node_ids, coordinates)
+
+    num_elements = 5*num_nodes
+    element_ids = list(range(1, num_elements+1))
+    connectivities = [random.sample(node_ids[max(0, i//5-20):i//5+20], 4) for i in range(num_elements)]
+    smp.CreateNewElements("Element3D4N", element_ids, connectivities, props)
+
+    num_conditions = num_nodes//2
+    condition_ids = list(range(1, num_conditions+1))
+    smp.CreateNewConditions("SurfaceCondition3D3N", condition_ids, [conn[:3] for conn in connectivities[:num_conditions]], props)
+
+    return model_part
+
+
+def RunBenchmark(model_part, use_array_storage, num_workers=1):
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "benchmark.mdpa")
+        start_time = time.time()
+        WriteMdpa(model_part, file_name, num_workers=num_workers)
+        duration = time.time() - start_time
+        file_size_mb = os.path.getsize(file_name) / 1024**2
+
+    print('Array storage: {:<5} | Workers: {:>2} | Nodes: {:>9} | Size: {:8.1f} MB | Time: {:7.2f} s | Throughput: {:6.1f} MB/s'.format(
+        str(use_array_storage), num_workers, model_part.NumberOfNodes(), file_size_mb, duration, file_size_mb/duration))
+
+
+if __name__ == '__main__':
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    max_num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    for use_array_storage in [False, True] if numpy_available else [False]:
+        model_part = CreateModelPart(num_nodes, use_array_storage)
+        num_workers = 1
+        while num_workers <= max_num_workers:
+            RunBenchmark(model_part, use_array_storage, num_workers)
+            num_workers *= 2
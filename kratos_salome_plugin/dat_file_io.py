@@ -0,0 +1,132 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains functions for reading the DAT files exported by Salome ("ExportDAT")
+The files are parsed with NumPy, without processing every line in python.
+
+Format of the DAT file:
+    num_nodes num_elements
+    node_id x y z              (num_nodes lines)
+    element_id type node_ids   (num_elements lines)
+"""
+
+# python imports
+import os
+import mmap
+
+# numpy imports (optional, only needed for reading DAT files)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+
+def ReadDatFile(file_name):
+    """Reads the nodes and the elements from a DAT file
+    Returns: ((node_ids, coordinates), (element_ids, element_types, offsets, connectivities))
+    see "ReadNodesFromDatFile" and "ReadElementsFromDatFile"
+    """
+    num_nodes, num_elements, nodes_data, elements_data = _ReadBlocks(file_name)
+    return _ParseNodes(nodes_data, num_nodes, file_name), _ParseElements(elements_data, num_elements, file_name)
+
+
+def ReadNodesFromDatFile(file_name):
+    """Reads the nodes from a DAT file
+    Returns the Ids (int64) and the coordinates (num_nodes x 3, float64) of the nodes, in the order of the file
+    """
+    num_nodes, _, nodes_data, _ = _ReadBlocks(file_name, read_elements=False)
+    return _ParseNodes(nodes_data, num_nodes, file_name)
+
+
+def ReadElementsFromDatFile(file_name):
+    """Reads the elements from a DAT file
+    Returns the Ids, the types (e.g. 304 for tetrahedra) and the connectivities of the elements, in the order of the file.
+    Since the elements can have different numbers of nodes, the connectivities are returned in a flat array,
+    the connectivity of the i-th element is connectivities[offsets[i]:offsets[i+1]]
+    Returns: (element_ids, element_types, offsets, connectivities), all as int64 arrays
+    """
+    _, num_elements, _, elements_data = _ReadBlocks(file_name, read_nodes=False)
+    return _ParseElements(elements_data, num_elements, file_name)
+
+
+def ReadNumberOfEntitiesFromDatFile(file_name):
+    """Reads the number of nodes and elements from the header of a DAT file, without reading the nodes and elements
+    Returns: (num_nodes, num_elements)
+    """
+    with open(file_name, "rb") as dat_file:
+        return _ReadHeader(dat_file, file_name)
+
+
+def _ReadBlocks(file_name, read_nodes=True, read_elements=True):
+    """returns the number of nodes and elements and the (unparsed) blocks of nodes and elements
+    The file is memory-mapped, the lines are located with NumPy, hence only the requested blocks are copied
+    """
+    if os.path.getsize(file_name) == 0: # empty files cannot be memory-mapped
+        raise Exception('The header of DAT file "{}" is not valid!'.format(file_name))
+
+    with open(file_name, 'rb') as dat_file, mmap.mmap(dat_file.fileno(), 0, access=mmap.ACCESS_READ) as dat_map:
+        num_nodes, num_elements = _ReadHeader(dat_map, file_name)
+
+        # positions after the header and after the nodes
+        line_ends = np.flatnonzero(np.frombuffer(dat_map, dtype=np.uint8) == ord("\n")) + 1
+        nodes_begin = line_ends[0] if line_ends.size > 0 else len(dat_map)
+        nodes_end = line_ends[num_nodes] if line_ends.size > num_nodes else len(dat_map)
+
+        nodes_data = dat_map[nodes_begin:nodes_end] if read_nodes else b""
+        elements_data = dat_map[nodes_end:] if read_elements else b""
+
+    return num_nodes, num_elements, nodes_data, elements_data
+
+
+def _ParseNodes(nodes_data, num_nodes, file_name):
+    nodes_data = np.fromstring(nodes_data, sep=" ") if num_nodes > 0 else np.empty(0)
+
+    if nodes_data.size != 4*num_nodes:
+        raise Exception('Reading the nodes from DAT file "{}" failed, expected {} nodes!'.format(file_name, num_nodes))
+
+    nodes_data = nodes_data.reshape(num_nodes, 4)
+    return nodes_data[:,0].astype(np.int64), np.ascontiguousarray(nodes_data[:,1:])
+
+
+def _ParseElements(elements_data, num_elements, file_name):
+    # the values are read all at once, the number of values per line is determined from the whitespaces
+    values = np.fromstring(elements_data, dtype=np.int64, sep=" ") if len(elements_data.strip()) > 0 else np.empty(0, dtype=np.int64)
+    chars = np.frombuffer(elements_data, dtype=np.uint8)
+    is_whitespace = np.zeros(256, dtype=bool)
+    is_whitespace[list(b" \t\r\n")] = True
+    is_whitespace = is_whitespace[chars]
+    is_value_begin = ~is_whitespace
+    is_value_begin[1:] &= is_whitespace[:-1]
+    line_of_values = np.searchsorted(np.flatnonzero(chars == ord("\n")), np.flatnonzero(is_value_begin))
+    values_per_line = np.bincount(line_of_values)
+    values_per_line = values_per_line[values_per_line > 0] # skipping empty lines
+
+    if values_per_line.size != num_elements or values.size != values_per_line.sum() or np.any(values_per_line < 3):
+        raise Exception('Reading the elements from DAT file "{}" failed, expected {} elements!'.format(file_name, num_elements))
+
+    # each line contains: Id, type, node Ids
+    line_begin = np.cumsum(values_per_line) - values_per_line
+    is_node_id = np.ones(values.size, dtype=bool)
+    is_node_id[line_begin] = False
+    is_node_id[line_begin+1] = False
+    offsets = np.zeros(num_elements+1, dtype=np.int64)
+    np.cumsum(values_per_line-2, out=offsets[1:])
+
+    return values[line_begin], values[line_begin+1], offsets, values[is_node_id]
+
+
+def _ReadHeader(dat_file, file_name):
+    # returns the number of nodes and elements
+    header = dat_file.readline().split()
+    if len(header) != 2:
+        raise Exception('The header of DAT file "{}" is not valid!'.format(file_name))
+    return int(header[0]), int(header[1])
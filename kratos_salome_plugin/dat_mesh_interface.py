@@ -0,0 +1,143 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the DatMeshInterface
+It has the same interface as the MeshInterface, but the mesh is read from a DAT file (exported from Salome with "ExportDAT")
+Hence it can be used without Salome, e.g. for creating the input for Kratos from meshes that were exported before
+"""
+
+# python imports
+import os
+
+# plugin imports
+from .file_mesh_interface import FileMeshInterface
+from .dat_file_io import ReadDatFile, ReadNumberOfEntitiesFromDatFile
+
+# numpy imports (required for reading DAT files)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# the type of the elements in DAT files is (100*dimension + number of nodes)
+# names of the entity types as in Salome, see https://docs.salome-platform.org/latest/gui/SMESH/smesh_module.html#entitytype
+DAT_ENTITY_TYPES = {
+    101 : "0D",
+    102 : "Edge",
+    103 : "Quad_Edge",
+    203 : "Triangle",
+    206 : "Quad_Triangle",
+    207 : "BiQuad_Triangle",
+    204 : "Quadrangle",
+    208 : "Quad_Quadrangle",
+    209 : "BiQuad_Quadrangle",
+    304 : "Tetra",
+    310 : "Quad_Tetra",
+    305 : "Pyramid",
+    313 : "Quad_Pyramid",
+    306 : "Penta",
+    315 : "Quad_Penta",
+    318 : "BiQuad_Penta",
+    308 : "Hexa",
+    320 : "Quad_Hexa",
+    327 : "TriQuad_Hexa",
+    312 : "Hexagonal_Prism"
+}
+
+
+class DatMeshInterface(FileMeshInterface):
+    def __init__(self, file_name, main_mesh_file_name=None):
+        """Constructor of DatMeshInterface
+        file_name -- the DAT file containing the mesh
+        main_mesh_file_name -- the DAT file of the main mesh, if the mesh is a part (e.g. a group) of it that was exported with the original Ids
+                               By default the mesh is its own main mesh
+        """
+        super().__init__(file_name)
+        self.main_mesh_file_name = main_mesh_file_name if main_mesh_file_name is not None else file_name
+
+    def GetMeshType(self):
+        if self.CheckMeshIsValid():
+            return "DatFile"
+        else:
+            return ""
+
+    def GetNumberOfNodes(self, extraction_cache=None):
+        """returns the number of nodes of the mesh, read from the header of the file (the nodes are not read)"""
+        if self.CheckMeshIsValid():
+            return ReadNumberOfEntitiesFromDatFile(self.file_name)[0]
+        else:
+            return 0
+
+    def _GetMeshData(self, extraction_cache=None):
+        if extraction_cache is None:
+            return _DatMesh(self.file_name)
+        else:
+            return extraction_cache.GetOrCreate(os.path.abspath(self.file_name), lambda: _DatMesh(self.file_name))
+
+    def _GetMainMeshKey(self):
+        return os.path.abspath(self.main_mesh_file_name)
+
+
+class _DatMesh:
+    """The nodes and geometries of a DAT file, the file is read once when the object is created"""
+    def __init__(self, file_name):
+        (node_ids, coordinates), (element_ids, element_types, offsets, connectivities) = ReadDatFile(file_name)
+
+        order = np.argsort(node_ids, kind="stable")
+        self.__nodes = (node_ids[order], coordinates[order])
+
+        self.__element_ids = element_ids
+        self.__element_types = element_types
+        self.__offsets = offsets
+        self.__connectivities = connectivities
+        self.__geometries = {} # map: {entity_type : (entities_ids, connectivities)}
+
+    def GetNodes(self):
+        return self.__nodes
+
+    def GetConnectivities(self, entity_type):
+        """returns the sorted Ids and the connectivities of the entities of a type"""
+        if entity_type not in self.__geometries:
+            rows = np.flatnonzero(_GetEntityTypes(self.__element_types) == entity_type)
+            rows = rows[np.argsort(self.__element_ids[rows], kind="stable")]
+            num_nodes = self.__offsets[rows+1] - self.__offsets[rows]
+            if rows.size == 0:
+                connectivities = np.empty((0, 0), dtype=np.int64)
+            elif np.all(num_nodes == num_nodes[0]):
+                connectivities = self.__connectivities[self.__offsets[rows].reshape(-1, 1) + np.arange(num_nodes[0])]
+            else: # entities with a varying number of nodes, e.g. polygons
+                connectivities = [self.__connectivities[self.__offsets[row]:self.__offsets[row+1]].tolist() for row in rows.tolist()]
+            self.__geometries[entity_type] = (self.__element_ids[rows], connectivities)
+
+        return self.__geometries[entity_type]
+
+    def GetEntityTypes(self):
+        return list(self.GetMeshInformation().keys())
+
+    def GetMeshInformation(self):
+        """returns the number of entities of each entity type in the mesh"""
+        element_types, counts = np.unique(self.__element_types, return_counts=True)
+        mesh_information = {}
+        for entity_type, count in zip(_GetEntityTypes(element_types).tolist(), counts.tolist()):
+            mesh_information[entity_type] = mesh_information.get(entity_type, 0) + count
+        return mesh_information
+
+    def Close(self):
+        self.__geometries.clear()
+
+
+def _GetEntityTypes(element_types):
+    """returns the names of the entity types given the types of the elements in the DAT file"""
+    # the names are determined for the unique types only, there are only few of them
+    unique_types, inverse = np.unique(element_types, return_inverse=True)
+    unique_entity_types = np.array([DAT_ENTITY_TYPES.get(t, "Polygon" if t//100 == 2 else "Polyhedra") for t in unique_types.tolist()], dtype=object)
+    return unique_entity_types[inverse.reshape(-1)]
@@ -0,0 +1,216 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the FileMeshInterface, the baseclass of the interfaces for meshes that are read from files
+It has the same interface as the MeshInterface, hence the meshes can be used without Salome
+The derived classes read the mesh from the file, see "DatMeshInterface" and "MedMeshInterface"
+"""
+
+# python imports
+import os
+import time
+import logging
+logger = logging.getLogger(__name__)
+
+# numpy imports (required for reading meshes from files)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+
+class FileMeshInterface:
+    def __init__(self, file_name):
+        if not numpy_available:
+            raise ImportError('NumPy is required for reading meshes from files!')
+        self.file_name = file_name
+        # the number of nodes and the mesh information, kept until the file is modified
+        self.__mesh_counts = None
+        self.__mesh_counts_file_key = None
+
+    def GetNodes(self):
+        return self.GetNodesAndGeometricalEntities()[0]
+
+    def GetNodeIdsAndCoordinates(self):
+        """Returns the Ids of the nodes (sorted) and their coordinates (num_nodes x 3) as NumPy arrays"""
+        return self.GetNodesAndGeometricalEntitiesArrays()[0]
+
+    def GetNodesAndGeometricalEntities(self, geometrical_entity_types=[], extraction_cache=None):
+        if self.CheckMeshIsValid():
+            (node_ids, coordinates), geometries = self.GetNodesAndGeometricalEntitiesArrays(geometrical_entity_types, extraction_cache)
+            nodes = dict(zip(node_ids.tolist(), coordinates.tolist()))
+            geom_entities = {entity_type : dict(zip(entities_ids.tolist(), connectivities.tolist() if hasattr(connectivities, "tolist") else connectivities)) for entity_type, (entities_ids, connectivities) in geometries.items()}
+            return nodes, geom_entities
+        else:
+            return {}, {}
+
+    def GetNodesAndGeometricalEntitiesArrays(self, geometrical_entity_types=[], extraction_cache=None):
+        """Same as "GetNodesAndGeometricalEntities", but the nodes and geometries are returned as NumPy arrays:
+        ((node_ids, coordinates), {entity_type : (entities_ids, connectivities)})
+        see "MeshInterface.GetNodesAndGeometricalEntitiesArrays"
+
+        If an extraction cache is given (see "geometries_io.ExtractionCache"), then the file is read only once
+        """
+        if not self.CheckMeshIsValid():
+            return (np.empty(0, dtype=np.int64), np.empty((0, 3))), {}
+
+        start_time = time.time()
+
+        file_key = self.__GetFileKey()
+        mesh_data = self._GetMeshData(extraction_cache)
+        try:
+            nodes_and_geometries = self.__GetNodesAndGeometricalEntitiesArrays(mesh_data, geometrical_entity_types)
+            self.__SetMeshCounts(mesh_data, file_key)
+        finally:
+            if extraction_cache is None:
+                mesh_data.Close()
+
+        (node_ids, _), geometries = nodes_and_geometries
+        logger.info('Getting {0} Nodes and {1} Geometrical Entities from Mesh "{2}" of type "{3}" took {4:.3f} [s]'.format(len(node_ids), sum([len(ids) for ids, _ in geometries.values()]), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+
+        return nodes_and_geometries
+
+    def __GetNodesAndGeometricalEntitiesArrays(self, mesh_data, geometrical_entity_types):
+        node_ids, coordinates = mesh_data.GetNodes()
+
+        geometries = {}
+        entity_types_not_in_mesh = []
+        for entity_type in geometrical_entity_types:
+            if entity_type == "Node":
+                logger.debug("Creating 0D elements for all nodes.")
+                geometries["Node"] = (node_ids, node_ids.reshape(-1, 1))
+            else:
+                geometries[entity_type] = mesh_data.GetConnectivities(entity_type)
+                if geometries[entity_type][0].size == 0:
+                    entity_types_not_in_mesh.append(entity_type)
+
+        for entity_type in entity_types_not_in_mesh:
+            logger.warning('Entity type "{}" not in Mesh "{}"!'.format(entity_type, self.GetMeshName()))
+        if len(entity_types_not_in_mesh) > 0:
+            logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(mesh_data.GetEntityTypes())))
+
+        return (node_ids, coordinates), geometries
+
+    def GetEntityTypesInMesh(self):
+        """returns the names of the entity types in the mesh (as strings, in contrast to the MeshInterface)"""
+        if self.CheckMeshIsValid():
+            return list(self.__GetMeshCounts()[1].keys())
+        else:
+            return []
+
+    def GetMeshInformation(self):
+        if self.CheckMeshIsValid():
+            return dict(self.__GetMeshCounts()[1])
+        else:
+            return {}
+
+    def GetNumberOfNodes(self, extraction_cache=None):
+        """returns the number of nodes of the mesh, 0 if the mesh is not valid
+        If an extraction cache is given, then the file is read only once, also for extracting the mesh afterwards
+        """
+        if self.CheckMeshIsValid():
+            return self.__GetMeshCounts(extraction_cache)[0]
+        else:
+            return 0
+
+    def GetNumberOfGeometries(self, geometry_type, extraction_cache=None):
+        """returns the number of geometrical entities of a type (e.g. "Triangle") in the mesh
+        For "Node" it is the number of nodes, see "GetNodesAndGeometricalEntities"
+        returns 0 if the requested type is not in the mesh or the mesh is not valid
+        """
+        if not self.CheckMeshIsValid():
+            return 0
+        if geometry_type == "Node":
+            return self.GetNumberOfNodes(extraction_cache)
+        return self.__GetMeshCounts(extraction_cache)[1].get(geometry_type, 0)
+
+    def CheckMeshIsValid(self):
+        if not os.path.isfile(self.file_name):
+            logger.critical('File "{}" in {} does not exist'.format(self.file_name, self.__class__.__name__))
+            return False
+
+        return True
+
+    def GetMeshName(self):
+        if self.CheckMeshIsValid():
+            return os.path.splitext(os.path.basename(self.file_name))[0]
+        else:
+            return ""
+
+    def GetMeshType(self):
+        raise NotImplementedError('"GetMeshType" is not implemented for class "{}"!'.format(self.__class__.__name__))
+
+    def PrintInfo(self, prefix_string=""):
+        return prefix_string + self.__class__.__name__ + "\n"
+
+    def PrintData(self, prefix_string=""):
+        string_buf  = "{}  File name: {}\n".format(prefix_string, self.file_name)
+        mesh_is_valid = self.CheckMeshIsValid()
+        string_buf += "{}  Mesh is valid: {}\n".format(prefix_string, mesh_is_valid)
+        if mesh_is_valid:
+            string_buf += "{}  Mesh has the following entities:\n".format(prefix_string)
+            for e, v in self.GetMeshInformation().items():
+                string_buf += "{}    {}: {}\n".format(prefix_string, e, v)
+
+        return string_buf
+
+    def __str__(self):
+        string_buf = self.PrintInfo()
+        string_buf += self.PrintData()
+        return string_buf
+
+    @staticmethod
+    def DoMeshesBelongToSameMainMesh(list_mesh_interfaces):
+        """checks whether all meshes given a list of mesh interfaces belong to the same main mesh"""
+        main_meshes = []
+        for mesh_interface in list_mesh_interfaces:
+            if mesh_interface.CheckMeshIsValid():
+                main_meshes.append(mesh_interface._GetMainMeshKey())
+            else:
+                return False
+
+        return len(set(main_meshes)) <= 1 # also works for empty input
+
+    def __GetMeshCounts(self, extraction_cache=None):
+        """returns the number of nodes and the mesh information
+        They are kept on the interface, the file is only read again if it was modified
+        """
+        file_key = self.__GetFileKey()
+        if file_key != self.__mesh_counts_file_key:
+            mesh_data = self._GetMeshData(extraction_cache)
+            try:
+                self.__SetMeshCounts(mesh_data, file_key)
+            finally:
+                if extraction_cache is None:
+                    mesh_data.Close()
+        return self.__mesh_counts
+
+    def __SetMeshCounts(self, mesh_data, file_key):
+        if file_key != self.__mesh_counts_file_key:
+            self.__mesh_counts = (len(mesh_data.GetNodes()[0]), mesh_data.GetMeshInformation())
+            self.__mesh_counts_file_key = file_key
+
+    def __GetFileKey(self):
+        """identifies the state of the file, it changes if the file is modified"""
+        file_stat = os.stat(self.file_name)
+        return (os.path.abspath(self.file_name), file_stat.st_mtime_ns, file_stat.st_size)
+
+    def _GetMeshData(self, extraction_cache=None):
+        """returns the data of the mesh (see e.g. "dat_mesh_interface._DatMesh"), which provides:
+        GetNodes, GetConnectivities(entity_type), GetEntityTypes, GetMeshInformation and Close
+        Without an extraction cache the data is temporary and has to be closed after using it
+        """
+        raise NotImplementedError('"_GetMeshData" is not implemented for class "{}"!'.format(self.__class__.__name__))
+
+    def _GetMainMeshKey(self):
+        """returns a key that identifies the main mesh"""
+        raise NotImplementedError('"_GetMainMeshKey" is not implemented for class "{}"!'.format(self.__class__.__name__))
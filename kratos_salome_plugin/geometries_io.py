@@ -14,9 +14,55 @@ based on the nodes and geometrical entities in a mesh.
 """
 
 # python imports
+from collections import OrderedDict
 import logging
 logger = logging.getLogger(__name__)
 
+# plugin imports
+from .model_part import _AsList
+
+# numpy imports (optional, only needed for reordering the connectivities in bulk)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# for some entities the node ordering differs between Salome and Kratos, those have to be corrected
+# the permutations contain the positions of the nodes of Salome in the order of Kratos,
+# the nodes on the edges of the quadratic entities follow the permutation of the corner nodes
+NODE_ORDER_PERMUTATIONS = {
+    "Tetra"             : [0, 2, 1, 3],
+    "Quad_Tetra"        : [0, 2, 1, 3, 6, 5, 4, 7, 9, 8],
+    "Hexa"              : [0, 3, 2, 1, 4, 7, 6, 5],
+    "Quad_Hexa"         : [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8, 16, 19, 18, 17, 15, 14, 13, 12],
+    "Penta"             : [0, 2, 1, 3, 5, 4],
+    "Quad_Penta"        : [0, 2, 1, 3, 5, 4, 8, 7, 6, 12, 14, 13, 11, 10, 9],
+    "BiQuad_Quadrangle" : [0, 1, 2, 3, 4, 5, 6, 7, 8] # same order (corners, edges, center)
+}
+
+# approximate memory in bytes of the entities in a ModelPart that stores them in arrays
+# (see "model_part.NodesArrayContainer" and "model_part.GeometricalObjectsArrayContainer")
+# this includes the entry in the index of the Ids, which is a dict of python ints
+MEMORY_PER_NODE = 8 + 3*8 + 100 # Id, coordinates, index
+MEMORY_PER_GEOMETRICAL_OBJECT = 8 + 4 + 8 + 8 + 4 + 100 # Id, block number, row, Id in block, properties index, index
+MEMORY_PER_CONNECTIVITY_NODE = 8 # Id of the node in the connectivity
+
+# number of nodes of the Salome EntityTypes, for estimating the memory of the connectivities
+# a value is assumed for types with a varying number of nodes (e.g. "Polygon")
+NUMBER_OF_NODES_OF_ENTITY_TYPES = {
+    "Node" : 1, "0D" : 1, "Ball" : 1,
+    "Edge" : 2, "Quad_Edge" : 3,
+    "Triangle" : 3, "Quad_Triangle" : 6, "BiQuad_Triangle" : 7,
+    "Quadrangle" : 4, "Quad_Quadrangle" : 8, "BiQuad_Quadrangle" : 9,
+    "Tetra" : 4, "Quad_Tetra" : 10,
+    "Pyramid" : 5, "Quad_Pyramid" : 13,
+    "Penta" : 6, "Quad_Penta" : 15, "BiQuad_Penta" : 18,
+    "Hexa" : 8, "Quad_Hexa" : 20, "TriQuad_Hexa" : 27,
+    "Hexagonal_Prism" : 12
+}
+DEFAULT_NUMBER_OF_NODES = 8
+
 
 class Mesh:
     """Container for a mesh-interface, desription of what entities from it and the ModelPart name"""
@@ -66,28 +112,146 @@ class Mesh:
         return string_buf
 
 
+class ExtractionCache:
+    """Cache that is shared by the meshes that are added in one call of "GeometriesIO.AddMeshes"
+    The mesh interfaces store in it what they extracted from a main mesh (see "MeshInterface.GetNodesAndGeometricalEntitiesArrays"),
+    such that the other meshes of the same main mesh (e.g. submeshes and groups) don't have to extract it again.
+    """
+
+    def __init__(self):
+        self.__entries = OrderedDict()
+
+    def GetOrCreate(self, key, create_function):
+        """returns the entry with the given key, it is created with "create_function" if it does not exist yet"""
+        if key not in self.__entries:
+            self.__entries[key] = create_function()
+        return self.__entries[key]
+
+    def Close(self):
+        """closes all entries (e.g. removes temporary files) and removes them from the cache"""
+        for entry in self.__entries.values():
+            entry.Close()
+        self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+
+
+class CreatedEntities:
+    """The entities that were created with one entity name in one call of "GeometriesIO.AddMeshes"
+    It maps the Ids of the geometries to the Ids of the entities that were created from them (and the Ids of their Properties),
+    such that no entity is created twice from the same geometry.
+    With NumPy the Ids are stored in arrays that are sorted by the Ids of the geometries,
+    hence the geometries of a mesh are looked up all at once with "searchsorted".
+    """
+
+    def __init__(self):
+        if numpy_available:
+            self.__geometry_ids = np.empty(0, dtype=np.int64)
+            self.__entity_ids = np.empty(0, dtype=np.int64)
+            self.__properties_ids = np.empty(0, dtype=np.int64)
+        else:
+            self.__entities = {} # map: {geometry_id : (entity_id, properties_id)}
+
+    def Find(self, geometry_ids, properties_id):
+        """returns the positions of the geometries from which no entity was created yet
+        and the Ids of the entities that were created from the other geometries
+        Raises if the existing entities use other Properties than the given ones
+        """
+        if numpy_available:
+            geometry_ids = np.asarray(geometry_ids, dtype=np.int64).reshape(-1)
+            positions = np.searchsorted(self.__geometry_ids, geometry_ids)
+            exists = np.zeros(len(geometry_ids), dtype=bool)
+            in_range = positions < len(self.__geometry_ids)
+            exists[in_range] = self.__geometry_ids[positions[in_range]] == geometry_ids[in_range]
+
+            existing_positions = positions[exists]
+            existing_entity_ids = self.__entity_ids[existing_positions]
+            mismatched_properties_ids = self.__properties_ids[existing_positions]
+            mismatched_properties_ids = mismatched_properties_ids[mismatched_properties_ids != properties_id]
+            new_positions = np.flatnonzero(~exists)
+        else:
+            new_positions = []
+            existing_entity_ids = []
+            mismatched_properties_ids = []
+            for position, geometry_id in enumerate(geometry_ids):
+                existing_entity = self.__entities.get(geometry_id)
+                if existing_entity is None:
+                    new_positions.append(position)
+                else:
+                    existing_entity_ids.append(existing_entity[0])
+                    if existing_entity[1] != properties_id:
+                        mismatched_properties_ids.append(existing_entity[1])
+
+        if len(mismatched_properties_ids) > 0:
+            err_msg  = 'Mismatch in properties Ids!\n'
+            err_msg += 'Trying to use properties with Id {} '.format(properties_id)
+            err_msg += 'with an existing entity that has the properties with Id {}'.format(mismatched_properties_ids[0])
+            raise Exception(err_msg)
+
+        return new_positions, existing_entity_ids
+
+    def Add(self, geometry_ids, entity_ids, properties_id):
+        """adds the entities that were created from the geometries, no entities must exist yet for these geometries"""
+        if numpy_available:
+            geometry_ids = np.concatenate((self.__geometry_ids, np.asarray(geometry_ids, dtype=np.int64).reshape(-1)))
+            entity_ids = np.concatenate((self.__entity_ids, np.asarray(entity_ids, dtype=np.int64).reshape(-1)))
+            properties_ids = np.concatenate((self.__properties_ids, np.full(len(entity_ids)-len(self.__entity_ids), properties_id, dtype=np.int64)))
+
+            order = np.argsort(geometry_ids, kind="stable")
+            self.__geometry_ids = geometry_ids[order]
+            self.__entity_ids = entity_ids[order]
+            self.__properties_ids = properties_ids[order]
+        else:
+            for geometry_id, entity_id in zip(geometry_ids, entity_ids):
+                self.__entities[geometry_id] = (entity_id, properties_id)
+
+    def __len__(self):
+        if numpy_available:
+            return len(self.__geometry_ids)
+        else:
+            return len(self.__entities)
+
+
 class GeometriesIO:
     """Creates Elements and Conditions based on the Geometries in a Mesh and adds them to a ModelPart"""
 
     @staticmethod
-    def AddMeshes(model_part, meshes):
+    def AddMeshes(model_part, meshes, incremental=False):
         """Keyword arguments:
         model_part -- the ModelPart to add the Nodes, Elements and Conditions
         meshes -- List of meshes from which to create the entities
         see "Mesh"
+        incremental -- allows adding the meshes to a ModelPart that is not empty, e.g. for combining several main meshes
+                       The meshes are added like a separate main mesh: the Ids of their Nodes are shifted by the largest
+                       existing Node Id and the Elements and Conditions are numbered after the existing ones.
+                       Hence no Nodes, Elements or Conditions are shared with the entities that exist already.
 
         Ensures that the IDs are handled correctly when creating the entities
         """
 
-        if model_part.GetRootModelPart().NumberOfNodes() != 0:
-            # this also ensures that no Elements/Conditions exist, since they need Nodes
-            err_msg  = 'The Root-ModelPart "{}" is not empty!\n'.format(model_part.GetRootModelPart().Name)
-            err_msg += 'This is required because otherwise the numbering of entities can get messed up'
-            raise Exception(err_msg)
+        root_model_part = model_part.GetRootModelPart()
+        if incremental:
+            id_offsets = GeometriesIO.__GetIdOffsets(root_model_part)
+            logger.info('Adding the meshes incrementally, the Ids of the Nodes are shifted by {}'.format(id_offsets["nodes"]))
+        else:
+            if root_model_part.NumberOfNodes() != 0:
+                # this also ensures that no Elements/Conditions exist, since they need Nodes
+                err_msg  = 'The Root-ModelPart "{}" is not empty!\n'.format(root_model_part.Name)
+                err_msg += 'This is required because otherwise the numbering of entities can get messed up\n'
+                err_msg += 'Use "incremental=True" for adding the meshes with shifted Ids'
+                raise Exception(err_msg)
+            id_offsets = {"nodes" : 0, "elements" : 0, "conditions" : 0}
 
         # maps to prevent recreating entities from the same geometry!
-        all_elements   = {} # map: {element_names   : {origin_ids : element} }
-        all_conditions = {} # map: {condition_names : {origin_ids : condition} }
+        all_elements   = {} # map: {element_names   : CreatedEntities}
+        all_conditions = {} # map: {condition_names : CreatedEntities}
 
         if len(meshes) > 0:
             if not meshes[0].mesh_interface.DoMeshesBelongToSameMainMesh([m.mesh_interface for m in meshes]):
@@ -96,22 +260,101 @@ class GeometriesIO:
                 err_msg += 'This is necessary to ensure a consistent numbering.'
                 raise Exception(err_msg)
 
-            for mesh in meshes:
-                default_mesh_description = {
-                    "elements"   : { },
-                    "conditions" : { }
-                }
-
-                for k, v in default_mesh_description.items():
-                    if k not in mesh.mesh_description:
-                        mesh.mesh_description[k] = v
-
-                GeometriesIO.__AddEntitiesToModelPart(model_part, mesh, all_elements, all_conditions)
+            # the meshes usually belong to the same main mesh, which is hence extracted only once
+            with ExtractionCache() as extraction_cache:
+                if hasattr(model_part, "Reserve"):
+                    # preallocating the storage, only available in the python-ModelPart
+                    expected_entities = GeometriesIO.__CountEntities(meshes, extraction_cache)
+                    model_part.Reserve(root_model_part.NumberOfNodes() + expected_entities["nodes"],
+                                       root_model_part.NumberOfElements() + sum(expected_entities["elements"].values()),
+                                       root_model_part.NumberOfConditions() + sum(expected_entities["conditions"].values()))
+
+                for mesh in meshes:
+                    default_mesh_description = {
+                        "elements"   : { },
+                        "conditions" : { }
+                    }
+
+                    for k, v in default_mesh_description.items():
+                        if k not in mesh.mesh_description:
+                            mesh.mesh_description[k] = v
+
+                    GeometriesIO.__AddEntitiesToModelPart(model_part, mesh, all_elements, all_conditions, id_offsets, extraction_cache)
         else:
             logger.warning('Empty input, no meshes were added to ModelPart "{}"'.format(model_part.FullName()))
 
     @staticmethod
-    def __AddEntitiesToModelPart(model_part, mesh, all_elems, all_conds):
+    def DryRun(meshes):
+        """Reports the expected number of entities and the estimated memory of adding the meshes to a ModelPart
+        Only the counters of the meshes are used (see "MeshInterface.GetNumberOfNodes" and "MeshInterface.GetNumberOfGeometries"),
+        the meshes are not extracted. The memory is estimated for a ModelPart that stores the entities in arrays.
+
+        Since the meshes belong to the same main mesh, the number of nodes is the one of the largest mesh.
+        The numbers of elements and conditions are upper bounds, the entities that are created
+        from the same geometry in several meshes are counted for each of them.
+
+        Returns: {"nodes" : num_nodes, "elements" : num_elements, "conditions" : num_conditions, "memory" : memory_in_bytes}
+        """
+        with ExtractionCache() as extraction_cache:
+            expected_entities = GeometriesIO.__CountEntities(meshes, extraction_cache)
+
+        memory = expected_entities["nodes"] * MEMORY_PER_NODE
+        for geometries in (expected_entities["elements"], expected_entities["conditions"]):
+            for geometry_type, num_entities in geometries.items():
+                num_nodes = NUMBER_OF_NODES_OF_ENTITY_TYPES.get(geometry_type, DEFAULT_NUMBER_OF_NODES)
+                memory += num_entities * (MEMORY_PER_GEOMETRICAL_OBJECT + num_nodes*MEMORY_PER_CONNECTIVITY_NODE)
+
+        dry_run = {
+            "nodes"      : expected_entities["nodes"],
+            "elements"   : sum(expected_entities["elements"].values()),
+            "conditions" : sum(expected_entities["conditions"].values()),
+            "memory"     : memory
+        }
+
+        logger.info('Adding the meshes creates {} Nodes, {} Elements and {} Conditions (at most), this needs approximately {:.1f} MB'.format(
+            dry_run["nodes"], dry_run["elements"], dry_run["conditions"], memory/2**20))
+
+        return dry_run
+
+    @staticmethod
+    def __CountEntities(meshes, extraction_cache):
+        """returns the expected number of nodes and the expected number of elements and conditions per geometry type
+        see "DryRun"
+        """
+        num_nodes = 0
+        num_elements = {}   # map: {geometry_type : num_elements}
+        num_conditions = {} # map: {geometry_type : num_conditions}
+        for mesh in meshes:
+            mesh_interface = mesh.mesh_interface
+            num_nodes = max(num_nodes, int(mesh_interface.GetNumberOfNodes(extraction_cache)))
+            for entities_name, num_entities in (("elements", num_elements), ("conditions", num_conditions)):
+                for geometry_type, entities_dict in mesh.mesh_description.get(entities_name, {}).items():
+                    num_geometries = int(mesh_interface.GetNumberOfGeometries(geometry_type, extraction_cache))
+                    # one entity is created for each entity name
+                    num_entities[geometry_type] = num_entities.get(geometry_type, 0) + num_geometries*len(entities_dict)
+
+        return {"nodes" : num_nodes, "elements" : num_elements, "conditions" : num_conditions}
+
+    @staticmethod
+    def __GetIdOffsets(root_model_part):
+        """returns the offsets of the Ids for adding meshes to a ModelPart that is not empty
+        The Nodes are shifted by the largest existing Id. Elements and Conditions are numbered
+        consecutively after the existing ones, the offset is the gap that non-consecutive existing Ids leave
+        """
+        def GetMaxId(entities):
+            if hasattr(entities, "GetMaxId"):
+                # the python-ModelPart provides the largest Id (stored directly when using arrays)
+                return entities.GetMaxId()
+            return max((entity.Id for entity in entities), default=0)
+
+        return {
+            "nodes"      : GetMaxId(root_model_part.Nodes),
+            "elements"   : GetMaxId(root_model_part.Elements) - root_model_part.NumberOfElements(),
+            "conditions" : GetMaxId(root_model_part.Conditions) - root_model_part.NumberOfConditions()
+        }
+
+    @staticmethod
+    def __AddEntitiesToModelPart(model_part, mesh, all_elems, all_conds, id_offsets, extraction_cache):
         model_part_to_add_to = GeometriesIO.__GetModelPartToAddTo(model_part, mesh.model_part_name)
 
         logger.info('Adding mesh to ModelPart "{}"'.format(model_part_to_add_to.FullName()))
@@ -119,15 +362,15 @@ class GeometriesIO:
         mesh_description = mesh.mesh_description
         mesh_interface = mesh.mesh_interface
         unique_keys = set(list(mesh_description["elements"].keys()) + list(mesh_description["conditions"].keys()))
-        nodes, geometries = mesh_interface.GetNodesAndGeometricalEntities(unique_keys)
+        nodes, geometries = GetNodesAndGeometricalEntitiesArrays(mesh_interface, unique_keys, extraction_cache)
 
-        GeometriesIO.__AddNodes(model_part_to_add_to, nodes)
+        GeometriesIO.__AddNodes(model_part_to_add_to, nodes, id_offsets["nodes"])
 
         # Get Properties => See "read_materials_utility.cpp" function "AssignPropertyBlock"
         if len(mesh_description["elements"]) > 0:
-            GeometriesIO.__AddElemensts(model_part_to_add_to, geometries, mesh_description["elements"], all_elems)
+            GeometriesIO.__AddElemensts(model_part_to_add_to, geometries, mesh_description["elements"], all_elems, id_offsets)
         if len(mesh_description["conditions"]) > 0:
-            GeometriesIO.__AddConditions(model_part_to_add_to, geometries, mesh_description["conditions"], all_conds)
+            GeometriesIO.__AddConditions(model_part_to_add_to, geometries, mesh_description["conditions"], all_conds, id_offsets)
 
     @staticmethod
     def __GetModelPartToAddTo(model_part, model_part_name):
@@ -152,55 +395,73 @@ class GeometriesIO:
             return RecursiveCreateModelParts(model_part, model_part_name)
 
     @staticmethod
-    def __AddNodes(model_part_to_add_to, new_nodes):
+    def __AddNodes(model_part_to_add_to, new_nodes, node_id_offset):
         # Note: NOT checking the coordinates here since this is done in the ModelPart
-        for node_id, node_coords in new_nodes.items():
-            model_part_to_add_to.CreateNewNode(node_id, node_coords[0], node_coords[1], node_coords[2])
+        node_ids, coordinates = new_nodes
+        if hasattr(model_part_to_add_to, "CreateNewNodes"):
+            # bulk creation, only available in the python-ModelPart
+            model_part_to_add_to.CreateNewNodes(ShiftIds(node_ids, node_id_offset), coordinates)
+        else:
+            for node_id, node_coords in zip(_AsList(node_ids), _AsList(coordinates)):
+                model_part_to_add_to.CreateNewNode(node_id+node_id_offset, node_coords[0], node_coords[1], node_coords[2])
 
     @staticmethod
-    def __AddElemensts(model_part_to_add_to, geometries, elements_creation, all_elements):
-        element_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfElements() + 1
+    def __AddElemensts(model_part_to_add_to, geometries, elements_creation, all_elements, id_offsets):
+        element_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfElements() + id_offsets["elements"] + 1
 
-        def CreateAndSaveNewElement(element_name, geometry_id, connectivities, properties, element_id_counter):
-            new_element = model_part_to_add_to.CreateNewElement(element_name, element_id_counter, connectivities, properties)
-            all_elements[element_name][geometry_id] = new_element
-            return element_id_counter+1
+        def CreateNewElements(element_name, element_ids, connectivities, properties):
+            if hasattr(model_part_to_add_to, "CreateNewElements"):
+                # bulk creation, only available in the python-ModelPart
+                model_part_to_add_to.CreateNewElements(element_name, element_ids, connectivities, properties)
+            else:
+                for element_id, conn in zip(_AsList(element_ids), _AsList(connectivities)):
+                    model_part_to_add_to.CreateNewElement(element_name, element_id, conn, properties)
 
-        def AddExistingElement(model_part, element):
-            model_part.AddElement(element, 0) # 0 is the mesh_id, required for Kratos
+        def AddExistingElements(element_ids):
+            model_part_to_add_to.AddElements(_AsList(element_ids))
 
         GeometriesIO.__AddGeometricalEntities(model_part_to_add_to,
                                               geometries,
                                               elements_creation,
                                               all_elements,
-                                              CreateAndSaveNewElement,
-                                              AddExistingElement,
-                                              element_id_counter)
+                                              CreateNewElements,
+                                              AddExistingElements,
+                                              element_id_counter,
+                                              id_offsets["nodes"])
 
     @staticmethod
-    def __AddConditions(model_part_to_add_to, geometries, conditions_creation, all_conditions):
-        condition_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfConditions() + 1
+    def __AddConditions(model_part_to_add_to, geometries, conditions_creation, all_conditions, id_offsets):
+        condition_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfConditions() + id_offsets["conditions"] + 1
 
-        def CreateAndSaveNewCondition(condition_name, geometry_id, connectivities, properties, condition_id_counter):
-            new_condition = model_part_to_add_to.CreateNewCondition(condition_name, condition_id_counter, connectivities, properties)
-            all_conditions[condition_name][geometry_id] = new_condition
-            return condition_id_counter+1
+        def CreateNewConditions(condition_name, condition_ids, connectivities, properties):
+            if hasattr(model_part_to_add_to, "CreateNewConditions"):
+                # bulk creation, only available in the python-ModelPart
+                model_part_to_add_to.CreateNewConditions(condition_name, condition_ids, connectivities, properties)
+            else:
+                for condition_id, conn in zip(_AsList(condition_ids), _AsList(connectivities)):
+                    model_part_to_add_to.CreateNewCondition(condition_name, condition_id, conn, properties)
 
-        def AddExistingCondition(model_part, condition):
-            model_part.AddCondition(condition, 0) # 0 is the mesh_id, required for Kratos
+        def AddExistingConditions(condition_ids):
+            model_part_to_add_to.AddConditions(_AsList(condition_ids))
 
         GeometriesIO.__AddGeometricalEntities(model_part_to_add_to,
                                               geometries,
                                               conditions_creation,
                                               all_conditions,
-                                              CreateAndSaveNewCondition,
-                                              AddExistingCondition,
-                                              condition_id_counter)
+                                              CreateNewConditions,
+                                              AddExistingConditions,
+                                              condition_id_counter,
+                                              id_offsets["nodes"])
 
     @staticmethod
-    def __AddGeometricalEntities(model_part_to_add_to, geometries, entities_creation, all_entities, fct_ptr_create_save_new_entity, fct_ptr_add_existing_entity, id_counter):
+    def __AddGeometricalEntities(model_part_to_add_to, geometries, entities_creation, all_entities, fct_ptr_create_new_entities, fct_ptr_add_existing_entities, id_counter, node_id_offset):
         for geometry_type, entities_dict in entities_creation.items():
-            reorder_conn_fct_ptr = GetReorderFunction(geometry_type)
+            # the connectivities of all geometries of this type are reordered at once
+            geometry_ids, connectivities = geometries[geometry_type]
+            connectivities = ReorderConnectivities(geometry_type, connectivities)
+            connectivities = ShiftIds(connectivities, node_id_offset)
+            if numpy_available:
+                geometry_ids = np.asarray(geometry_ids, dtype=np.int64)
 
             for entity_name, props_id in entities_dict.items():
 
@@ -213,46 +474,89 @@ class GeometriesIO:
                     logger.debug('Creating new Properties with Id {} for "{}"'.format(props_id, entity_name))
 
                 already_existing_entities = 0
-                newly_created_entities = 0
 
                 if entity_name in all_entities: # entities of this type already exist
                     logger.debug('Entities with name "{}" exist already'.format(entity_name))
 
-                    for geometry_id, connectivities in geometries[geometry_type].items():
-                        existing_entity = all_entities[entity_name].get(geometry_id)
-                        if existing_entity:
-                            # an entity was already created from this geometry
-                            # therefore NOT creating a new one but adding the existing one
-                            if props_id != existing_entity.Properties.Id:
-                                err_msg  = 'Mismatch in properties Ids!\n'
-                                err_msg += 'Trying to use properties with Id {} '.format(props_id)
-                                err_msg += 'with an existing entity that has the properties with Id {}'.format(existing_entity.Properties.Id)
-                                raise Exception(err_msg)
-                            fct_ptr_add_existing_entity(model_part_to_add_to, existing_entity)
-                            already_existing_entities+=1
-                        else:
-                            # no entity has yet been created from this geometry
-                            # hence creating a new one
-                            reordered_conn = reorder_conn_fct_ptr(connectivities)
-                            id_counter = fct_ptr_create_save_new_entity(entity_name, geometry_id, reordered_conn, props, id_counter)
-                            newly_created_entities+=1
+                    # for the geometries from which entities were already created
+                    # NOT creating new ones but adding the existing ones (all at once)
+                    new_positions, existing_entity_ids = all_entities[entity_name].Find(geometry_ids, props_id)
+                    already_existing_entities = len(existing_entity_ids)
+                    if already_existing_entities > 0:
+                        fct_ptr_add_existing_entities(existing_entity_ids)
+
+                    # from the other geometries new entities are created
+                    if hasattr(geometry_ids, "shape"):
+                        new_geometry_ids = geometry_ids[new_positions]
+                    else:
+                        new_geometry_ids = [geometry_ids[position] for position in new_positions]
+                    if hasattr(connectivities, "shape"):
+                        new_connectivities = connectivities[new_positions]
+                    else:
+                        new_connectivities = [connectivities[position] for position in _AsList(new_positions)]
 
                 else: # no entities of this type exist yet, new entities can be added without checking
                     logger.debug('No entities with name "{}" exist already'.format(entity_name))
-                    all_entities[entity_name] = {}
-                    for geometry_id, connectivities in geometries[geometry_type].items():
-                        reordered_conn = reorder_conn_fct_ptr(connectivities)
-                        id_counter = fct_ptr_create_save_new_entity(entity_name, geometry_id, reordered_conn, props, id_counter)
-                        newly_created_entities+=1
-
-                logger.debug('{} new entities were created and {} existed already'.format(newly_created_entities, already_existing_entities))
+                    all_entities[entity_name] = CreatedEntities()
+                    new_geometry_ids = geometry_ids
+                    new_connectivities = connectivities
 
+                # the new entities are created all at once
+                if numpy_available:
+                    new_entity_ids = np.arange(id_counter, id_counter+len(new_geometry_ids), dtype=np.int64)
+                else:
+                    new_entity_ids = list(range(id_counter, id_counter+len(new_geometry_ids)))
+                fct_ptr_create_new_entities(entity_name, new_entity_ids, new_connectivities, props)
+                all_entities[entity_name].Add(new_geometry_ids, new_entity_ids, props_id)
+                id_counter += len(new_entity_ids)
+
+                logger.debug('{} new entities were created and {} existed already'.format(len(new_entity_ids), already_existing_entities))
+
+
+def GetNodesAndGeometricalEntitiesArrays(mesh_interface, geometrical_entity_types, extraction_cache):
+    """returns the nodes and geometries of a mesh as ((node_ids, coordinates), {entity_type : (entities_ids, connectivities)})
+    The arrays are used directly if the MeshInterface provides them (see "MeshInterface.GetNodesAndGeometricalEntitiesArrays"),
+    this avoids creating python objects for every node and geometry of every mesh.
+    Otherwise (e.g. without NumPy) the dicts of "GetNodesAndGeometricalEntities" are split into lists
+    """
+    if numpy_available and hasattr(mesh_interface, "GetNodesAndGeometricalEntitiesArrays"):
+        return mesh_interface.GetNodesAndGeometricalEntitiesArrays(geometrical_entity_types, extraction_cache)
+
+    nodes, geometries = mesh_interface.GetNodesAndGeometricalEntities(geometrical_entity_types, extraction_cache)
+    return (list(nodes.keys()), list(nodes.values())), {entity_type : (list(entities.keys()), list(entities.values())) for entity_type, entities in geometries.items()}
+
+def ReorderConnectivities(salome_entity_type, connectivities):
+    """reorders the connectivities of entities of a type from the node ordering of Salome to the one of Kratos
+    connectivities -- connectivities of all entities (num_entities x num_nodes), as array or list of lists
+    With NumPy the permutation is applied to all entities at once, the reordered connectivities are returned as array
+    Arrays (e.g. from "MeshInterface.GetNodesAndGeometricalEntitiesArrays") are permuted directly, lists are converted first
+    """
+    permutation = NODE_ORDER_PERMUTATIONS.get(salome_entity_type)
+    if permutation is None or len(connectivities) == 0:
+        return connectivities
+
+    if numpy_available:
+        if not hasattr(connectivities, "shape"):
+            connectivities = np.array(connectivities, dtype=np.int64).reshape(len(connectivities), -1)
+        return connectivities[:, permutation]
+    else:
+        return [[conn[i] for i in permutation] for conn in connectivities]
+
+def ShiftIds(ids, offset):
+    """adds the offset to the Ids, which can be given as array, list or list of lists (e.g. connectivities)
+    Arrays are shifted at once, the input is returned as it is if the offset is zero
+    """
+    if offset == 0:
+        return ids
+    if hasattr(ids, "shape"):
+        return ids + offset
+    if len(ids) > 0 and hasattr(ids[0], "__len__"): # e.g. connectivities
+        return [ShiftIds(conn, offset) for conn in ids]
+    return [i+offset for i in ids]
 
 def GetReorderFunction(salome_entity_type):
-    # for some entities the node ordering differs between Salome and Kratos
-    # those have to be corrected
-    return {
-        "Tetra" : lambda conn: [conn[i] for i in [0, 2, 1, 3]],
-        "Hexa"  : lambda conn: [conn[i] for i in [0, 3, 2, 1, 4, 7, 6, 5]],
-        "Penta" : lambda conn: [conn[i] for i in [0, 2, 1, 3, 5, 4]]
-    }.get(salome_entity_type, lambda conn: conn)
+    """returns a function that reorders the connectivity of one entity, see "ReorderConnectivities" for reordering many at once"""
+    permutation = NODE_ORDER_PERMUTATIONS.get(salome_entity_type)
+    if permutation is None:
+        return lambda conn: conn
+    return lambda conn: [conn[i] for i in permutation]
@@ -0,0 +1,175 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains functions for reading meshes from MED files, the native format of Salome
+MED files are HDF5 files, they are read with h5py. Every dataset is read at once, there are no calls per entity.
+
+Structure of the MED file (only the parts that are used):
+    ENS_MAA/<mesh_name>/<time_step>/NOE/COO       coordinates of the nodes (no interlace: x1 x2 ... y1 y2 ... z1 z2 ...)
+                                       /NOE/NUM       Ids of the nodes (optional, otherwise 1...num_nodes)
+                                       /NOE/FAM       families of the nodes (optional)
+                                       /MAI/<type>/NOD  connectivities of the entities, positions of the nodes (no interlace)
+                                       /MAI/<type>/NUM  Ids of the entities (optional)
+                                       /MAI/<type>/FAM  families of the entities (optional)
+    FAS/<mesh_name>/<NOEUD|ELEME>/<family>        attribute "NUM": number of the family
+                                         /GRO/NOM  names of the groups the family belongs to
+"""
+
+# python imports
+import logging
+logger = logging.getLogger(__name__)
+
+# numpy and h5py imports (optional, only needed for reading MED files)
+try:
+    import numpy as np
+    import h5py
+    h5py_available = True
+except ImportError:
+    h5py_available = False
+
+# types of the entities in MED files with the names of the entity types as in Salome and the number of nodes
+# the nodes are ordered in the same way in MED and in Salome
+# the types are ordered by their number in MED (e.g. 203 for "TR3"), which is the order in which the entities are numbered
+# if the file does not contain Ids. A tuple is used since the order of dicts is not preserved before Python 3.7
+MED_ENTITY_TYPES = (
+    ("PO1", "0D", 1),                   #   1
+    ("SE2", "Edge", 2),                 # 102
+    ("SE3", "Quad_Edge", 3),            # 103
+    ("TR3", "Triangle", 3),             # 203
+    ("QU4", "Quadrangle", 4),           # 204
+    ("TR6", "Quad_Triangle", 6),        # 206
+    ("TR7", "BiQuad_Triangle", 7),      # 207
+    ("QU8", "Quad_Quadrangle", 8),      # 208
+    ("QU9", "BiQuad_Quadrangle", 9),    # 209
+    ("TE4", "Tetra", 4),                # 304
+    ("PY5", "Pyramid", 5),              # 305
+    ("PE6", "Penta", 6),                # 306
+    ("HE8", "Hexa", 8),                 # 308
+    ("T10", "Quad_Tetra", 10),          # 310
+    ("P13", "Quad_Pyramid", 13),        # 313
+    ("P15", "Quad_Penta", 15),          # 315
+    ("P18", "BiQuad_Penta", 18),        # 318
+    ("H20", "Quad_Hexa", 20),           # 320
+    ("H27", "TriQuad_Hexa", 27),        # 327
+    ("POG", "Polygon", None),           # 400
+    ("POE", "Polyhedra", None)          # 500
+)
+
+MED_NAME_SIZE = 80 # length of the names of the groups
+
+
+def GetMeshNamesInMedFile(file_name):
+    """returns the names of the meshes in a MED file"""
+    with h5py.File(file_name, "r") as med_file:
+        return list(med_file["ENS_MAA"].keys()) if "ENS_MAA" in med_file else []
+
+
+def ReadMedFile(file_name, mesh_name=None):
+    """Reads a mesh from a MED file
+    If the file contains only one mesh then the name of the mesh does not have to be specified
+    Returns:
+        (node_ids, coordinates, node_families)
+        {entity_type : (entities_ids, connectivities, entities_families)}
+        {group_name : family_numbers}
+    The connectivities contain the Ids of the nodes. They are (num_entities x num_nodes) arrays, except for polygons and polyhedra (lists)
+    If the file does not contain Ids, then the nodes and entities are numbered consecutively, starting with 1
+    """
+    with h5py.File(file_name, "r") as med_file:
+        mesh_names = list(med_file["ENS_MAA"].keys()) if "ENS_MAA" in med_file else []
+        if mesh_name is None:
+            if len(mesh_names) != 1:
+                raise Exception('MED file "{}" contains {} meshes, the name of the mesh has to be specified! Available meshes: "{}"'.format(file_name, len(mesh_names), '", "'.join(mesh_names)))
+            mesh_name = mesh_names[0]
+        elif mesh_name not in mesh_names:
+            raise Exception('Mesh "{}" is not in MED file "{}"! Available meshes: "{}"'.format(mesh_name, file_name, '", "'.join(mesh_names)))
+
+        mesh = med_file["ENS_MAA"][mesh_name]
+        dimension = int(mesh.attrs["ESP"]) if "ESP" in mesh.attrs else int(mesh.attrs["DIM"])
+        mesh_data = _GetMeshDataOfFirstTimeStep(mesh)
+
+        nodes = _ReadNodes(mesh_data["NOE"], dimension)
+        geometries = _ReadGeometries(mesh_data["MAI"], nodes[0]) if "MAI" in mesh_data else {}
+        groups = _ReadGroups(med_file["FAS"][mesh_name]) if "FAS" in med_file and mesh_name in med_file["FAS"] else {}
+
+    return nodes, geometries, groups
+
+
+def _GetMeshDataOfFirstTimeStep(mesh):
+    # until MED 2 the data is stored directly in the mesh, afterwards in a group per time step
+    if "NOE" in mesh:
+        return mesh
+    for time_step in sorted(mesh.keys()):
+        if "NOE" in mesh[time_step]:
+            return mesh[time_step]
+    raise Exception('Mesh "{}" in MED file does not contain nodes!'.format(mesh.name))
+
+
+def _ReadNodes(nodes, dimension):
+    coordinates = nodes["COO"][()].reshape(dimension, -1).T
+    num_nodes = coordinates.shape[0]
+    if dimension < 3:
+        coordinates = np.hstack((coordinates, np.zeros((num_nodes, 3-dimension))))
+
+    node_ids = nodes["NUM"][()].astype(np.int64) if "NUM" in nodes else np.arange(1, num_nodes+1, dtype=np.int64)
+    node_families = nodes["FAM"][()].astype(np.int64) if "FAM" in nodes else np.zeros(num_nodes, dtype=np.int64)
+
+    return node_ids, np.ascontiguousarray(coordinates, dtype=np.float64), node_families
+
+
+def _ReadGeometries(cells, node_ids):
+    geometries = {}
+    num_entities = 0 # for the consecutive numbering if the file does not contain Ids
+    for med_type, entity_type, num_nodes in MED_ENTITY_TYPES:
+        if med_type not in cells:
+            continue
+        entities = cells[med_type]
+        # the connectivities contain the positions of the nodes (starting with 1), which are converted to the Ids
+        node_positions = entities["NOD"][()].astype(np.int64) - 1
+        if med_type == "POG":
+            index = entities["INN"][()].astype(np.int64) - 1
+            connectivities = [node_ids[node_positions[begin:end]].tolist() for begin, end in zip(index[:-1].tolist(), index[1:].tolist())]
+        elif med_type == "POE":
+            # polyhedra are given by their faces, the connectivity contains the nodes of all faces
+            index = entities["INN"][()].astype(np.int64) - 1
+            faces_index = entities["IFN"][()].astype(np.int64) - 1
+            connectivities = []
+            for begin, end in zip(faces_index[index[:-1]].tolist(), faces_index[index[1:]].tolist()):
+                unique_positions, first_positions = np.unique(node_positions[begin:end], return_index=True)
+                connectivities.append(node_ids[unique_positions[np.argsort(first_positions)]].tolist())
+        else:
+            connectivities = node_ids[node_positions.reshape(num_nodes, -1).T]
+
+        num_entities_type = len(connectivities)
+        entities_ids = entities["NUM"][()].astype(np.int64) if "NUM" in entities else np.arange(num_entities+1, num_entities+num_entities_type+1, dtype=np.int64)
+        entities_families = entities["FAM"][()].astype(np.int64) if "FAM" in entities else np.zeros(num_entities_type, dtype=np.int64)
+        num_entities += num_entities_type
+
+        geometries[entity_type] = (entities_ids, connectivities, entities_families)
+
+    return geometries
+
+
+def _ReadGroups(families):
+    # the groups are assigned to families of nodes ("NOEUD") and entities ("ELEME")
+    groups = {}
+    for family_type in ("NOEUD", "ELEME"):
+        if family_type not in families:
+            continue
+        for family in families[family_type].values():
+            if "GRO" not in family:
+                continue
+            family_number = int(family.attrs["NUM"])
+            group_names = np.asarray(family["GRO"]["NOM"][()]).tobytes()
+            for i in range(0, len(group_names), MED_NAME_SIZE):
+                group_name = group_names[i:i+MED_NAME_SIZE].split(b"\0")[0].decode().rstrip()
+                groups.setdefault(group_name, []).append(family_number)
+
+    return groups
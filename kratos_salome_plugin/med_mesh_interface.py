@@ -0,0 +1,159 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the MedMeshInterface
+It has the same interface as the MeshInterface, but the mesh (or a group of it) is read from a MED file
+Hence it can be used without Salome, e.g. for creating the input for Kratos from meshes that were saved before
+"""
+
+# python imports
+import os
+
+# plugin imports
+from .file_mesh_interface import FileMeshInterface
+from .med_file_io import ReadMedFile, h5py_available
+
+# numpy imports (required for reading MED files)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+
+class MedMeshInterface(FileMeshInterface):
+    def __init__(self, file_name, group_name=None, mesh_name=None):
+        """Constructor of MedMeshInterface
+        file_name -- the MED file containing the mesh
+        group_name -- the name of a group in the mesh, only the entities of the group (and their nodes) are used
+                      By default the entire mesh is used
+        mesh_name -- the name of the mesh, only required if the file contains more than one mesh
+        """
+        if not h5py_available:
+            raise ImportError('h5py and NumPy are required for reading meshes from MED files!')
+        super().__init__(file_name)
+        self.group_name = group_name
+        self.mesh_name = mesh_name
+
+    def GetMeshName(self):
+        if self.CheckMeshIsValid():
+            if self.group_name is not None:
+                return self.group_name
+            if self.mesh_name is not None:
+                return self.mesh_name
+            return os.path.splitext(os.path.basename(self.file_name))[0]
+        else:
+            return ""
+
+    def GetMeshType(self):
+        if self.CheckMeshIsValid():
+            return "MedGroup" if self.group_name is not None else "MedFile"
+        else:
+            return ""
+
+    def _GetMeshData(self, extraction_cache=None):
+        if extraction_cache is None:
+            med_mesh = _MedMesh(self.file_name, self.mesh_name)
+            return med_mesh if self.group_name is None else med_mesh.GetGroup(self.group_name)
+
+        # the file is read once for all meshes and groups
+        med_mesh = extraction_cache.GetOrCreate(self._GetMainMeshKey(), lambda: _MedMesh(self.file_name, self.mesh_name))
+        if self.group_name is None:
+            return med_mesh
+        return extraction_cache.GetOrCreate(self._GetMainMeshKey()+(self.group_name,), lambda: med_mesh.GetGroup(self.group_name))
+
+    def _GetMainMeshKey(self):
+        return (os.path.abspath(self.file_name), self.mesh_name)
+
+
+class _MedMesh:
+    """The nodes and geometries of a mesh in a MED file, the file is read once when the object is created"""
+    def __init__(self, file_name, mesh_name):
+        self.file_name = file_name
+        (node_ids, coordinates, node_families), self.__geometries, self.__groups = ReadMedFile(file_name, mesh_name)
+
+        order = np.argsort(node_ids, kind="stable")
+        self.__nodes = (node_ids[order], coordinates[order], node_families[order])
+
+        self.__sorted_geometries = {} # map: {entity_type : (entities_ids, connectivities)}
+
+    def GetNodes(self):
+        return self.__nodes[:2]
+
+    def GetConnectivities(self, entity_type):
+        """returns the sorted Ids and the connectivities of the entities of a type"""
+        if entity_type not in self.__sorted_geometries:
+            self.__sorted_geometries[entity_type] = _SelectEntities(self.__geometries.get(entity_type), None)
+        return self.__sorted_geometries[entity_type]
+
+    def GetEntityTypes(self):
+        return list(self.GetMeshInformation().keys())
+
+    def GetMeshInformation(self):
+        """returns the number of entities of each entity type in the mesh"""
+        return {entity_type : len(entities_ids) for entity_type, (entities_ids, _, _) in self.__geometries.items()}
+
+    def GetGroup(self, group_name):
+        if group_name not in self.__groups:
+            raise Exception('Group "{}" is not in the mesh of MED file "{}"! Available groups: "{}"'.format(group_name, self.file_name, '", "'.join(sorted(self.__groups.keys()))))
+        return _MedMeshGroup(self.__nodes, self.__geometries, self.__groups[group_name])
+
+    def Close(self):
+        self.__sorted_geometries.clear()
+
+
+class _MedMeshGroup:
+    """The nodes and geometries of a group, these are the entities of the families of the group and the nodes of these entities"""
+    def __init__(self, nodes, geometries, family_numbers):
+        self.__geometries = {}
+        group_node_ids = []
+        for entity_type, (entities_ids, connectivities, entities_families) in geometries.items():
+            selected_entities = np.flatnonzero(np.isin(entities_families, family_numbers))
+            if selected_entities.size > 0:
+                self.__geometries[entity_type] = _SelectEntities((entities_ids, connectivities, entities_families), selected_entities)
+                connectivities = self.__geometries[entity_type][1]
+                group_node_ids.append(connectivities.ravel() if isinstance(connectivities, np.ndarray) else np.array([node_id for connectivity in connectivities for node_id in connectivity], dtype=np.int64))
+
+        node_ids, coordinates, node_families = nodes
+        group_node_ids.append(node_ids[np.isin(node_families, family_numbers)])
+        selected_nodes = np.isin(node_ids, np.concatenate(group_node_ids))
+        self.__nodes = (node_ids[selected_nodes], coordinates[selected_nodes])
+
+    def GetNodes(self):
+        return self.__nodes
+
+    def GetConnectivities(self, entity_type):
+        return self.__geometries.get(entity_type, _SelectEntities(None, None))
+
+    def GetEntityTypes(self):
+        return list(self.GetMeshInformation().keys())
+
+    def GetMeshInformation(self):
+        return {entity_type : len(entities_ids) for entity_type, (entities_ids, _) in self.__geometries.items()}
+
+    def Close(self):
+        self.__geometries.clear()
+
+
+def _SelectEntities(entities, selected_entities):
+    """returns the Ids and the connectivities of the selected entities (all if None), sorted by the Ids"""
+    if entities is None:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.int64)
+
+    entities_ids, connectivities, _ = entities
+    if selected_entities is None:
+        selected_entities = np.arange(len(entities_ids))
+    selected_entities = selected_entities[np.argsort(entities_ids[selected_entities], kind="stable")]
+
+    if isinstance(connectivities, np.ndarray):
+        return entities_ids[selected_entities], connectivities[selected_entities]
+    else: # polygons and polyhedra
+        return entities_ids[selected_entities], [connectivities[i] for i in selected_entities.tolist()]
@@ -0,0 +1,166 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the MeshDiskCache
+It stores the nodes and geometries extracted from meshes in files, such that meshes that did not change
+don't have to be extracted again, e.g. when a script is executed again
+The entries are identified by a fingerprint of the mesh, see "GetFingerprint"
+"""
+
+# python imports
+import os
+import hashlib
+import logging
+logger = logging.getLogger(__name__)
+
+# numpy imports (required for the cache)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# maximum size of the files in the cache in bytes, the least recently used entries are removed if it is exceeded
+DEFAULT_MAX_CACHE_SIZE = 2**30 # 1 GB
+
+CACHE_FILE_EXTENSION = ".npz"
+
+
+def GetFingerprint(*values):
+    """returns a fingerprint (hash) of the given values, which can be numbers, strings, lists and NumPy arrays"""
+    fingerprint = hashlib.sha1()
+    for value in values:
+        if numpy_available and isinstance(value, np.ndarray):
+            fingerprint.update(str((value.dtype, value.shape)).encode())
+            fingerprint.update(np.ascontiguousarray(value).tobytes())
+        else:
+            fingerprint.update(repr(value).encode())
+        fingerprint.update(b"|")
+    return fingerprint.hexdigest()
+
+
+class MeshDiskCache:
+    def __init__(self, cache_directory, max_size=DEFAULT_MAX_CACHE_SIZE):
+        """Constructor of MeshDiskCache
+        cache_directory -- the directory in which the files are stored, it is created if it does not exist
+        max_size -- maximum size of the files in bytes, the least recently used entries are removed if it is exceeded
+        """
+        if not numpy_available:
+            raise ImportError('NumPy is required for the MeshDiskCache!')
+        self.cache_directory = cache_directory
+        self.max_size = max_size
+
+    def Load(self, fingerprint):
+        """returns the nodes and geometries stored with the fingerprint, None if they are not in the cache
+        Format: ((node_ids, coordinates), {entity_type : (entities_ids, connectivities)}), see "MeshInterface.GetNodesAndGeometricalEntitiesArrays"
+        """
+        file_name = self.__GetFileName(fingerprint)
+        if not os.path.isfile(file_name):
+            return None
+
+        try:
+            with np.load(file_name) as cache_file:
+                nodes_and_geometries = _FromArrays({name : cache_file[name] for name in cache_file.files})
+        except Exception as e:
+            logger.warning('Removing invalid file "{}" from the cache: {}'.format(file_name, e))
+            _RemoveFile(file_name)
+            return None
+
+        os.utime(file_name, None) # marks the entry as used, for the eviction
+        return nodes_and_geometries
+
+    def Store(self, fingerprint, nodes_and_geometries):
+        """stores the nodes and geometries with the fingerprint and removes the least recently used entries if the cache is too large"""
+        file_name = self.__GetFileName(fingerprint)
+
+        # the file is written under a temporary name first, such that no incomplete files are read
+        tmp_file_name = "{}.{}.tmp".format(file_name, os.getpid())
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            with open(tmp_file_name, "wb") as cache_file:
+                np.savez(cache_file, **_ToArrays(nodes_and_geometries))
+            os.replace(tmp_file_name, file_name)
+        except OSError as e:
+            # the cache is only used for speeding up the extraction, hence failing to write it is not an error
+            logger.warning('Storing the mesh in the cache in "{}" failed: {}'.format(self.cache_directory, e))
+            _RemoveFile(tmp_file_name)
+            return
+
+        self.__RemoveLeastRecentlyUsedEntries()
+
+    def GetSize(self):
+        """returns the size of the files in the cache in bytes"""
+        return sum([size for _, _, size in self.__GetEntries()])
+
+    def Clear(self):
+        for file_name, _, _ in self.__GetEntries():
+            _RemoveFile(file_name)
+
+    def __len__(self):
+        return len(self.__GetEntries())
+
+    def __GetFileName(self, fingerprint):
+        return os.path.join(self.cache_directory, fingerprint + CACHE_FILE_EXTENSION)
+
+    def __GetEntries(self):
+        """returns the files in the cache with the time of the last use and the size, the least recently used first"""
+        if not os.path.isdir(self.cache_directory):
+            return []
+        entries = []
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.endswith(CACHE_FILE_EXTENSION):
+                file_path = os.path.join(self.cache_directory, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue # removed in the meantime
+                entries.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def __RemoveLeastRecentlyUsedEntries(self):
+        entries = self.__GetEntries()
+        cache_size = sum([size for _, _, size in entries])
+        for file_name, _, size in entries:
+            if cache_size <= self.max_size:
+                break
+            logger.debug('Removing file "{}" from the cache'.format(file_name))
+            _RemoveFile(file_name)
+            cache_size -= size
+
+
+def _ToArrays(nodes_and_geometries):
+    (node_ids, coordinates), geometries = nodes_and_geometries
+    arrays = {"node_ids" : node_ids, "coordinates" : coordinates, "entity_types" : np.array(list(geometries.keys()), dtype=str)}
+    for i, (entities_ids, connectivities) in enumerate(geometries.values()):
+        arrays["entities_ids_{}".format(i)] = entities_ids
+        if isinstance(connectivities, list): # entities with a varying number of nodes, stored in a flat array
+            arrays["offsets_{}".format(i)] = np.cumsum([0]+[len(connectivity) for connectivity in connectivities], dtype=np.int64)
+            arrays["connectivities_{}".format(i)] = np.array([node_id for connectivity in connectivities for node_id in connectivity], dtype=np.int64)
+        else:
+            arrays["connectivities_{}".format(i)] = connectivities
+    return arrays
+
+def _FromArrays(arrays):
+    geometries = {}
+    for i, entity_type in enumerate(arrays["entity_types"].tolist()):
+        connectivities = arrays["connectivities_{}".format(i)]
+        offsets_name = "offsets_{}".format(i)
+        if offsets_name in arrays:
+            offsets = arrays[offsets_name].tolist()
+            connectivities = [connectivities[begin:end].tolist() for begin, end in zip(offsets[:-1], offsets[1:])]
+        geometries[entity_type] = (arrays["entities_ids_{}".format(i)], connectivities)
+    return (arrays["node_ids"], arrays["coordinates"]), geometries
+
+def _RemoveFile(file_name):
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass # removed in the meantime
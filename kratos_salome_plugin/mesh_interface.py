@@ -14,156 +14,262 @@ It interacts with the database of Salome to access the Mesh
 """
 
 # python imports
+import os
 import time
+import tempfile
 import logging
+from concurrent.futures import ThreadPoolExecutor
 logger = logging.getLogger(__name__)
 
 # plugin imports
 from . import salome_utilities
 from . import salome_mesh_utilities
+from . import salome_study_utilities
+from .dat_file_io import ReadNodesFromDatFile, ReadElementsFromDatFile
+from .mesh_disk_cache import GetFingerprint
+
+# numpy imports (optional, only needed for extracting the mesh in bulk)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
 
 # salome imports
 import SMESH
 
 smesh = salome_mesh_utilities.GetSmesh()
 
+# number of entities that are requested from Salome by a thread at once
+REQUESTS_CHUNK_SIZE = 1000
+
+# number of nodes whose coordinates are used for the fingerprint of the mesh, see "MeshInterface.__GetFingerprint"
+FINGERPRINT_NUM_SAMPLES = 16
+
 
 class MeshInterface:
-    def __init__(self, mesh_identifier):
+    def __init__(self, mesh_identifier, num_workers=1, chunk_size=REQUESTS_CHUNK_SIZE, disk_cache=None):
+        """Constructor of MeshInterface
+        mesh_identifier -- identifier of the mesh in the study of Salome
+        num_workers -- number of threads that request the entities separately from Salome (opt-in, disabled by default)
+                       This is used if NumPy is not available or the entities can not be extracted through a DAT file
+        chunk_size -- number of entities that are requested by a thread at once
+        disk_cache -- a "mesh_disk_cache.MeshDiskCache" in which the extracted nodes and geometries are stored (opt-in, disabled by default)
+                      If the mesh did not change, then they are loaded from the cache instead of extracting them again
+        """
         self.mesh_identifier = mesh_identifier
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.disk_cache = disk_cache
+        self.__resolved_mesh = None # see "__GetResolvedMesh"
 
     def GetNodes(self):
+        return self.GetNodesAndGeometricalEntities()[0]
+
+    def GetNodeIdsAndCoordinates(self):
+        """Returns the Ids of the nodes (sorted) and their coordinates (num_nodes x 3) as NumPy arrays
+        The coordinates of all nodes are extracted at once, see "GetNodesAndGeometricalEntitiesArrays"
+        """
+        return self.GetNodesAndGeometricalEntitiesArrays()[0]
+
+    def GetNodesAndGeometricalEntities(self, geometrical_entity_types=[], extraction_cache=None):
+        # one function, since might be more efficient to get both at the same time if extracted through file
+        # TODO maybe return all geometries if list is empty? => but how to get only the nodes then...?
         if self.CheckMeshIsValid():
+            if numpy_available:
+                # getting all nodes and geometries at once is much faster
+                (node_ids, coordinates), geometries = self.GetNodesAndGeometricalEntitiesArrays(geometrical_entity_types, extraction_cache)
+                nodes = dict(zip(node_ids.tolist(), coordinates.tolist()))
+                geom_entities = {entity_type : dict(zip(entities_ids.tolist(), connectivities.tolist() if hasattr(connectivities, "tolist") else connectivities)) for entity_type, (entities_ids, connectivities) in geometries.items()}
+                return nodes, geom_entities
+
             start_time = time.time()
-            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
+            current_mesh = self.__GetResolvedMesh().GetObject()
+            main_mesh, node_ids = _GetMainMeshAndNodeIds(current_mesh)
+            node_ids = sorted(node_ids)
 
-            if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
-                main_mesh = current_mesh.GetMesh()
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodesId()
+            geometrical_entity_types_salome = [salome_mesh_utilities.EntityTypeFromString(entity) for entity in geometrical_entity_types]
 
-            elif salome_mesh_utilities.IsMeshGroup(current_mesh):
-                main_mesh = current_mesh.GetMesh()
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodeIDs()
+            with _EntitiesRequests(self.num_workers, self.chunk_size) as requests:
+                # the requests for the nodes and all geometries are submitted first, such that they can be processed concurrently
+                requested_nodes = requests.Submit(main_mesh.GetNodeXYZ, node_ids)
+
+                entity_types_in_mesh = self.GetEntityTypesInMesh() if len(geometrical_entity_types_salome) > 0 else []
+                entities_ids_by_type = self.__GetEntitiesIdsByType(current_mesh, geometrical_entity_types_salome, entity_types_in_mesh)
+                entity_types_not_in_mesh = []
+                requested_geom_entities = []
+                for entity_type in geometrical_entity_types_salome:
+                    entity_type_str = salome_mesh_utilities.EntityTypeToString(entity_type)
+                    if entity_type_str == "Node":
+                        requested_geom_entities.append((entity_type_str, None, None))
+                    elif entity_type in entity_types_in_mesh:
+                        entities_main_mesh, entities_ids = entities_ids_by_type[entity_type]
+                        entities_ids = sorted(entities_ids)
+                        requested_geom_entities.append((entity_type_str, entities_ids, requests.Submit(entities_main_mesh.GetElemNodes, entities_ids)))
+                    else:
+                        requested_geom_entities.append((entity_type_str, [], None))
+                        entity_types_not_in_mesh.append(entity_type)
+
+                # collecting the results, in the order of the requests
+                nodes = dict(zip(node_ids, requested_nodes.Results()))
+                self.__LogExtractionTime("Nodes", len(nodes), start_time)
+
+                start_time = time.time()
+                geom_entities = {}
+                for entity_type_str, entities_ids, requested_entities in requested_geom_entities:
+                    if entity_type_str == "Node":
+                        logger.debug("Creating 0D elements for all nodes.")
+                        geom_entities["Node"] = {x:[x] for x in node_ids}
+                    elif requested_entities is None:
+                        geom_entities[entity_type_str] = {}
+                    else:
+                        geom_entities[entity_type_str] = dict(zip(entities_ids, requested_entities.Results()))
+
+            if len(geometrical_entity_types_salome) > 0:
+                self.__LogEntityTypesNotInMesh(entity_types_not_in_mesh, entity_types_in_mesh)
+
+                self.__LogExtractionTime("Geometrical Entities", sum([len(ge) for ge in geom_entities.values()]), start_time)
 
-            else: # MeshProxy
-                main_mesh = current_mesh
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodesId()
+            return nodes, geom_entities
 
-            nodes = {node_id : main_mesh.GetNodeXYZ(node_id) for node_id in sorted(get_nodes_fct_ptr(current_mesh))}
-            logger.info('Getting {0} Nodes from Mesh "{1}" of type "{2}" took {3:.3} [s]'.format(len(nodes), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
-            return nodes
         else:
-            return {}
+            return {}, {}
 
-    def GetNodesAndGeometricalEntities(self, geometrical_entity_types=[]):
-        # one function, since might be more efficient to get both at the same time if extracted through file
-        # TODO maybe return all geometries if list is empty? => but how to get only the nodes then...?
-        if self.CheckMeshIsValid():
-            nodes = self.GetNodes() # nodes are always needed
+    def GetNodesAndGeometricalEntitiesArrays(self, geometrical_entity_types=[], extraction_cache=None):
+        """Same as "GetNodesAndGeometricalEntities", but the nodes and geometries are returned as NumPy arrays:
+        ((node_ids, coordinates), {entity_type : (entities_ids, connectivities)})
+        The Ids are sorted, the connectivities of the geometries have the shape (num_entities x num_nodes_per_entity)
+        (for entity types with a varying number of nodes, e.g. polygons, they are a list of lists)
+
+        The mesh is exported once to a DAT file which is then read with NumPy.
+        This is much faster than getting the coordinates and connectivities of each entity separately,
+        since every call is a request to the server of Salome.
+
+        If an extraction cache is given (see "geometries_io.ExtractionCache"), then the whole main mesh is extracted once
+        and shared with the other meshes (e.g. submeshes and groups) of the same main mesh.
+        The entities of this mesh are then selected from the extracted main mesh by their Ids.
+
+        If the MeshInterface has a disk cache and the mesh did not change since it was stored, then the nodes and geometries are loaded from it.
+        """
+        if not self.CheckMeshIsValid():
+            return (np.empty(0, dtype=np.int64), np.empty((0, 3))), {}
+
+        current_mesh = self.__GetResolvedMesh().GetObject()
+        main_mesh, node_ids = _GetMainMeshAndNodeIds(current_mesh)
+
+        if self.disk_cache is not None:
+            start_time = time.time()
+            fingerprint = self.__GetFingerprint(main_mesh, node_ids, geometrical_entity_types)
+            nodes_and_geometries = self.disk_cache.Load(fingerprint)
+            if nodes_and_geometries is not None:
+                self.__LogExtractionTime("Nodes and Geometrical Entities (from the disk cache)", len(nodes_and_geometries[0][0]) + sum([len(ids) for ids, _ in nodes_and_geometries[1].values()]), start_time)
+                return nodes_and_geometries
+
+        if extraction_cache is None:
+            mesh_extraction = _MeshPartExtraction(main_mesh, current_mesh)
+        else:
+            main_mesh_identifier = self.mesh_identifier if main_mesh is current_mesh else salome_utilities.GetSalomeID(main_mesh)
+            mesh_extraction = extraction_cache.GetOrCreate(main_mesh_identifier, lambda: _MainMeshExtraction(main_mesh))
+
+        try:
+            nodes_and_geometries = self.__GetNodesAndGeometricalEntitiesArrays(current_mesh, node_ids, geometrical_entity_types, mesh_extraction)
+        finally:
+            if extraction_cache is None:
+                mesh_extraction.Close()
+
+        if self.disk_cache is not None:
+            self.disk_cache.Store(fingerprint, nodes_and_geometries)
+
+        return nodes_and_geometries
+
+    def __GetNodesAndGeometricalEntitiesArrays(self, current_mesh, node_ids, geometrical_entity_types, mesh_extraction):
+        with _EntitiesRequests(self.num_workers, self.chunk_size) as requests:
+            start_time = time.time()
+            node_ids, coordinates = mesh_extraction.GetNodes(node_ids, requests)
+            self.__LogExtractionTime("Nodes", len(node_ids), start_time)
 
             geometrical_entity_types_salome = [salome_mesh_utilities.EntityTypeFromString(entity) for entity in geometrical_entity_types]
 
             if len(geometrical_entity_types_salome) == 0:
-                return nodes, {}
+                return (node_ids, coordinates), {}
 
             start_time = time.time()
 
-            geom_entities = {}
-            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-
+            geometries = {}
             entity_types_in_mesh = self.GetEntityTypesInMesh()
-            logged_entity_types_in_mesh = False
+            entities_ids_by_type = self.__GetEntitiesIdsByType(current_mesh, geometrical_entity_types_salome, entity_types_in_mesh)
+            entity_types_not_in_mesh = []
             for entity_type in geometrical_entity_types_salome:
                 entity_type_str = salome_mesh_utilities.EntityTypeToString(entity_type)
                 if entity_type_str == "Node":
                     logger.debug("Creating 0D elements for all nodes.")
-                    geom_entities["Node"] = {x:[x] for x in sorted(nodes.keys())}
+                    geometries["Node"] = (node_ids, node_ids.reshape(-1, 1))
                 elif entity_type in entity_types_in_mesh:
-                    if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
-                        main_mesh = smesh.Mesh(current_mesh.GetFather())
-                        sub_shape = current_mesh.GetSubShape()
-                        c1 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_EntityType, '=', entity_type, BinaryOp=SMESH.FT_LogicalAND)
-                        c2 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_BelongToGeom, sub_shape)
-                        entities_filter = smesh.GetFilterFromCriteria([c1,c2])
-                        entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
-
-                    elif salome_mesh_utilities.IsMeshGroup(current_mesh):
-                        main_mesh = current_mesh.GetMesh()
-                        entities_ids = current_mesh.GetListOfID()
-
-                    else: # MeshProxy
-                        entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_EntityType,'=', entity_type)
-                        main_mesh = smesh.Mesh(current_mesh)
-                        entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
-
-                    geom_entities[entity_type_str] = {ent_id : main_mesh.GetElemNodes(ent_id) for ent_id in sorted(entities_ids)}
+                    entities_main_mesh, entities_ids = entities_ids_by_type[entity_type]
+                    geometries[entity_type_str] = mesh_extraction.GetConnectivities(entity_type, entities_main_mesh, entities_ids, requests)
                 else:
-                    geom_entities[entity_type_str] = {}
+                    geometries[entity_type_str] = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.int64))
+                    entity_types_not_in_mesh.append(entity_type)
 
-                    logger.warning('Entity type "{}" not in Mesh "{}"!'.format(salome_mesh_utilities.EntityTypeToString(entity_type), self.GetMeshName()))
-                    if not logged_entity_types_in_mesh:
-                        logged_entity_types_in_mesh = True
-                        avail_entity_types_as_str = [salome_mesh_utilities.EntityTypeToString(e) for e in entity_types_in_mesh]
-                        logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(avail_entity_types_as_str)))
+            self.__LogEntityTypesNotInMesh(entity_types_not_in_mesh, entity_types_in_mesh)
 
-            logger.info('Getting {0} Geometrical Entities from Mesh "{1}" of type "{2}" took {3:.3f} [s]'.format(sum([len(ge) for ge in geom_entities.values()]), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+            self.__LogExtractionTime("Geometrical Entities", sum([len(ids) for ids, _ in geometries.values()]), start_time)
 
-            return nodes, geom_entities
-
-        else:
-            return {}, {}
+        return (node_ids, coordinates), geometries
 
     def GetEntityTypesInMesh(self):
         # Note: EntityTypes != GeometryTypes in Salome, see the documentation of SMESH
         if self.CheckMeshIsValid():
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-            return [e for e, v in smesh.GetMeshInfo(mesh).items() if v > 0]
+            return list(self.__GetResolvedMesh().GetMeshInfo().keys())
         else:
             return []
 
     def GetMeshInformation(self):
         if self.CheckMeshIsValid():
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
             # TODO probably has to be converted to string
-            return {e : v for e, v in smesh.GetMeshInfo(mesh).items() if v > 0}
+            return dict(self.__GetResolvedMesh().GetMeshInfo())
         else:
             return {}
 
-    def GetNumberOfNodes(self):
-        raise NotImplementedError
-
-    def GetNumberOfGeometries(self, geometry_type):
-        # return -1 if the requested type is not available
-        raise NotImplementedError
+    def GetNumberOfNodes(self, extraction_cache=None):
+        """returns the number of nodes of the mesh, from the counters of Salome (the nodes are not extracted)
+        returns 0 if the mesh is not valid
+        The extraction cache is not needed for the counters, it is accepted for compatibility with the "FileMeshInterface"
+        """
+        if self.CheckMeshIsValid():
+            return self.__GetResolvedMesh().GetNumberOfNodes()
+        else:
+            return 0
+
+    def GetNumberOfGeometries(self, geometry_type, extraction_cache=None):
+        """returns the number of geometrical entities of a type (e.g. "Triangle") in the mesh, from the counters of Salome
+        For "Node" it is the number of nodes, see "GetNodesAndGeometricalEntities"
+        returns 0 if the requested type is not in the mesh or the mesh is not valid
+        """
+        if not self.CheckMeshIsValid():
+            return 0
+        if geometry_type == "Node":
+            return self.__GetResolvedMesh().GetNumberOfNodes()
+        entity_type = salome_mesh_utilities.EntityTypeFromString(geometry_type)
+        return self.__GetResolvedMesh().GetMeshInfo().get(entity_type, 0)
 
     def CheckMeshIsValid(self):
-        # check if object exists
-        if not salome_utilities.ObjectExists(self.mesh_identifier):
-            logger.critical('Mesh with identifier "{}" in MeshInterface does not exist'.format(self.mesh_identifier))
-            return False
-
-        # if the object is a mesh
-        salome_object = salome_utilities.GetSalomeObject(self.mesh_identifier)
-        if not salome_mesh_utilities.IsMeshProxy(salome_object) and not salome_mesh_utilities.IsSubMeshProxy(salome_object) and not salome_mesh_utilities.IsMeshGroup(salome_object):
-            obj_type = type(salome_object)
-            obj_name = salome_utilities.GetObjectName(self.mesh_identifier)
-            logger.critical('Object with identifier "{}" is not a mesh! Name: "{}" , Type: "{}"'.format(self.mesh_identifier, obj_name, obj_type))
+        invalid_message = self.__GetResolvedMesh().GetInvalidMessage()
+        if invalid_message != "":
+            logger.critical(invalid_message)
             return False
 
         return True
 
     def GetMeshName(self):
         if self.CheckMeshIsValid():
-            return salome_utilities.GetObjectName(self.mesh_identifier)
+            return self.__GetResolvedMesh().GetName()
         else:
             return ""
 
     def GetMeshType(self):
         if self.CheckMeshIsValid():
-            salome_object = salome_utilities.GetSalomeObject(self.mesh_identifier)
-            if salome_mesh_utilities.IsSubMeshProxy(salome_object): return "SubMeshProxy"
-            elif salome_mesh_utilities.IsMeshGroup(salome_object):  return "MeshGroup"
-            else:                                                   return "MeshProxy"
+            return self.__GetResolvedMesh().GetMeshType()
         else:
             return ""
 
@@ -176,13 +282,78 @@ class MeshInterface:
         string_buf += "{}  Mesh is valid: {}\n".format(prefix_string, mesh_is_valid)
         if mesh_is_valid:
             string_buf += "{}  Mesh has the following entities:\n".format(prefix_string)
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-            for e, v in smesh.GetMeshInfo(mesh).items():
-                if v > 0:
-                    string_buf += "{}    {}: {}\n".format(prefix_string, str(e)[7:], v)
+            for e, v in self.__GetResolvedMesh().GetMeshInfo().items():
+                string_buf += "{}    {}: {}\n".format(prefix_string, str(e)[7:], v)
 
         return string_buf
 
+    def __GetResolvedMesh(self):
+        """returns the mesh resolved from the study, it is resolved again if the identifier or the study changed"""
+        if self.__resolved_mesh is None or not self.__resolved_mesh.IsUpToDate(self.mesh_identifier):
+            self.__resolved_mesh = _ResolvedMesh(self.mesh_identifier)
+        return self.__resolved_mesh
+
+    def __GetFingerprint(self, main_mesh, node_ids, geometrical_entity_types):
+        """returns a fingerprint of the mesh, which changes if the mesh changes
+        It consists of the name, the identifier and the number of entities of the mesh, the Ids of the nodes
+        and the coordinates of some of the nodes. Only few requests to Salome are needed for it.
+        """
+        node_ids = np.sort(np.asarray(node_ids, dtype=np.int64))
+        sampled_coordinates = [list(main_mesh.GetNodeXYZ(int(node_ids[pos]))) for pos in _SamplePositions(node_ids.size, FINGERPRINT_NUM_SAMPLES)] if node_ids.size > 0 else []
+        mesh_information = sorted([(str(entity_type), num_entities) for entity_type, num_entities in self.GetMeshInformation().items()])
+
+        return GetFingerprint(self.mesh_identifier, self.GetMeshName(), self.GetMeshType(), mesh_information, list(geometrical_entity_types), node_ids, sampled_coordinates)
+
+    def __GetEntitiesIdsByType(self, current_mesh, entity_types, entity_types_in_mesh):
+        """returns the main mesh and the Ids of the entities for each of the entity types that are in the mesh
+        For submeshes with several entity types the geometrical query ("BelongToGeom") is done only once,
+        the resulting Ids are then split by the entity types, see "_SplitIdsByEntityType"
+        """
+        entity_types = [e for e in entity_types if e in entity_types_in_mesh and salome_mesh_utilities.EntityTypeToString(e) != "Node"]
+
+        if len(set(entity_types)) > 1 and salome_mesh_utilities.IsSubMeshProxy(current_mesh):
+            main_mesh = smesh.Mesh(current_mesh.GetFather())
+            entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_BelongToGeom, current_mesh.GetSubShape())
+            sub_mesh_entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
+            entities_ids_by_type = _SplitIdsByEntityType(main_mesh, sub_mesh_entities_ids, entity_types)
+            return {entity_type : (main_mesh, entities_ids) for entity_type, entities_ids in entities_ids_by_type.items()}
+
+        return {entity_type : self.__GetEntitiesIds(current_mesh, entity_type) for entity_type in entity_types}
+
+    def __GetEntitiesIds(self, current_mesh, entity_type):
+        """returns the main mesh and the Ids of the entities of a type"""
+        if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
+            main_mesh = smesh.Mesh(current_mesh.GetFather())
+            sub_shape = current_mesh.GetSubShape()
+            c1 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_EntityType, '=', entity_type, BinaryOp=SMESH.FT_LogicalAND)
+            c2 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_BelongToGeom, sub_shape)
+            entities_filter = smesh.GetFilterFromCriteria([c1,c2])
+            entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
+
+        elif salome_mesh_utilities.IsMeshGroup(current_mesh):
+            # groups can contain entities of different types (e.g. triangles and quadrilaterals)
+            main_mesh = current_mesh.GetMesh()
+            entities_ids = _GetIdsOfEntityTypeInSource(main_mesh, current_mesh, entity_type)
+
+        else: # MeshProxy
+            entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_EntityType,'=', entity_type)
+            main_mesh = smesh.Mesh(current_mesh)
+            entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
+
+        return main_mesh, entities_ids
+
+    def __LogEntityTypesNotInMesh(self, entity_types_not_in_mesh, entity_types_in_mesh):
+        for entity_type in entity_types_not_in_mesh:
+            logger.warning('Entity type "{}" not in Mesh "{}"!'.format(salome_mesh_utilities.EntityTypeToString(entity_type), self.GetMeshName()))
+        if len(entity_types_not_in_mesh) > 0:
+            avail_entity_types_as_str = [salome_mesh_utilities.EntityTypeToString(e) for e in entity_types_in_mesh]
+            logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(avail_entity_types_as_str)))
+
+    def __LogExtractionTime(self, entities_name, num_entities, start_time):
+        duration = time.time()-start_time
+        throughput = num_entities/duration if duration > 0.0 else float("inf")
+        logger.info('Getting {0} {1} from Mesh "{2}" of type "{3}" took {4:.3f} [s] ({5:.0f} {1}/s)'.format(num_entities, entities_name, self.GetMeshName(), self.GetMeshType(), duration, throughput))
+
     def __str__(self):
         string_buf = self.PrintInfo()
         string_buf += self.PrintData()
@@ -199,3 +370,318 @@ class MeshInterface:
                 return False
 
         return salome_mesh_utilities.DoMeshesBelongToSameMainMesh(mesh_identifiers)
+
+
+class _ResolvedMesh:
+    """A mesh object that was resolved from the study and classified, this is done only once since every lookup is a request to the study
+    The object is kept until the study changes (see "salome_study_utilities.GetStudyGeneration"), since the lookup returns a new proxy every time
+    Its existence is checked in every "GetInvalidMessage" (i.e. once per call of the MeshInterface), since it can be deleted from the study
+    The contents of the mesh can change (e.g. when it is computed again), hence the number of entities are requested from the object every time
+    """
+    def __init__(self, mesh_identifier):
+        self.mesh_identifier = mesh_identifier
+        self.study_generation = salome_study_utilities.GetStudyGeneration()
+        self.__object = None
+        self.__classification = None # (invalid_message, mesh_type), see "__Classify"
+
+    def GetInvalidMessage(self):
+        """returns why the object is not a valid mesh, empty if it is valid"""
+        if not salome_utilities.ObjectExists(self.mesh_identifier):
+            # the proxy cannot be used anymore, the object is resolved again in case it exists again
+            self.__object = None
+            self.__classification = None
+            return 'Mesh with identifier "{}" in MeshInterface does not exist'.format(self.mesh_identifier)
+        return self.__Classify()[0]
+
+    def GetName(self):
+        # the object can be renamed
+        return salome_utilities.GetObjectName(self.mesh_identifier)
+
+    def GetMeshType(self):
+        return self.__Classify()[1]
+
+    def IsUpToDate(self, mesh_identifier):
+        return self.mesh_identifier == mesh_identifier and self.study_generation == salome_study_utilities.GetStudyGeneration()
+
+    def GetObject(self):
+        if self.__object is None:
+            self.__object = salome_utilities.GetSalomeObject(self.mesh_identifier)
+        return self.__object
+
+    def GetMeshInfo(self):
+        """returns the number of entities of each entity type in the mesh (only the ones that exist)"""
+        return {e : v for e, v in smesh.GetMeshInfo(self.GetObject()).items() if v > 0}
+
+    def GetNumberOfNodes(self):
+        salome_object = self.GetObject()
+        if salome_mesh_utilities.IsSubMeshProxy(salome_object):
+            return salome_object.GetNumberOfNodes(True) # also the nodes on the boundary of the subshape
+        elif salome_mesh_utilities.IsMeshGroup(salome_object):
+            return salome_object.GetNumberOfNodes()
+        else: # MeshProxy
+            return salome_object.NbNodes()
+
+    def __Classify(self):
+        if self.__classification is None:
+            # if the object is a mesh
+            salome_object = self.GetObject()
+            if salome_mesh_utilities.IsSubMeshProxy(salome_object): self.__classification = ("", "SubMeshProxy")
+            elif salome_mesh_utilities.IsMeshGroup(salome_object):  self.__classification = ("", "MeshGroup")
+            elif salome_mesh_utilities.IsMeshProxy(salome_object):  self.__classification = ("", "MeshProxy")
+            else:
+                obj_name = salome_utilities.GetObjectName(self.mesh_identifier)
+                obj_type = type(salome_object)
+                self.__classification = ('Object with identifier "{}" is not a mesh! Name: "{}" , Type: "{}"'.format(self.mesh_identifier, obj_name, obj_type), "")
+
+        return self.__classification
+
+def _GetMainMeshAndNodeIds(mesh):
+    """returns the main mesh and the Ids of the nodes of a mesh"""
+    if salome_mesh_utilities.IsSubMeshProxy(mesh):
+        return mesh.GetMesh(), mesh.GetNodesId()
+    elif salome_mesh_utilities.IsMeshGroup(mesh):
+        return mesh.GetMesh(), mesh.GetNodeIDs()
+    else: # MeshProxy
+        return mesh, mesh.GetNodesId()
+
+class _DatExport:
+    """Exports a mesh part to a DAT file (once, when it is first needed) and reads the nodes and elements from it
+    If the export fails, then the exception is raised again on every access
+    """
+    def __init__(self, main_mesh, mesh_part):
+        self.__main_mesh = main_mesh
+        self.__mesh_part = mesh_part
+        self.__tmp_dir = None
+        self.__export_error = None
+        self.__elements = None
+
+    def ReadNodes(self):
+        return ReadNodesFromDatFile(self.__GetFileName())
+
+    def ReadElements(self):
+        if self.__elements is None:
+            self.__elements = ReadElementsFromDatFile(self.__GetFileName())
+        return self.__elements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+
+    def Close(self):
+        if self.__tmp_dir is not None:
+            self.__tmp_dir.cleanup()
+            self.__tmp_dir = None
+
+    def __GetFileName(self):
+        if self.__export_error is not None:
+            raise self.__export_error
+        if self.__tmp_dir is None:
+            self.__tmp_dir = tempfile.TemporaryDirectory()
+            try:
+                _ExportPartToDat(self.__main_mesh, self.__mesh_part, self.__FileName())
+            except Exception as e:
+                self.__export_error = e
+                raise
+        return self.__FileName()
+
+    def __FileName(self):
+        return os.path.join(self.__tmp_dir.name, "mesh.dat")
+
+class _MeshPartExtraction:
+    """Extracts the nodes and geometries of a mesh (part) through an export of only this part"""
+    def __init__(self, main_mesh, mesh_part):
+        self.__main_mesh = main_mesh
+        self.__dat_export = _DatExport(main_mesh, mesh_part)
+
+    def GetNodes(self, node_ids, requests):
+        return _GetNodeCoordinates(self.__main_mesh, node_ids, self.__dat_export, requests)
+
+    def GetConnectivities(self, entity_type, entities_main_mesh, entities_ids, requests):
+        return _GetConnectivities(entities_main_mesh, entities_ids, self.__dat_export, requests)
+
+    def Close(self):
+        self.__dat_export.Close()
+
+class _MainMeshExtraction:
+    """Extracts all nodes and geometries of a main mesh (once, when they are first needed) through an export of the whole mesh
+    The entities of the meshes that belong to the main mesh (e.g. submeshes and groups) are selected by their Ids
+    """
+    def __init__(self, main_mesh):
+        self.__main_mesh = main_mesh
+        self.__dat_export = _DatExport(main_mesh, main_mesh)
+        self.__nodes = None
+
+    def GetNodes(self, node_ids, requests):
+        if self.__nodes is None:
+            self.__nodes = _GetNodeCoordinates(self.__main_mesh, self.__main_mesh.GetNodesId(), self.__dat_export, requests)
+        return _SelectEntities(self.__nodes, node_ids)
+
+    def GetConnectivities(self, entity_type, entities_main_mesh, entities_ids, requests):
+        # the elements of the export are read only once, the Ids of the entities are already known, hence
+        # they are selected directly instead of querying all entities of this type in the main mesh
+        return _GetConnectivities(self.__main_mesh, entities_ids, self.__dat_export, requests)
+
+    def Close(self):
+        self.__dat_export.Close()
+
+class _EntitiesRequests:
+    """Requests data of entities (e.g. the coordinates of nodes) separately from Salome
+    With more than one worker the requests are done in chunks by a bounded pool of threads,
+    every request is a call to the server of Salome, hence the threads are mostly waiting and not limited by the GIL.
+    The results are returned in the order of the requested Ids, independent of the order in which the chunks are processed.
+    """
+    def __init__(self, num_workers=1, chunk_size=REQUESTS_CHUNK_SIZE):
+        if num_workers < 1:
+            raise Exception('The number of workers has to be at least 1, got {}!'.format(num_workers))
+        if chunk_size < 1:
+            raise Exception('The chunk size has to be at least 1, got {}!'.format(chunk_size))
+        self.__chunk_size = chunk_size
+        self.__executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+
+    def Submit(self, request_function, ids):
+        """submits the requests for the entities with the given Ids
+        without workers the requests are done directly
+        """
+        if self.__executor is None:
+            return _RequestedEntities([_RequestChunk(request_function, ids)])
+        chunks = [ids[i:i+self.__chunk_size] for i in range(0, len(ids), self.__chunk_size)]
+        return _RequestedEntities([self.__executor.submit(_RequestChunk, request_function, chunk) for chunk in chunks])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+
+class _RequestedEntities:
+    """results of submitted requests, either the results of the chunks or the futures of them"""
+    def __init__(self, chunks):
+        self.__chunks = chunks
+
+    def Results(self):
+        """returns the results in the order of the Ids, waits for the chunks to be processed"""
+        return [result for chunk in self.__chunks for result in (chunk.result() if hasattr(chunk, "result") else chunk)]
+
+def _RequestChunk(request_function, ids):
+    return [request_function(entity_id) for entity_id in ids]
+
+def _GetNodeCoordinates(main_mesh, node_ids, dat_export, requests=None):
+    """returns the sorted Ids and the coordinates of the nodes of a mesh (part), read from the exported DAT file
+    The exported nodes are checked, if they don't match (e.g. the Ids were changed in the export)
+    then the coordinates of each node are requested separately (see "_EntitiesRequests").
+    """
+    node_ids = np.unique(np.asarray(node_ids, dtype=np.int64)) # also sorts the Ids
+    if node_ids.size == 0:
+        return node_ids, np.empty((0, 3))
+
+    try:
+        dat_node_ids, coordinates = dat_export.ReadNodes()
+    except Exception as e:
+        logger.warning('Getting the nodes through a DAT file failed, the nodes are requested separately. Error: "{}"'.format(e))
+    else:
+        order = np.argsort(dat_node_ids, kind="stable")
+        coordinates = coordinates[order]
+        if np.array_equal(dat_node_ids[order], node_ids) and _CoordinatesMatch(main_mesh, node_ids, coordinates):
+            return node_ids, coordinates
+        logger.warning('The nodes in the DAT file do not match the nodes of the mesh (e.g. they were renumbered), the nodes are requested separately')
+
+    if requests is None:
+        requests = _EntitiesRequests()
+    coordinates = np.array(requests.Submit(main_mesh.GetNodeXYZ, node_ids.tolist()).Results(), dtype=np.float64).reshape(-1, 3)
+    return node_ids, coordinates
+
+def _GetConnectivities(main_mesh, entities_ids, dat_export, requests=None):
+    """returns the sorted Ids and the connectivities (num_entities x num_nodes) of entities of one type, read from the exported DAT file
+    The exported entities are checked, if they don't match (e.g. the Ids were changed in the export or entities are missing)
+    then the connectivities of each entity are requested separately (see "_EntitiesRequests").
+    """
+    entities_ids = np.unique(np.asarray(entities_ids, dtype=np.int64)) # also sorts the Ids
+    if entities_ids.size == 0:
+        return entities_ids, np.empty((0, 0), dtype=np.int64)
+
+    try:
+        dat_element_ids, _, offsets, dat_connectivities = dat_export.ReadElements()
+    except Exception as e:
+        logger.warning('Getting the geometries through a DAT file failed, the geometries are requested separately. Error: "{}"'.format(e))
+    else:
+        order = np.argsort(dat_element_ids, kind="stable")
+        positions = np.minimum(np.searchsorted(dat_element_ids[order], entities_ids), max(order.size-1, 0))
+        if order.size > 0 and np.array_equal(dat_element_ids[order[positions]], entities_ids):
+            rows = order[positions]
+            num_nodes = offsets[rows+1] - offsets[rows]
+            if np.all(num_nodes == num_nodes[0]):
+                connectivities = dat_connectivities[offsets[rows].reshape(-1, 1) + np.arange(num_nodes[0])]
+                if _ConnectivitiesMatch(main_mesh, entities_ids, connectivities):
+                    return entities_ids, connectivities
+        logger.warning('The geometries in the DAT file do not match the geometries of the mesh (e.g. they were renumbered), the geometries are requested separately')
+
+    if requests is None:
+        requests = _EntitiesRequests()
+    connectivities = requests.Submit(main_mesh.GetElemNodes, entities_ids.tolist()).Results()
+    if len(set(len(conn) for conn in connectivities)) == 1:
+        connectivities = np.array(connectivities, dtype=np.int64)
+    return entities_ids, connectivities
+
+def _SplitIdsByEntityType(main_mesh, entities_ids, entity_types):
+    """splits the Ids of entities of a main mesh by their entity types
+    The entity types are filtered by Salome among the given Ids only (which are passed as "SMESH_IDSource"),
+    hence neither the Ids of the whole main mesh have to be transferred nor intersected here.
+    Querying the entity type is cheap, in contrast to geometrical queries (e.g. "BelongToGeom") that
+    would have to be evaluated again for every entity type.
+    """
+    entities_source = main_mesh.GetIDSource(entities_ids, SMESH.ALL)
+    try:
+        return {entity_type : _GetIdsOfEntityTypeInSource(main_mesh.GetMesh(), entities_source, entity_type) for entity_type in entity_types}
+    finally:
+        entities_source.UnRegister() # the source is created on the server and has to be destroyed explicitly
+
+def _GetIdsOfEntityTypeInSource(main_mesh, entities_source, entity_type):
+    """returns the Ids of the entities of a type among the entities of a source (e.g. a group), the filtering is done by Salome"""
+    entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_EntityType, '=', entity_type)
+    entities_filter.SetMesh(main_mesh)
+    return entities_filter.GetElementsIdFromParts([entities_source])
+
+def _SelectEntities(entities, selected_ids):
+    """returns the Ids and the values (e.g. coordinates) of the entities whose Ids are also in the selected Ids
+    The Ids of the entities have to be sorted, the selected Ids can be in any order
+    """
+    ids, values = entities
+    selected_ids = np.unique(np.asarray(selected_ids, dtype=np.int64))
+    positions = np.searchsorted(ids, selected_ids)
+    is_contained = positions < ids.size
+    is_contained[is_contained] = ids[positions[is_contained]] == selected_ids[is_contained]
+    positions = positions[is_contained]
+    if isinstance(values, list): # entities with a varying number of nodes
+        return ids[positions], [values[pos] for pos in positions.tolist()]
+    return ids[positions], values[positions]
+
+def _ExportPartToDat(main_mesh, mesh_part, file_name):
+    try:
+        # newer versions of Salome renumber the entities by default, this has to be disabled
+        main_mesh.ExportPartToDAT(mesh_part, file_name, False)
+    except TypeError:
+        # older versions of Salome don't have the option to renumber
+        main_mesh.ExportPartToDAT(mesh_part, file_name)
+
+def _SamplePositions(num_entities, num_samples=3):
+    # positions of the entities that are compared with the values in Salome
+    return np.unique(np.linspace(0, num_entities-1, num_samples).astype(np.int64)).tolist()
+
+def _CoordinatesMatch(main_mesh, node_ids, coordinates):
+    # comparing some nodes with the coordinates in Salome
+    # this also detects a loss of precision in the export
+    for pos in _SamplePositions(node_ids.size):
+        exp_coords = np.asarray(main_mesh.GetNodeXYZ(int(node_ids[pos])), dtype=np.float64)
+        if np.any(np.abs(coordinates[pos]-exp_coords) > 1E-12*np.maximum(1.0, np.abs(exp_coords))):
+            return False
+    return True
+
+def _ConnectivitiesMatch(main_mesh, entities_ids, connectivities):
+    # comparing some entities with the connectivities in Salome
+    for pos in _SamplePositions(entities_ids.size):
+        if list(main_mesh.GetElemNodes(int(entities_ids[pos]))) != connectivities[pos].tolist():
+            return False
+    return True
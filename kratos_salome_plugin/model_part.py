@@ -10,38 +10,67 @@
 
 # python imports
 from collections import OrderedDict
+from collections.abc import KeysView
+import weakref
 import logging
 logger = logging.getLogger(__name__)
 
+# plugin imports
+from .spatial_search import NodesSpatialIndex, GetNodesArrays
+
+# numpy imports (optional, only needed for the array storage)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# number of Ids that are converted to python objects at once when iterating an array container
+ITERATION_CHUNK_SIZE = 2**12
+
 
 class DataValueContainer:
+    # using slots and allocating the dict for the data only when needed,
+    # since most entities of a mesh don't have data this saves a lot of memory
+    __slots__ = ["__var_data"]
+
     def __init__(self):
-        self.__var_data = {}
+        self.__var_data = None
 
     def Has(self, var):
-        return (var in self.__var_data)
+        return self.__var_data is not None and var in self.__var_data
 
     def GetValue(self, var):
-        if not var in self.__var_data:
+        if not self.Has(var):
             raise KeyError('Variable "{}" not found!'.format(var))
         return self.__var_data[var]
 
     def SetValue(self, var, value):
+        if self.__var_data is None:
+            self.__var_data = {}
         self.__var_data[var] = value
 
     def HasData(self):
-        return (len(self.__var_data) > 0)
+        return self.__var_data is not None and len(self.__var_data) > 0
 
     def GetData(self):
+        # the dict is allocated when it is requested, since it can be modified
+        if self.__var_data is None:
+            self.__var_data = {}
         return self.__var_data
 
+    def _GetDataIfAny(self):
+        # for reading the data, without allocating the dict
+        return self.__var_data if self.__var_data is not None else {}
+
     def PrintInfo(self, prefix_string=""):
         return prefix_string + "DataValueContainer\n"
 
     def PrintData(self, prefix_string=""):
         string_buf = ""
-        for key in sorted(self.__var_data): # sorting to make reading and testing easier
-            val = self.__var_data[key]
+        data = self._GetDataIfAny()
+        for key in sorted(data): # sorting to make reading and testing easier
+            val = data[key]
             string_buf += "{}  {} : {}\n".format(prefix_string, key, val)
         return string_buf
 
@@ -55,20 +84,72 @@ class DataValueContainer:
             # don't attempt to compare against unrelated types
             raise TypeError
 
-        return self.__var_data == other.__var_data
+        return self._GetDataIfAny() == other._GetDataIfAny()
+
+
+class _ModificationCounter:
+    """Counts the modifications of the nodes of a root ModelPart, i.e. creating, adding, removing
+    or merging nodes and setting their coordinates. See "ModelPart.GetNodesSpatialIndex"
+    """
+    __slots__ = ["count"]
+
+    def __init__(self):
+        self.count = 0
 
 
 class Node(DataValueContainer):
+    # the counter of the ModelPart that stores the node, it counts the changes of the coordinates
+    __slots__ = ["Id", "__x", "__y", "__z", "__modifications"]
+
     def __init__(self, Id, X, Y, Z):
         super().__init__()
         self.Id = Id
-        self.X = X
-        self.Y = Y
-        self.Z = Z
+        self.__x = X
+        self.__y = Y
+        self.__z = Z
+        self.__modifications = None
+
+    @property
+    def X(self):
+        return self.__x
+
+    @X.setter
+    def X(self, value):
+        self.__x = value
+        self.__Modified()
+
+    @property
+    def Y(self):
+        return self.__y
+
+    @Y.setter
+    def Y(self, value):
+        self.__y = value
+        self.__Modified()
+
+    @property
+    def Z(self):
+        return self.__z
+
+    @Z.setter
+    def Z(self, value):
+        self.__z = value
+        self.__Modified()
 
     def Coordinates(self):
         return [self.X, self.Y, self.Z]
 
+    def _GetModificationCounter(self):
+        return self.__modifications
+
+    def _SetModificationCounter(self, modifications):
+        # used by the ModelPart that stores the node
+        self.__modifications = modifications
+
+    def __Modified(self):
+        if self.__modifications is not None:
+            self.__modifications.count += 1
+
     def PrintInfo(self, prefix_string=""):
         return prefix_string + "Node #{}\n".format(self.Id)
 
@@ -92,7 +173,79 @@ class Node(DataValueContainer):
         return True
 
 
+class NodeView(Node):
+    """Node that does not own its coordinates and data
+    It refers to a row of a NodesArrayContainer and is only created when
+    a node of an array-backed ModelPart is requested
+    """
+    __slots__ = ["__container", "__row", "__weakref__"]
+
+    def __init__(self, container, node_id, row):
+        # not calling the constructor of Node, the coordinates are stored in the container
+        DataValueContainer.__init__(self)
+        self.Id = node_id
+        self.__container = container
+        self.__row = row
+        existing_data = container._GetData(node_id)
+        if existing_data is not None:
+            self._DataValueContainer__var_data = existing_data
+
+    @property
+    def X(self):
+        return float(self.__container._coordinates[self.__row, 0])
+
+    @X.setter
+    def X(self, value):
+        self.__container._coordinates[self.__row, 0] = value
+        self.__container._modifications.count += 1
+
+    @property
+    def Y(self):
+        return float(self.__container._coordinates[self.__row, 1])
+
+    @Y.setter
+    def Y(self, value):
+        self.__container._coordinates[self.__row, 1] = value
+        self.__container._modifications.count += 1
+
+    @property
+    def Z(self):
+        return float(self.__container._coordinates[self.__row, 2])
+
+    @Z.setter
+    def Z(self, value):
+        self.__container._coordinates[self.__row, 2] = value
+        self.__container._modifications.count += 1
+
+    def Coordinates(self):
+        return self.__container._coordinates[self.__row].tolist()
+
+    def _GetModificationCounter(self):
+        return self.__container._modifications
+
+    def _MoveTo(self, row):
+        # used by the container when the nodes are moved in the arrays, e.g. after removing nodes
+        self.__row = row
+
+    def _Detach(self):
+        # used by the container when the node is removed, the view cannot be used anymore
+        self.__container = _RemovedEntity("Node", self.Id)
+
+    def GetData(self):
+        data = super().GetData()
+        # the data can be modified, hence it is stored in the container, such that it outlives this view
+        self.__container._SetData(self.Id, data)
+        return data
+
+    def SetValue(self, var, value):
+        super().SetValue(var, value)
+        # the data is stored in the container, such that it outlives this view
+        self.__container._SetData(self.Id, self.GetData())
+
+
 class GeometricalObject(DataValueContainer):
+    __slots__ = ["Id", "__nodes", "name", "Properties"]
+
     def __init__(self, Id, Nodes, Name, Properties):
         super().__init__()
         self.Id = Id
@@ -107,7 +260,7 @@ class GeometricalObject(DataValueContainer):
         string_buf  = "GeometricalObject #{}\n".format(self.Id)
         string_buf += "  Name: {}\n".format(self.name)
         string_buf += "  Nodes:\n"
-        for node in self.__nodes:
+        for node in self.GetNodes():
             string_buf += node.PrintInfo("    ")
             string_buf += node.PrintData("    ")
         string_buf += "  Properties:\n"
@@ -128,12 +281,78 @@ class GeometricalObject(DataValueContainer):
         if self.Id != other.Id: return False
         if self.name != other.name: return False
         if self.Properties != other.Properties: return False
-        if self.__nodes != other.__nodes: return False
+        if self.GetNodes() != other.GetNodes(): return False
 
         return True
 
 
+class GeometricalObjectView(GeometricalObject):
+    """GeometricalObject that does not own its nodes, properties and data
+    It refers to a row of a block in a GeometricalObjectsArrayContainer and is only
+    created when an element or condition of an array-backed ModelPart is requested
+    """
+    __slots__ = ["__container", "__block", "__row", "__weakref__"]
+
+    def __init__(self, container, geom_obj_id, block, row):
+        # not calling the constructor of GeometricalObject, the connectivities are stored in the container
+        DataValueContainer.__init__(self)
+        self.Id = geom_obj_id
+        self.__container = container
+        self.__block = block
+        self.__row = row
+        existing_data = container._GetData(geom_obj_id)
+        if existing_data is not None:
+            self._DataValueContainer__var_data = existing_data
+
+    @property
+    def name(self):
+        return self.__block.name
+
+    @property
+    def Properties(self):
+        return self.__container._GetProperties(self.__block.properties_indices[self.__row])
+
+    def GetNodes(self):
+        nodes = self.__container._nodes
+        return [nodes[node_id] for node_id in self.__block.connectivities[self.__row].tolist()]
+
+    def _MoveTo(self, block, row):
+        # used by the container when the geometrical objects are moved in the arrays, e.g. after removing some
+        self.__block = block
+        self.__row = row
+
+    def _Detach(self):
+        # used by the container when the geometrical object is removed, the view cannot be used anymore
+        self.__container = self.__block = _RemovedEntity("GeometricalObject", self.Id)
+
+    def GetData(self):
+        data = super().GetData()
+        # the data can be modified, hence it is stored in the container, such that it outlives this view
+        self.__container._SetData(self.Id, data)
+        return data
+
+    def SetValue(self, var, value):
+        super().SetValue(var, value)
+        # the data is stored in the container, such that it outlives this view
+        self.__container._SetData(self.Id, self.GetData())
+
+
+class _RemovedEntity:
+    """Replaces the container of a view whose entity was removed, such that using the view raises an error
+    Otherwise it would refer to the row of another entity after the arrays were compacted
+    """
+    __slots__ = ["__description"]
+
+    def __init__(self, entity_type, entity_id):
+        self.__description = "{} #{}".format(entity_type, entity_id)
+
+    def __getattr__(self, name):
+        raise RuntimeError('{} was removed, it cannot be used anymore!'.format(self.__description))
+
+
 class Properties(DataValueContainer):
+    __slots__ = ["Id"]
+
     def __init__(self, Id):
         super().__init__()
         self.Id = Id
@@ -153,15 +372,540 @@ class Properties(DataValueContainer):
         return True
 
 
+class FilteredEntities:
+    """View on the entities of a container that fulfill a condition
+    Nothing is copied, the condition is evaluated while iterating
+    Example: all elements with a specific name:
+    model_part.Elements.Filter(lambda elem: elem.name == "Element2D3N")
+    """
+    def __init__(self, entities, predicate):
+        self.__entities = entities
+        self.__predicate = predicate
+
+    def Filter(self, predicate):
+        return FilteredEntities(self, predicate)
+
+    def __iter__(self):
+        return filter(self.__predicate, self.__entities)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _IdsView(KeysView):
+    """Keys of a container that is not a dict, iterated in the order defined by the container"""
+    def __iter__(self):
+        return self._mapping._IterIds()
+
+
+class _EntitiesArrayContainer:
+    """Base class for the containers that store entities in arrays
+    instead of individual objects. This reduces the memory usage significantly.
+    The Ids are stored in a NumPy array in the order of insertion, the position
+    of an entity is found with an index (Id => position). The (optional) data of
+    the entities is stored separately, only for the entities that actually have data.
+    The interface is the same as the one of the PointerVectorSet, but the entities
+    are created as views only when they are accessed.
+    Views that are alive are reused, hence accessing the same entity twice
+    returns the same object (as long as it is referenced somewhere).
+    The views of removed entities cannot be used anymore, and (like for a dict)
+    adding or removing entities while iterating raises an error.
+    Iterating does not copy the Ids, they are converted to python objects in slices
+    (see "ITERATION_CHUNK_SIZE"). Every iteration has its own state, hence nested iterations
+    and iterations from several threads are possible. The containers are not thread-safe
+    however: entities must not be added or removed while another thread uses the container.
+    """
+
+    def __init__(self):
+        if not numpy_available:
+            raise ImportError('NumPy is required for storing entities in arrays!')
+        self._ids = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._max_id = 0 # tracked when adding Ids, such that it does not have to be searched
+        self.__index = {} # map: {entity_id : position}
+        self.__data = {} # map: {entity_id : data}, only for entities with data
+        self.__views = weakref.WeakValueDictionary()
+        self.__num_changes = 0 # number of times entities were added or removed, for detecting changes while iterating
+
+    def GetIds(self):
+        """returns the Ids of the entities (in the order of insertion)"""
+        return self._ids[:self._size]
+
+    def GetMaxId(self):
+        """returns the largest Id (0 if empty)"""
+        return self._max_id
+
+    def get(self, entity_id, default=None):
+        position = self.__index.get(entity_id)
+        if position is None:
+            return default
+        return self._GetView(entity_id, position)
+
+    def keys(self):
+        return _IdsView(self)
+
+    def _IterIds(self):
+        for _, entity_id in self.__IterPositionsAndIds():
+            yield entity_id
+
+    def values(self):
+        for position, entity_id in self.__IterPositionsAndIds():
+            yield self._GetView(entity_id, position)
+
+    def items(self):
+        for position, entity_id in self.__IterPositionsAndIds():
+            yield entity_id, self._GetView(entity_id, position)
+
+    def __getitem__(self, entity_id):
+        return self._GetView(entity_id, self.__index[entity_id])
+
+    def __contains__(self, entity_id):
+        return entity_id in self.__index
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return self.values()
+
+    def Filter(self, predicate):
+        return FilteredEntities(self, predicate)
+
+    def __eq__(self, other):
+        if len(self) != len(other): return False
+        if list(self.keys()) != list(other.keys()): return False
+        for entity_self, entity_other in zip(self.values(), other.values()):
+            if entity_self != entity_other: return False
+        return True
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __str__(self):
+        string_buf = "PointerVectorSet:\n"
+        for k,v in self.items():
+            string_buf += "  {} : {}\n".format(k, v)
+        return string_buf
+
+    def GetDataItems(self):
+        """returns (Id, data) of the entities that have data, in the order of insertion"""
+        index = self.__index
+        return sorted(((entity_id, data) for entity_id, data in self.__data.items() if len(data) > 0), key=lambda item: index[item[0]])
+
+    def _GetData(self, entity_id):
+        return self.__data.get(entity_id)
+
+    def _SetData(self, entity_id, data):
+        self.__data[entity_id] = data
+
+    def _IsView(self, entity_id, entity):
+        return entity is self.__views.get(entity_id)
+
+    def _AddId(self, entity_id):
+        """registers a new Id and returns its position"""
+        if entity_id in self.__index:
+            raise RuntimeError('An entity with Id #{} exists already!'.format(entity_id))
+        self.__num_changes += 1
+        position = self._size
+        if position == self._ids.shape[0]:
+            self._Reserve(max(16, 2*position))
+        self._ids[position] = entity_id
+        self._max_id = max(self._max_id, entity_id)
+        self.__index[entity_id] = position
+        self._size += 1
+        return position
+
+    def _AddIds(self, entity_ids):
+        """registers new Ids (array, checked beforehand) and returns the position of the first one"""
+        start = self._size
+        end = start + entity_ids.size
+        if end > self._ids.shape[0]:
+            self._Reserve(max(16, 2*start, end))
+        self.__num_changes += 1
+        self._ids[start:end] = entity_ids
+        if entity_ids.size > 0:
+            self._max_id = max(self._max_id, int(entity_ids.max()))
+        self.__index.update(zip(entity_ids.tolist(), range(start, end)))
+        self._size = end
+        return start
+
+    def Reserve(self, capacity):
+        """preallocates the arrays for (at least) "capacity" entities, such that they don't have to be resized when adding them
+        The arrays are never shrunk
+        """
+        if capacity > self._ids.shape[0]:
+            self._Reserve(capacity)
+
+    def _RemoveIds(self, entity_ids):
+        """removes Ids (array), the remaining entities keep their order
+        The views of the remaining entities that are alive are moved to the new positions,
+        the views of the removed entities are detached
+        """
+        is_removed = np.isin(self.GetIds(), entity_ids)
+        removed_positions = np.flatnonzero(is_removed)
+        if removed_positions.size == 0:
+            return
+        self.__num_changes += 1
+        index = self.__index
+        for entity_id in self.GetIds()[removed_positions].tolist():
+            del index[entity_id]
+            self.__data.pop(entity_id, None)
+
+        # only the entities after the first removed one are moved, e.g. none if the last added ones are removed
+        self._Compact(~is_removed)
+        first_moved = int(removed_positions[0])
+        index.update(zip(self.GetIds()[first_moved:].tolist(), range(first_moved, self._size)))
+        self._max_id = int(self.GetIds().max()) if self._size > 0 else 0
+
+        for entity_id, view in list(self.__views.items()):
+            position = self.__index.get(entity_id)
+            if position is None:
+                del self.__views[entity_id] # the entity was removed, its view is not reused
+                view._Detach()
+            else:
+                self._MoveView(view, position)
+
+    def __IterPositionsAndIds(self):
+        num_changes = self.__num_changes
+        size = self._size
+        for start in range(0, size, ITERATION_CHUNK_SIZE):
+            for position, entity_id in enumerate(self._ids[start:min(start+ITERATION_CHUNK_SIZE, size)].tolist(), start):
+                yield position, entity_id
+                if self.__num_changes != num_changes:
+                    raise RuntimeError('{} changed during iteration'.format(self.__class__.__name__))
+
+    def _GetPositions(self, entity_ids):
+        return np.array([self.__index[entity_id] for entity_id in entity_ids.tolist()], dtype=np.int64)
+
+    def _Reserve(self, capacity):
+        self._ids = _ResizeArray(self._ids, self._size, capacity)
+
+    def _Compact(self, is_kept):
+        num_kept = int(np.count_nonzero(is_kept))
+        self._ids[:num_kept] = self.GetIds()[is_kept]
+        self._size = num_kept
+
+    def _GetView(self, entity_id, position):
+        view = self.__views.get(entity_id)
+        if view is None:
+            view = self._CreateView(entity_id, position)
+            self.__views[entity_id] = view
+        return view
+
+    def _CreateView(self, entity_id, position):
+        raise NotImplementedError
+
+    def _MoveView(self, view, position):
+        raise NotImplementedError
+
+
+class NodesArrayContainer(_EntitiesArrayContainer):
+    """Container for the nodes of a ModelPart that stores them in arrays, see "_EntitiesArrayContainer"
+    The coordinates are stored in a (num_nodes x 3) array, aligned with the Ids.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._coordinates = np.empty((0, 3), dtype=np.float64)
+        self._modifications = _ModificationCounter()
+
+    def CreateNode(self, node_id, coord_x, coord_y, coord_z):
+        row = self._AddId(node_id)
+        self._modifications.count += 1
+        self._coordinates[row] = (coord_x, coord_y, coord_z)
+        return self._GetView(node_id, row)
+
+    def CreateNodes(self, node_ids, coordinates):
+        """creates the nodes in one go, the checks are done vectorized
+        Nodes that are given several times or that exist already are
+        only created once, their coordinates have to coincide (like in "ModelPart.CreateNewNode")
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+        if node_ids.size != coordinates.shape[0]:
+            raise RuntimeError('The number of node Ids ({}) does not match the number of coordinates ({})!'.format(node_ids.size, coordinates.shape[0]))
+
+        unique_ids, first_indices, inverse = np.unique(node_ids, return_index=True, return_inverse=True)
+        if unique_ids.size != node_ids.size:
+            _CheckCoordinates(node_ids, coordinates[first_indices][inverse.ravel()], coordinates)
+            first_indices.sort() # keeping the order of the input
+            node_ids = node_ids[first_indices]
+            coordinates = coordinates[first_indices]
+
+        # Ids larger than the existing ones (e.g. when adding meshes incrementally) don't have to be searched
+        if node_ids.size > 0 and node_ids.min() > self._max_id:
+            is_existing = np.zeros(node_ids.size, dtype=bool)
+        else:
+            is_existing = np.isin(node_ids, self.GetIds())
+        if is_existing.any():
+            existing_ids = node_ids[is_existing]
+            _CheckCoordinates(existing_ids, self._coordinates[self._GetPositions(existing_ids)], coordinates[is_existing])
+            node_ids = node_ids[~is_existing]
+            coordinates = coordinates[~is_existing]
+
+        start = self._AddIds(node_ids)
+        self._coordinates[start:self._size] = coordinates
+        self._modifications.count += 1
+
+    def GetCoordinates(self):
+        """returns the coordinates of the nodes as (num_nodes x 3) array (aligned with the Ids)
+        The array is read-only, the coordinates are changed through the nodes (such that the changes are counted)
+        """
+        coordinates = self._coordinates[:self._size].view()
+        coordinates.flags.writeable = False
+        return coordinates
+
+    def RemoveNodes(self, node_ids):
+        """removes the nodes (the elements and conditions that use them have to be changed beforehand)"""
+        self._RemoveIds(np.asarray(node_ids, dtype=np.int64).ravel())
+        self._modifications.count += 1
+
+    def __setitem__(self, node_id, node):
+        # used when adding an existing node, its coordinates and data are copied
+        if node_id not in self:
+            new_node = self.CreateNode(node_id, node.X, node.Y, node.Z)
+        elif self._IsView(node_id, node):
+            return # nothing to do, the node is already stored
+        else:
+            new_node = self[node_id]
+            new_node.X, new_node.Y, new_node.Z = node.X, node.Y, node.Z
+        for var, value in node._GetDataIfAny().items():
+            new_node.SetValue(var, value)
+
+    def _Reserve(self, capacity):
+        self._coordinates = _ResizeArray(self._coordinates, self._size, capacity)
+        super()._Reserve(capacity)
+
+    def _Compact(self, is_kept):
+        self._coordinates[:np.count_nonzero(is_kept)] = self._coordinates[:self._size][is_kept]
+        super()._Compact(is_kept)
+
+    def _CreateView(self, node_id, row):
+        return NodeView(self, node_id, row)
+
+    def _MoveView(self, view, row):
+        view._MoveTo(row)
+
+
+class _GeometricalObjectsBlock:
+    """Geometrical objects with the same name and number of nodes
+    The connectivities are stored as (num_objects x num_nodes) array of node Ids
+    The properties are stored as indices in the list of properties of the container
+    """
+
+    def __init__(self, name, num_nodes):
+        self.name = name
+        self.ids = np.empty(0, dtype=np.int64)
+        self.connectivities = np.empty((0, num_nodes), dtype=np.int64)
+        self.properties_indices = np.empty(0, dtype=np.int32)
+        self.size = 0
+
+    def Append(self, geom_obj_id, node_ids, properties_index):
+        row = self.size
+        if row == self.ids.shape[0]:
+            capacity = max(16, 2*row)
+            self.ids = _ResizeArray(self.ids, row, capacity)
+            self.connectivities = _ResizeArray(self.connectivities, row, capacity)
+            self.properties_indices = _ResizeArray(self.properties_indices, row, capacity)
+        self.ids[row] = geom_obj_id
+        self.connectivities[row] = node_ids
+        self.properties_indices[row] = properties_index
+        self.size += 1
+        return row
+
+    def AppendMultiple(self, geom_obj_ids, connectivities, properties_index):
+        start = self.size
+        end = start + geom_obj_ids.size
+        if end > self.ids.shape[0]:
+            capacity = max(16, 2*start, end)
+            self.ids = _ResizeArray(self.ids, start, capacity)
+            self.connectivities = _ResizeArray(self.connectivities, start, capacity)
+            self.properties_indices = _ResizeArray(self.properties_indices, start, capacity)
+        self.ids[start:end] = geom_obj_ids
+        self.connectivities[start:end] = connectivities
+        self.properties_indices[start:end] = properties_index
+        self.size = end
+        return start
+
+    def Compact(self, is_kept):
+        """removes the rows that are not kept, the remaining ones keep their order
+        returns the new rows of all previous rows (-1 for the removed ones)
+        """
+        new_rows = np.cumsum(is_kept) - 1
+        new_rows[~is_kept] = -1
+        num_kept = int(np.count_nonzero(is_kept))
+        self.ids[:num_kept] = self.ids[:self.size][is_kept]
+        self.connectivities[:num_kept] = self.connectivities[:self.size][is_kept]
+        self.properties_indices[:num_kept] = self.properties_indices[:self.size][is_kept]
+        self.size = num_kept
+        return new_rows
+
+
+class GeometricalObjectsArrayContainer(_EntitiesArrayContainer):
+    """Container for the elements or conditions of a ModelPart that stores them in arrays, see "_EntitiesArrayContainer"
+    The geometrical objects are grouped in blocks by name and number of nodes.
+    Each block stores the connectivities (node Ids) and the properties (as index, since
+    different Properties with the same Id can be used), the nodes are taken from the
+    NodesArrayContainer when they are accessed.
+    """
+
+    def __init__(self, nodes):
+        super().__init__()
+        self._nodes = nodes
+        self.__blocks = [] # in the order of creation
+        self.__block_numbers = {} # map: {(name, num_nodes) : block_number}
+        self.__properties = [] # the (few) different properties that are used
+        self.__properties_indices = {} # map: {id(properties) : index in the list of properties}
+        self._block_numbers = np.empty(0, dtype=np.int32) # aligned with the Ids
+        self._rows = np.empty(0, dtype=np.int64) # aligned with the Ids
+
+    def CreateGeometricalObject(self, name, geom_obj_id, node_ids, properties):
+        properties_index = self.__GetPropertiesIndex(properties)
+        block_number = self.__GetBlockNumber(name, len(node_ids))
+
+        position = self._AddId(geom_obj_id)
+        self._block_numbers[position] = block_number
+        self._rows[position] = self.__blocks[block_number].Append(geom_obj_id, node_ids, properties_index)
+        return self._GetView(geom_obj_id, position)
+
+    def CreateGeometricalObjects(self, name, geom_obj_ids, connectivities, properties):
+        """creates the geometrical objects in one go
+        The Ids and connectivities are expected to be checked beforehand (see "ModelPart.CreateNewElements")
+        """
+        properties_index = self.__GetPropertiesIndex(properties)
+        block_number = self.__GetBlockNumber(name, connectivities.shape[1])
+
+        start = self._AddIds(geom_obj_ids)
+        row_start = self.__blocks[block_number].AppendMultiple(geom_obj_ids, connectivities, properties_index)
+        self._block_numbers[start:self._size] = block_number
+        self._rows[start:self._size] = np.arange(row_start, row_start+geom_obj_ids.size)
+
+    def GetBlocks(self):
+        """returns the blocks of geometrical objects as list of tuples
+        (name, ids, connectivities, properties_ids), in the order of creation of the blocks
+        """
+        all_properties_ids = np.array([props.Id for props in self.__properties], dtype=np.int64)
+        return [(b.name, b.ids[:b.size], b.connectivities[:b.size], all_properties_ids[b.properties_indices[:b.size]]) for b in self.__blocks]
+
+    def GetSegments(self):
+        """returns the geometrical objects in the order of insertion, as list of segments
+        of consecutive geometrical objects in the same block. Each segment is a tuple:
+        (name, ids, connectivities, properties_ids)
+        """
+        if self._size == 0:
+            return []
+        all_properties_ids = np.array([props.Id for props in self.__properties], dtype=np.int64)
+        block_numbers = self._block_numbers[:self._size]
+        segment_starts = np.concatenate(([0], np.flatnonzero(np.diff(block_numbers))+1))
+        segment_ends = np.append(segment_starts[1:], self._size)
+
+        segments = []
+        for start, end in zip(segment_starts.tolist(), segment_ends.tolist()):
+            # rows of the same block are created in the order of insertion, hence they are consecutive
+            block = self.__blocks[block_numbers[start]]
+            row_start = int(self._rows[start])
+            rows = slice(row_start, row_start+end-start)
+            segments.append((block.name, block.ids[rows], block.connectivities[rows], all_properties_ids[block.properties_indices[rows]]))
+        return segments
+
+    def ReplaceNodes(self, node_ids, new_node_ids):
+        """replaces nodes in the connectivities, e.g. when merging nodes
+        node_ids -- the Ids of the nodes that are replaced (sorted array)
+        new_node_ids -- the Ids of the nodes they are replaced with (array, aligned with node_ids)
+        """
+        if node_ids.size == 0:
+            return
+        for block in self.__blocks:
+            connectivities = block.connectivities[:block.size]
+            positions = np.minimum(np.searchsorted(node_ids, connectivities), node_ids.size-1)
+            is_replaced = node_ids[positions] == connectivities
+            connectivities[is_replaced] = new_node_ids[positions[is_replaced]]
+
+    def RemoveGeometricalObjects(self, geom_obj_ids):
+        """removes the geometrical objects, the remaining ones keep their order"""
+        self._RemoveIds(np.asarray(geom_obj_ids, dtype=np.int64).ravel())
+
+    def __setitem__(self, geom_obj_id, geom_obj):
+        # used when adding an existing geometrical object, it is copied
+        if self._IsView(geom_obj_id, geom_obj):
+            return # nothing to do, the geometrical object is already stored
+        if geom_obj_id in self:
+            # connectivities and properties cannot be changed, the ModelPart checks that they are the same
+            new_geom_obj = self[geom_obj_id]
+        else:
+            node_ids = [node.Id for node in geom_obj.GetNodes()]
+            new_geom_obj = self.CreateGeometricalObject(geom_obj.name, geom_obj_id, node_ids, geom_obj.Properties)
+        for var, value in geom_obj._GetDataIfAny().items():
+            new_geom_obj.SetValue(var, value)
+
+    def _GetProperties(self, properties_index):
+        return self.__properties[properties_index]
+
+    def __GetPropertiesIndex(self, properties):
+        properties_index = self.__properties_indices.get(id(properties))
+        if properties_index is None:
+            properties_index = len(self.__properties)
+            self.__properties.append(properties)
+            self.__properties_indices[id(properties)] = properties_index
+        return properties_index
+
+    def __GetBlockNumber(self, name, num_nodes):
+        block_key = (name, num_nodes)
+        block_number = self.__block_numbers.get(block_key)
+        if block_number is None:
+            block_number = len(self.__blocks)
+            self.__blocks.append(_GeometricalObjectsBlock(*block_key))
+            self.__block_numbers[block_key] = block_number
+        return block_number
+
+    def _Reserve(self, capacity):
+        self._block_numbers = _ResizeArray(self._block_numbers, self._size, capacity)
+        self._rows = _ResizeArray(self._rows, self._size, capacity)
+        super()._Reserve(capacity)
+
+    def _Compact(self, is_kept):
+        block_numbers = self._block_numbers[:self._size]
+        rows = self._rows[:self._size]
+        for block_number, block in enumerate(self.__blocks):
+            in_block = block_numbers == block_number
+            is_kept_in_block = np.ones(block.size, dtype=bool)
+            is_kept_in_block[rows[in_block & ~is_kept]] = False
+            if not is_kept_in_block.all():
+                # the rows of a block are in the order of insertion, hence the segments stay consecutive
+                rows[in_block] = block.Compact(is_kept_in_block)[rows[in_block]]
+        num_kept = int(np.count_nonzero(is_kept))
+        self._block_numbers[:num_kept] = block_numbers[is_kept]
+        self._rows[:num_kept] = rows[is_kept]
+        super()._Compact(is_kept)
+
+    def _CreateView(self, geom_obj_id, position):
+        block = self.__blocks[self._block_numbers[position]]
+        return GeometricalObjectView(self, geom_obj_id, block, int(self._rows[position]))
+
+    def _MoveView(self, view, position):
+        view._MoveTo(self.__blocks[self._block_numbers[position]], int(self._rows[position]))
+
+
 class ModelPart(DataValueContainer):
 
     class PointerVectorSet(OrderedDict):
+        """Container of the entities, iterating it yields the entities (not the Ids)
+        The values are iterated without copying them, every call creates a new iterator,
+        hence nested iterations and iterations from several threads are possible.
+        Like for every dict, adding or removing entities while iterating raises an error
+        ("OrderedDict mutated during iteration"). Note that this was possible when a copy
+        of the values was iterated. The container is not thread-safe, entities must not be
+        added or removed while another thread uses it.
+        """
         def __iter__(self):
-            self.vals_list = iter(list(self.values()))
-            return self
+            return iter(self.values())
+
+        def Filter(self, predicate):
+            return FilteredEntities(self, predicate)
 
-        def __next__(self):
-            return next(self.vals_list)
+        def GetMaxId(self):
+            """returns the largest Id (0 if empty)"""
+            return max(self.keys(), default=0)
 
         def __str__(self):
             string_buf = "PointerVectorSet:\n"
@@ -169,15 +913,121 @@ class ModelPart(DataValueContainer):
                 string_buf += "  {} : {}\n".format(k, v)
             return string_buf
 
+    class EntitiesSubset:
+        """Entities of a SubModelPart
+        Only the Ids are stored, the entities themselves are taken from the
+        container of the root ModelPart. This way the entities are not duplicated
+        on every level of the hierarchy and the parents can be updated with set-unions.
+        The entities are iterated in the order of their Ids (like in Kratos),
+        the sorted Ids are cached until the next modification.
+        """
+        def __init__(self, root_entities):
+            self.__root_entities = root_entities
+            self.__ids = set()
+            self.__sorted_ids = []
+
+        def Add(self, entity_id):
+            self.__ids.add(entity_id)
+            self.__sorted_ids = None
+
+        def Update(self, entity_ids):
+            self.__ids.update(entity_ids)
+            self.__sorted_ids = None
+
+        def Replace(self, replacements):
+            """replaces Ids, given as map {entity_id : new_entity_id}"""
+            replaced_ids = self.__ids.intersection(replacements.keys())
+            if replaced_ids:
+                self.__ids.difference_update(replaced_ids)
+                self.__ids.update(replacements[entity_id] for entity_id in replaced_ids)
+                self.__sorted_ids = None
+
+        def get(self, entity_id, default=None):
+            if entity_id in self.__ids:
+                return self.__root_entities[entity_id]
+            return default
+
+        def keys(self):
+            return _IdsView(self)
+
+        def _IterIds(self):
+            return iter(self.__GetSortedIds())
+
+        def values(self):
+            root_entities = self.__root_entities
+            return (root_entities[entity_id] for entity_id in self.__GetSortedIds())
+
+        def items(self):
+            root_entities = self.__root_entities
+            return ((entity_id, root_entities[entity_id]) for entity_id in self.__GetSortedIds())
+
+        def __getitem__(self, entity_id):
+            if entity_id not in self.__ids:
+                raise KeyError(entity_id)
+            return self.__root_entities[entity_id]
+
+        def __contains__(self, entity_id):
+            return entity_id in self.__ids
+
+        def __len__(self):
+            return len(self.__ids)
 
-    def __init__(self, name="default"):
+        def __iter__(self):
+            return self.values()
+
+        def Filter(self, predicate):
+            return FilteredEntities(self, predicate)
+
+        def __eq__(self, other):
+            if len(self) != len(other): return False
+            if list(self.keys()) != list(other.keys()): return False
+            for entity_self, entity_other in zip(self.values(), other.values()):
+                if entity_self != entity_other: return False
+            return True
+
+        def __ne__(self, other):
+            return not self.__eq__(other)
+
+        def __str__(self):
+            string_buf = "PointerVectorSet:\n"
+            for k,v in self.items():
+                string_buf += "  {} : {}\n".format(k, v)
+            return string_buf
+
+        def __GetSortedIds(self):
+            sorted_ids = self.__sorted_ids
+            if sorted_ids is None:
+                sorted_ids = self.__sorted_ids = sorted(self.__ids)
+            return sorted_ids
+
+
+    def __init__(self, name="default", use_array_storage=False):
+        """Keyword arguments:
+        name -- the name of the ModelPart
+        use_array_storage -- store the nodes, elements and conditions in arrays instead of individual objects (requires NumPy),
+                             see "NodesArrayContainer" and "GeometricalObjectsArrayContainer"
+        """
         super().__init__()
         self.__parent_model_part = None
         self.__sub_model_parts   = ModelPart.PointerVectorSet()
-        self.__nodes             = ModelPart.PointerVectorSet()
-        self.__elements          = ModelPart.PointerVectorSet()
-        self.__conditions        = ModelPart.PointerVectorSet()
+        if use_array_storage:
+            self.__nodes         = NodesArrayContainer()
+            self.__elements      = GeometricalObjectsArrayContainer(self.__nodes)
+            self.__conditions    = GeometricalObjectsArrayContainer(self.__nodes)
+        else:
+            self.__nodes         = ModelPart.PointerVectorSet()
+            self.__elements      = ModelPart.PointerVectorSet()
+            self.__conditions    = ModelPart.PointerVectorSet()
         self.__properties        = ModelPart.PointerVectorSet()
+        self.__nodes_spatial_index = None
+        self.__nodes_spatial_index_key = None
+        # the changes of the nodes in the hierarchy (only used in the root), see "GetNodesSpatialIndex"
+        if use_array_storage:
+            self.__nodes_modifications = self.__nodes._modifications
+        else:
+            self.__nodes_modifications = _ModificationCounter()
+        # the counters of other root ModelParts whose nodes were added, since these report their changes there
+        self.__other_nodes_modifications = {} # map: {id(counter) : counter}
 
         if("." in name):
             RuntimeError("Name of the modelpart cannot contain a . (dot) Please rename ! ")
@@ -205,6 +1055,11 @@ class ModelPart(DataValueContainer):
             raise RuntimeError('There is an already existing sub model part with name "{}" in model part: "{}"'.format(name_smp, self.Name))
         smp = ModelPart(name_smp)
         smp.__parent_model_part = self
+        # the SubModelParts only store the Ids, the entities are stored in the root
+        root_model_part = self.GetRootModelPart()
+        smp.__nodes = ModelPart.EntitiesSubset(root_model_part.__nodes)
+        smp.__elements = ModelPart.EntitiesSubset(root_model_part.__elements)
+        smp.__conditions = ModelPart.EntitiesSubset(root_model_part.__conditions)
 
         self.__sub_model_parts[name_smp] = smp
         return smp
@@ -233,6 +1088,16 @@ class ModelPart(DataValueContainer):
         else:
             return self
 
+    def Reserve(self, num_nodes=0, num_elements=0, num_conditions=0):
+        """preallocates the storage of the root ModelPart for the expected total number of entities
+        This only has an effect if the entities are stored in arrays (see "use_array_storage"),
+        the counts don't have to be exact, the storage grows if more entities are added
+        """
+        root_model_part = self.GetRootModelPart()
+        for entities, num_entities in ((root_model_part.__nodes, num_nodes), (root_model_part.__elements, num_elements), (root_model_part.__conditions, num_conditions)):
+            if hasattr(entities, "Reserve"):
+                entities.Reserve(num_entities)
+
 
     ### Methods related to Nodes ###
     @property
@@ -242,6 +1107,36 @@ class ModelPart(DataValueContainer):
     def NumberOfNodes(self):
         return len(self.__nodes)
 
+    def GetNodesSpatialIndex(self):
+        """returns the spatial index of the nodes (requires NumPy), see "spatial_search.NodesSpatialIndex"
+        It is created when it is used for the first time and created again after the nodes were modified,
+        i.e. when nodes were created, added, removed or merged, or coordinates of nodes were set.
+        The modifications are counted per root ModelPart
+        """
+        nodes_spatial_index_key = self.GetRootModelPart().__GetNodesModificationKey()
+        if self.__nodes_spatial_index is None or self.__nodes_spatial_index_key != nodes_spatial_index_key:
+            self.__nodes_spatial_index = NodesSpatialIndex(*GetNodesArrays(self))
+            self.__nodes_spatial_index_key = nodes_spatial_index_key
+        return self.__nodes_spatial_index
+
+    def MergeCoincidentNodes(self, tolerance=1E-10):
+        """merges the nodes that coincide within the tolerance (requires NumPy), e.g. after adding several meshes
+        The coincident nodes are found with the spatial index (see "NodesSpatialIndex.FindCoincidentNodes"),
+        each group of coincident nodes is merged into the node with the smallest Id.
+        Only the nodes of this ModelPart are checked, but the merged nodes are replaced in the whole hierarchy:
+        The connectivities of the elements and conditions are changed, and the SubModelParts that contain
+        a merged node contain the node that it was merged into instead. The data of the merged nodes is discarded.
+        Elements and conditions are kept, even if several of their nodes are merged.
+        Returns the number of merged (i.e. removed) nodes
+        """
+        node_ids, target_node_ids = self.GetNodesSpatialIndex().FindCoincidentNodes(tolerance)
+        if node_ids.size > 0:
+            self.GetRootModelPart().__ReplaceNodes(node_ids, target_node_ids)
+
+        logger.info('Merged {} coincident nodes in ModelPart "{}" (tolerance: {})'.format(node_ids.size, self.FullName(), tolerance))
+
+        return int(node_ids.size)
+
     def GetNode(self, node_id):
         try:
             return self.__nodes[node_id]
@@ -250,49 +1145,69 @@ class ModelPart(DataValueContainer):
 
     def AddNode(self, node, mesh_id=0):
         # mesh_id is for compatibility with Kratos
+        self.__ModifiedNodes()
         if self.IsSubModelPart():
             self.GetParentModelPart().AddNode(node)
+            self.__nodes.Add(node.Id)
         else:
-            existing_node = self.__nodes.get(node.Id)
-            if existing_node and not existing_node is node:
+            if node.Id in self.__nodes and not _IsSameEntity(self.__nodes, node):
                 raise RuntimeError("attempting to add Node with Id: {}, unfortunately a (different) node with the same Id already exists".format(node.Id))
-        self.__nodes[node.Id] = node
+            self.__RegisterNode(node)
+            self.__nodes[node.Id] = node
 
     def AddNodes(self, node_ids):
         if self.IsSubModelPart(): # does nothing if we are on the top model part
-            root_mp = self.GetRootModelPart()
-            nodes_to_add = []
+            node_ids = _AsList(node_ids)
+            root_nodes = self.GetRootModelPart().__nodes
             for node_id in node_ids:
-                nodes_to_add.append(root_mp.__nodes.get(node_id))
-                if nodes_to_add[-1] is None:
+                if node_id not in root_nodes:
                     raise RuntimeError("the node with Id {} does not exist in the root model part".format(node_id))
 
+            self.__ModifiedNodes()
             current_model_part = self
             while(current_model_part.IsSubModelPart()):
-                for node in nodes_to_add:
-                    current_model_part.__nodes[node.Id] = node
+                current_model_part.__nodes.Update(node_ids)
                 current_model_part = current_model_part.GetParentModelPart()
 
     def CreateNewNode(self, node_id, coord_x, coord_y, coord_z):
+        self.__ModifiedNodes()
         if self.IsSubModelPart():
             new_node = self.__parent_model_part.CreateNewNode(node_id, coord_x, coord_y, coord_z)
-            self.__nodes[node_id] = new_node
+            self.__nodes.Add(node_id)
             return new_node
         else:
             existing_node = self.__nodes.get(node_id)
             if existing_node:
                 if Distance(existing_node.Coordinates(), [coord_x, coord_y, coord_z]) > 1E-15:
-                    err_msg  = 'A node with Id #' + str(node_id) + ' already exists in the root model part with different Coordinates!'
-                    err_msg += '\nExisting Coords: ' + str(existing_node.Coordinates())
-                    err_msg += '\nNew Coords: '      + str([coord_x, coord_y, coord_z])
-                    raise RuntimeError(err_msg)
+                    raise RuntimeError(_CoordinatesMismatchMessage(node_id, existing_node.Coordinates(), [coord_x, coord_y, coord_z]))
 
                 return existing_node
+            elif isinstance(self.__nodes, NodesArrayContainer):
+                return self.__nodes.CreateNode(node_id, coord_x, coord_y, coord_z)
             else:
                 new_node = Node(node_id, coord_x, coord_y, coord_z)
+                new_node._SetModificationCounter(self.__nodes_modifications)
                 self.__nodes[node_id] = new_node
                 return new_node
 
+    def CreateNewNodes(self, node_ids, coordinates):
+        """Creates many nodes at once, this is much faster than "CreateNewNode" when the nodes are stored in arrays
+        Keyword arguments:
+        node_ids -- Ids of the nodes (list or array)
+        coordinates -- coordinates of the nodes (list or array with (num_nodes x 3) entries)
+
+        As in "CreateNewNode", existing nodes are reused if the coordinates coincide
+        """
+        self.__ModifiedNodes()
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewNodes(node_ids, coordinates)
+            self.__nodes.Update(_AsList(node_ids))
+        elif isinstance(self.__nodes, NodesArrayContainer):
+            self.__nodes.CreateNodes(node_ids, coordinates)
+        else:
+            for node_id, coords in zip(_AsList(node_ids), _AsList(coordinates)):
+                self.CreateNewNode(node_id, coords[0], coords[1], coords[2])
+
 
     ### Methods related to Elements ###
     @property
@@ -312,41 +1227,65 @@ class ModelPart(DataValueContainer):
         # mesh_id is for compatibility with Kratos
         if self.IsSubModelPart():
             self.GetParentModelPart().AddElement(element)
+            self.__elements.Add(element.Id)
         else:
-            existing_element = self.__elements.get(element.Id)
-            if existing_element and not existing_element is element:
+            if element.Id in self.__elements and not _IsSameEntity(self.__elements, element):
                 raise RuntimeError("attempting to add Element with Id: {}, unfortunately a (different) element with the same Id already exists".format(element.Id))
-        self.__elements[element.Id] = element
+            self.__elements[element.Id] = element
 
     def AddElements(self, element_ids):
         if self.IsSubModelPart(): # does nothing if we are on the top model part
-            root_mp = self.GetRootModelPart()
-            elements_to_add = []
-            for elem_id in element_ids:
-                elements_to_add.append(root_mp.__elements.get(elem_id))
-                if elements_to_add[-1] is None:
-                    raise RuntimeError("the element with Id {} does not exist in the root model part".format(elem_id))
+            element_ids = _AsList(element_ids)
+            root_elements = self.GetRootModelPart().__elements
+            for element_id in element_ids:
+                if element_id not in root_elements:
+                    raise RuntimeError("the element with Id {} does not exist in the root model part".format(element_id))
 
             current_model_part = self
             while(current_model_part.IsSubModelPart()):
-                for elem in elements_to_add:
-                    current_model_part.__elements[elem.Id] = elem
+                current_model_part.__elements.Update(element_ids)
                 current_model_part = current_model_part.GetParentModelPart()
 
     def CreateNewElement(self, element_name, element_id, node_ids, properties):
         if self.IsSubModelPart():
             new_element = self.__parent_model_part.CreateNewElement(element_name, element_id, node_ids, properties)
-            self.__elements[element_id] = new_element
+            self.__elements.Add(element_id)
             return new_element
         else:
             if element_id in self.__elements:
                 raise RuntimeError('trying to construct an element with ID {} however an element with the same Id already exists'.format(element_id))
 
+            if isinstance(self.__elements, GeometricalObjectsArrayContainer):
+                self.__CheckNodesExist(node_ids)
+                return self.__elements.CreateGeometricalObject(element_name, element_id, node_ids, properties)
+
             element_nodes = [self.GetNode(node_id) for node_id in node_ids]
             new_element = GeometricalObject(element_id, element_nodes, element_name, properties)
             self.__elements[element_id] = new_element
             return new_element
 
+    def CreateNewElements(self, element_name, element_ids, connectivities, properties):
+        """Creates many elements at once, this is much faster than "CreateNewElement" when the elements are stored in arrays
+        Keyword arguments:
+        element_name -- the name of the elements
+        element_ids -- Ids of the elements (list or array)
+        connectivities -- node Ids of the elements (list or array with (num_elements x num_nodes) entries)
+        properties -- the Properties of the elements
+        """
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewElements(element_name, element_ids, connectivities, properties)
+            self.__elements.Update(_AsList(element_ids))
+        elif isinstance(self.__elements, GeometricalObjectsArrayContainer):
+            element_ids = np.asarray(element_ids, dtype=np.int64).ravel()
+            if element_ids.size == 0:
+                return
+            connectivities = np.asarray(connectivities, dtype=np.int64).reshape(element_ids.size, -1)
+            self.__CheckNewGeometricalObjects(self.__elements, element_ids, connectivities, "an element")
+            self.__elements.CreateGeometricalObjects(element_name, element_ids, connectivities, properties)
+        else:
+            for element_id, node_ids in zip(_AsList(element_ids), _AsList(connectivities)):
+                self.CreateNewElement(element_name, element_id, node_ids, properties)
+
 
     ### Methods related to Conditions ###
     @property
@@ -366,41 +1305,65 @@ class ModelPart(DataValueContainer):
         # mesh_id is for compatibility with Kratos
         if self.IsSubModelPart():
             self.GetParentModelPart().AddCondition(condition)
+            self.__conditions.Add(condition.Id)
         else:
-            existing_condition = self.__conditions.get(condition.Id)
-            if existing_condition and not existing_condition is condition:
+            if condition.Id in self.__conditions and not _IsSameEntity(self.__conditions, condition):
                 raise RuntimeError("attempting to add Condition with Id: {}, unfortunately a (different) condition with the same Id already exists".format(condition.Id))
-        self.__conditions[condition.Id] = condition
+            self.__conditions[condition.Id] = condition
 
     def AddConditions(self, condition_ids):
         if self.IsSubModelPart(): # does nothing if we are on the top model part
-            root_mp = self.GetRootModelPart()
-            conditions_to_add = []
-            for cond_id in condition_ids:
-                conditions_to_add.append(root_mp.__conditions.get(cond_id))
-                if conditions_to_add[-1] is None:
-                    raise RuntimeError("the condition with Id {} does not exist in the root model part".format(cond_id))
+            condition_ids = _AsList(condition_ids)
+            root_conditions = self.GetRootModelPart().__conditions
+            for condition_id in condition_ids:
+                if condition_id not in root_conditions:
+                    raise RuntimeError("the condition with Id {} does not exist in the root model part".format(condition_id))
 
             current_model_part = self
             while(current_model_part.IsSubModelPart()):
-                for cond in conditions_to_add:
-                    current_model_part.__conditions[cond.Id] = cond
+                current_model_part.__conditions.Update(condition_ids)
                 current_model_part = current_model_part.GetParentModelPart()
 
     def CreateNewCondition(self, condition_name, condition_id, node_ids, properties):
         if self.IsSubModelPart():
             new_condition = self.__parent_model_part.CreateNewCondition(condition_name, condition_id, node_ids, properties)
-            self.__conditions[condition_id] = new_condition
+            self.__conditions.Add(condition_id)
             return new_condition
         else:
             if condition_id in self.__conditions:
                 raise RuntimeError('trying to construct a condition with ID {} however a condition with the same Id already exists'.format(condition_id))
 
+            if isinstance(self.__conditions, GeometricalObjectsArrayContainer):
+                self.__CheckNodesExist(node_ids)
+                return self.__conditions.CreateGeometricalObject(condition_name, condition_id, node_ids, properties)
+
             condition_nodes = [self.GetNode(node_id) for node_id in node_ids]
             new_condition = GeometricalObject(condition_id, condition_nodes, condition_name, properties)
             self.__conditions[condition_id] = new_condition
             return new_condition
 
+    def CreateNewConditions(self, condition_name, condition_ids, connectivities, properties):
+        """Creates many conditions at once, this is much faster than "CreateNewCondition" when the conditions are stored in arrays
+        Keyword arguments:
+        condition_name -- the name of the conditions
+        condition_ids -- Ids of the conditions (list or array)
+        connectivities -- node Ids of the conditions (list or array with (num_conditions x num_nodes) entries)
+        properties -- the Properties of the conditions
+        """
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewConditions(condition_name, condition_ids, connectivities, properties)
+            self.__conditions.Update(_AsList(condition_ids))
+        elif isinstance(self.__conditions, GeometricalObjectsArrayContainer):
+            condition_ids = np.asarray(condition_ids, dtype=np.int64).ravel()
+            if condition_ids.size == 0:
+                return
+            connectivities = np.asarray(connectivities, dtype=np.int64).reshape(condition_ids.size, -1)
+            self.__CheckNewGeometricalObjects(self.__conditions, condition_ids, connectivities, "a condition")
+            self.__conditions.CreateGeometricalObjects(condition_name, condition_ids, connectivities, properties)
+        else:
+            for condition_id, node_ids in zip(_AsList(condition_ids), _AsList(connectivities)):
+                self.CreateNewCondition(condition_name, condition_id, node_ids, properties)
+
 
     ### Methods related to Properties ###
     @property
@@ -494,6 +1457,69 @@ class ModelPart(DataValueContainer):
 
         return True
 
+    def __CheckNodesExist(self, node_ids):
+        for node_id in node_ids:
+            if node_id not in self.__nodes:
+                raise RuntimeError('Node index not found: {}'.format(node_id))
+
+    def __CheckNewGeometricalObjects(self, geom_objs, geom_obj_ids, connectivities, geom_obj_description):
+        # vectorized version of the checks done when creating a single element or condition
+        unique_ids, counts = np.unique(geom_obj_ids, return_counts=True)
+        duplicated_ids = unique_ids[counts > 1]
+        if unique_ids.size > 0 and unique_ids[0] <= geom_objs.GetMaxId(): # larger Ids can't exist already
+            duplicated_ids = np.concatenate((duplicated_ids, geom_obj_ids[np.isin(geom_obj_ids, geom_objs.GetIds())]))
+        if duplicated_ids.size > 0:
+            raise RuntimeError('trying to construct {0} with ID {1} however {0} with the same Id already exists'.format(geom_obj_description, duplicated_ids.min()))
+
+        is_missing = ~np.isin(connectivities, self.__nodes.GetIds())
+        if is_missing.any():
+            raise RuntimeError('Node index not found: {}'.format(connectivities[is_missing][0]))
+
+    def __ReplaceNodes(self, node_ids, new_node_ids):
+        # replaces the nodes in the connectivities and SubModelParts and removes them, called on the root
+        replacements = dict(zip(node_ids.tolist(), new_node_ids.tolist()))
+        for geom_objs in (self.__elements, self.__conditions):
+            if isinstance(geom_objs, GeometricalObjectsArrayContainer):
+                geom_objs.ReplaceNodes(node_ids, new_node_ids)
+            else:
+                for geom_obj in geom_objs:
+                    geom_obj_nodes = geom_obj.GetNodes()
+                    for i, node in enumerate(geom_obj_nodes):
+                        new_node_id = replacements.get(node.Id)
+                        if new_node_id is not None:
+                            geom_obj_nodes[i] = self.__nodes[new_node_id]
+
+        if isinstance(self.__nodes, NodesArrayContainer):
+            self.__nodes.RemoveNodes(node_ids)
+        else:
+            for node_id in replacements:
+                del self.__nodes[node_id]
+        self.__ModifiedNodes()
+
+        self.__ReplaceNodesInSubModelParts(replacements)
+
+    def __ReplaceNodesInSubModelParts(self, replacements):
+        for smp in self.__sub_model_parts.values():
+            smp.__nodes.Replace(replacements)
+            smp.__ReplaceNodesInSubModelParts(replacements)
+
+    def __ModifiedNodes(self):
+        # counted in the root, such that the spatial indices of all ModelParts in the hierarchy are created again
+        self.GetRootModelPart().__nodes_modifications.count += 1
+
+    def __GetNodesModificationKey(self):
+        return (self.__nodes_modifications.count,) + tuple(modifications.count for modifications in self.__other_nodes_modifications.values())
+
+    def __RegisterNode(self, node):
+        # the changes of the coordinates of the node are counted in the root that created or added it first
+        if isinstance(self.__nodes, NodesArrayContainer):
+            return # the nodes are copied into the arrays
+        modifications = node._GetModificationCounter()
+        if modifications is None:
+            node._SetModificationCounter(self.__nodes_modifications)
+        elif modifications is not self.__nodes_modifications:
+            self.__other_nodes_modifications[id(modifications)] = modifications
+
     def __CompareSubModelParts(self, self_mp, other_mp):
         # checking if names of SubModelParts coincide
         if self_mp.__sub_model_parts.keys() != other_mp.__sub_model_parts.keys(): return False
@@ -512,6 +1538,37 @@ class ModelPart(DataValueContainer):
 
 
 ### Auxiliar Methods ###
+def _IsSameEntity(entities, entity):
+    # checks whether the entity is the one stored in the container, not only an entity with the same Id
+    if isinstance(entities, _EntitiesArrayContainer):
+        # the views that are alive are cached, hence the stored entity is the cached view
+        return entities._IsView(entity.Id, entity)
+    return entities.get(entity.Id) is entity
+
+def _AsList(values):
+    # NumPy arrays are converted to lists of Python numbers
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+def _CoordinatesMismatchMessage(node_id, existing_coords, new_coords):
+    err_msg  = 'A node with Id #' + str(node_id) + ' already exists in the root model part with different Coordinates!'
+    err_msg += '\nExisting Coords: ' + str(existing_coords)
+    err_msg += '\nNew Coords: '      + str(new_coords)
+    return err_msg
+
+def _CheckCoordinates(node_ids, existing_coordinates, new_coordinates):
+    # vectorized version of the check done in "ModelPart.CreateNewNode"
+    distances = np.sqrt(np.sum((existing_coordinates-new_coordinates)**2, axis=1))
+    mismatches = np.flatnonzero(distances > 1E-15)
+    if mismatches.size > 0:
+        i = mismatches[0]
+        raise RuntimeError(_CoordinatesMismatchMessage(node_ids[i], existing_coordinates[i].tolist(), new_coordinates[i].tolist()))
+
+def _ResizeArray(array, size, capacity):
+    # creates a new array with the given capacity, the first "size" entries are copied
+    resized_array = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized_array[:size] = array[:size]
+    return resized_array
+
 def Distance(coords_1, coords_2):
     return ((coords_1[0]-coords_2[0])**2 +
             (coords_1[1]-coords_2[1])**2 +
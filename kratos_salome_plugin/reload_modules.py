@@ -35,10 +35,18 @@ MODULE_RELOAD_ORDER = [
     "salome_mesh_utilities",
     "salome_study_utilities",
     "reload_modules",
+    "dat_file_io",
+    "file_mesh_interface",
+    "dat_mesh_interface",
+    "med_file_io",
+    "med_mesh_interface",
+    "mesh_disk_cache",
     "mesh_interface",
+    "spatial_search",
     "model_part",
     "geometries_io",
     "write_mdpa",
+    "stream_mdpa",
     "plugin_logging",
     "gui.utilities",
     "gui.about",
@@ -26,6 +26,21 @@ from .utilities import PathCheck
 # salome imports
 from salome import myStudy
 
+# increased whenever the study changes as a whole (e.g. when it is opened or reset)
+# things that depend on the study (e.g. objects resolved from it) can use it to check whether they are outdated
+_study_generation = 0
+
+
+def GetStudyGeneration() -> int:
+    """returns the current generation of the study, it is increased by "NotifyStudyChanged"."""
+    return _study_generation
+
+def NotifyStudyChanged() -> None:
+    """increases the generation of the study, such that things that depend on it are updated (e.g. the objects cached in the MeshInterface)
+    This is done automatically when the study is opened or reset with the functions in this file
+    """
+    global _study_generation
+    _study_generation += 1
 
 def GetNumberOfObjectsInComponent(component) -> int:
     """Counts the number of objects in a component (e.g. GEOM, SMESH)
@@ -108,6 +123,7 @@ def OpenStudy(file_path: Path) -> bool:
     if IsStudyModified() and GetNumberOfObjectsInStudy() > 0:
         logger.warning('Opening study when current study has unsaved changes')
 
+    NotifyStudyChanged()
     try:
         open_successful = myStudy.Open(str(file_path))
     except BaseException as e: # catch all exceptions
@@ -126,5 +142,6 @@ def ResetStudy() -> None:
     see https://docs.salome-platform.org/latest/tui/KERNEL/kernel_salome.html
     """
     logger.debug("Resetting Study")
+    NotifyStudyChanged()
     myStudy.Clear()
     myStudy.Init()
@@ -0,0 +1,418 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the NodesSpatialIndex and functions that use it
+It finds the nodes close to points or inside boxes with vectorized queries,
+instead of looping the nodes and computing the distances one by one
+"""
+
+# python imports
+import itertools
+import logging
+logger = logging.getLogger(__name__)
+
+# numpy imports (required for the spatial index)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# average number of nodes per bucket if the size of the buckets is not specified
+NODES_PER_BUCKET = 2
+
+# the start of every bucket is stored if there are not more buckets than this (times the number of nodes)
+# otherwise the buckets are searched, which is slower but doesn't need memory for the empty buckets
+MAX_BUCKETS_PER_NODE = 8
+
+# number of points that are processed at once in the queries, limits the memory of the candidates
+POINTS_CHUNK_SIZE = 2**18
+
+# if more buckets than this have to be searched (i.e. the starts of the buckets are not stored), all nodes are checked instead
+MAX_BUCKETS_TO_SEARCH = 1000
+
+# maximum number of pairs of points and nodes that are checked at once if all nodes are checked
+MAX_PAIRS_PER_CHUNK = 2**22
+
+
+class NodesSpatialIndex:
+    """Spatial index of nodes, for finding the nodes close to points or inside boxes
+    The nodes are sorted into a uniform grid of buckets (a spatial hash), a query only checks
+    the nodes in the buckets around the points. All queries process many points at once.
+    The index does not change when the nodes are changed, it has to be created again
+    (see "ModelPart.GetNodesSpatialIndex", which does this after nodes were added)
+    """
+
+    def __init__(self, node_ids, coordinates, bucket_size=None):
+        """Constructor of NodesSpatialIndex
+        node_ids -- Ids of the nodes (list or array)
+        coordinates -- coordinates of the nodes (list or array with (num_nodes x 3) entries)
+        bucket_size -- edge length of the buckets, by default chosen such that there are few nodes per bucket
+        """
+        if not numpy_available:
+            raise ImportError('NumPy is required for the NodesSpatialIndex!')
+
+        self.__node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        self.__coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+        if self.__node_ids.size != self.__coordinates.shape[0]:
+            raise Exception('The number of node Ids ({}) does not match the number of coordinates ({})!'.format(self.__node_ids.size, self.__coordinates.shape[0]))
+
+        num_nodes = self.__node_ids.size
+        if num_nodes > 0:
+            self.__min_point = self.__coordinates.min(axis=0)
+            extent = self.__coordinates.max(axis=0) - self.__min_point
+        else:
+            self.__min_point = np.zeros(3)
+            extent = np.zeros(3)
+
+        if bucket_size is None:
+            bucket_size = _GetBucketSize(extent, num_nodes)
+        if not bucket_size > 0.0:
+            raise Exception('The size of the buckets has to be positive, got {}!'.format(bucket_size))
+        self.__bucket_size = float(bucket_size)
+
+        self.__num_buckets = np.floor(extent / self.__bucket_size).astype(np.int64) + 1
+        if np.prod(self.__num_buckets.astype(np.float64)) > 2.0**62:
+            raise Exception('Too many buckets, the size of the buckets ({}) is too small for the extent of the nodes!'.format(self.__bucket_size))
+
+        # the nodes are stored sorted by the buckets, hence the nodes of a bucket are contiguous
+        keys = self.__GetKeys(np.minimum(self.__GetBuckets(self.__coordinates), self.__num_buckets-1))
+        order = np.argsort(keys)
+        self.__sorted_keys = keys[order]
+        self.__node_ids = self.__node_ids[order]
+        self.__coordinates = self.__coordinates[order]
+        self.__components = [np.ascontiguousarray(self.__coordinates[:,i]) for i in range(3)] # faster to access than the rows
+
+        total_num_buckets = int(np.prod(self.__num_buckets))
+        if total_num_buckets <= MAX_BUCKETS_PER_NODE*max(num_nodes, 1):
+            self.__bucket_starts = np.searchsorted(self.__sorted_keys, np.arange(total_num_buckets+1))
+        else:
+            self.__bucket_starts = None
+
+        logger.debug('Created NodesSpatialIndex for {} nodes with {} buckets of size {}'.format(num_nodes, total_num_buckets, self.__bucket_size))
+
+    def GetNumberOfNodes(self):
+        return self.__node_ids.size
+
+    def GetBucketSize(self):
+        return self.__bucket_size
+
+    def FindNodesInRadius(self, points, radius):
+        """returns the Ids of the nodes whose distance to the points is not larger than the radius
+        points -- one point (3 coordinates) or many points ((num_points x 3) array)
+        Returns: for each point an array with the Ids of the nodes, ordered by the distance (the closest first)
+                 only the array if one point is given
+        """
+        points, is_single_point = _AsPoints(points)
+        point_indices, node_positions, squared_distances = self.__FindInRadius(points, radius)
+
+        order = np.lexsort((squared_distances, point_indices))
+        node_ids = self.__node_ids[node_positions[order]]
+        splits = np.cumsum(np.bincount(point_indices, minlength=points.shape[0]))[:-1]
+        nodes_in_radius = np.split(node_ids, splits)
+
+        return nodes_in_radius[0] if is_single_point else nodes_in_radius
+
+    def FindNearestNodes(self, points, num_nearest=1):
+        """returns the Ids of the nearest nodes to the points and their distances
+        points -- one point (3 coordinates) or many points ((num_points x 3) array)
+        num_nearest -- number of nodes to find per point
+        Returns: (node_ids, distances) as (num_points x num_nearest) arrays, ordered by the distance (the closest first)
+                 the arrays have only num_nearest entries if one point is given
+        """
+        points, is_single_point = _AsPoints(points)
+        num_points = points.shape[0]
+        if num_nearest > self.GetNumberOfNodes():
+            raise Exception('Cannot find {} nearest nodes, there are only {} nodes!'.format(num_nearest, self.GetNumberOfNodes()))
+
+        nearest_positions = np.empty((num_points, num_nearest), dtype=np.int64)
+        nearest_squared_distances = np.empty((num_points, num_nearest), dtype=np.float64)
+
+        # the radius is increased until enough nodes are found for all points
+        # the nearest nodes are among the ones in the radius once there are enough of them
+        remaining_points = np.arange(num_points)
+        radius = self.__GetRadiusWithNodes(2*num_nearest)
+        while remaining_points.size > 0:
+            point_indices, node_positions, squared_distances = self.__FindInRadius(points[remaining_points], radius)
+            num_found = np.bincount(point_indices, minlength=remaining_points.size)
+            is_found = num_found >= num_nearest
+
+            selected = is_found[point_indices]
+            point_indices, node_positions, squared_distances = point_indices[selected], node_positions[selected], squared_distances[selected]
+            order = np.lexsort((squared_distances, point_indices))
+            point_indices, node_positions, squared_distances = point_indices[order], node_positions[order], squared_distances[order]
+
+            # rank of the nodes for each point, the first num_nearest are the nearest ones
+            group_starts = np.cumsum(num_found[is_found]) - num_found[is_found]
+            ranks = np.arange(point_indices.size) - np.repeat(group_starts, num_found[is_found])
+            nearest = ranks < num_nearest
+            found_points = remaining_points[is_found]
+            nearest_positions[found_points] = node_positions[nearest].reshape(-1, num_nearest)
+            nearest_squared_distances[found_points] = squared_distances[nearest].reshape(-1, num_nearest)
+
+            remaining_points = remaining_points[~is_found]
+            radius *= 2.0
+
+        node_ids = self.__node_ids[nearest_positions]
+        distances = np.sqrt(nearest_squared_distances)
+        if is_single_point:
+            return node_ids[0], distances[0]
+        return node_ids, distances
+
+    def FindNodesInBoundingBox(self, min_point, max_point):
+        """returns the Ids of the nodes inside the box (including its boundary)
+        min_point, max_point -- the corners of the box with the smallest and the largest coordinates
+        """
+        min_point = np.asarray(min_point, dtype=np.float64)
+        max_point = np.asarray(max_point, dtype=np.float64)
+
+        # only the nodes in the buckets that overlap with the box are checked
+        min_bucket = np.maximum(self.__GetBuckets(min_point.reshape(1, 3))[0], 0)
+        max_bucket = np.minimum(self.__GetBuckets(max_point.reshape(1, 3))[0], self.__num_buckets-1)
+        if np.any(min_bucket > max_bucket) or self.GetNumberOfNodes() == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # the buckets are ordered by x, then y, then z: the nodes of consecutive buckets in x-direction are contiguous
+        yz_buckets = np.stack(np.meshgrid(np.arange(min_bucket[1], max_bucket[1]+1), np.arange(min_bucket[2], max_bucket[2]+1), indexing="ij"), axis=-1).reshape(-1, 2)
+        first_buckets = np.column_stack((np.full(yz_buckets.shape[0], min_bucket[0]), yz_buckets))
+        last_buckets = np.column_stack((np.full(yz_buckets.shape[0], max_bucket[0]), yz_buckets))
+        starts, _ = self.__GetRanges(self.__GetKeys(first_buckets))
+        _, ends = self.__GetRanges(self.__GetKeys(last_buckets))
+
+        positions = _ExpandRanges(starts, ends)
+        coordinates = self.__coordinates[positions]
+        is_inside = np.all((coordinates >= min_point) & (coordinates <= max_point), axis=1)
+        return np.sort(self.__node_ids[positions[is_inside]])
+
+    def FindNodes(self, predicate):
+        """returns the Ids of the nodes whose coordinates fulfill the predicate
+        predicate -- function that gets the coordinates of all nodes ((num_nodes x 3) array) and returns a boolean array, e.g.
+                     lambda coords: coords[:,2] < 1E-6 (the nodes with z=0)
+        """
+        return np.sort(self.__node_ids[np.asarray(predicate(self.__coordinates), dtype=bool)])
+
+    def FindCoincidentNodes(self, tolerance):
+        """returns the nodes that coincide with other nodes and the nodes they are merged into
+        Nodes with a distance not larger than the tolerance are grouped (transitively, i.e. a chain of
+        close nodes forms one group), each group is merged into the node with the smallest Id
+        Returns: (node_ids, target_node_ids), sorted by node_ids
+        """
+        node_ids_1, node_ids_2, _ = self._FindPairsInRadius(tolerance)
+        unique_ids, inverse = np.unique(np.concatenate((node_ids_1, node_ids_2)), return_inverse=True)
+        inverse = inverse.reshape(-1)
+        first, second = inverse[:node_ids_1.size], inverse[node_ids_1.size:]
+
+        # the groups are the connected components of the pairs, found by propagating the smallest
+        # label along the pairs, the labels are the positions of the unique Ids, hence the smallest
+        # label is the smallest Id. Following the labels of the labels makes this converge fast
+        labels = np.arange(unique_ids.size)
+        while True:
+            min_labels = np.minimum(labels[first], labels[second])
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, first, min_labels)
+            np.minimum.at(new_labels, second, min_labels)
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        is_merged = labels != np.arange(unique_ids.size)
+        return unique_ids[is_merged], unique_ids[labels[is_merged]]
+
+    def _FindPairsInRadius(self, radius):
+        """returns all pairs of nodes with a distance not larger than the radius, each pair once
+        Returns: (node_ids_1, node_ids_2, distances), node_ids_1 < node_ids_2
+        """
+        point_indices, node_positions, squared_distances = self.__FindInRadius(self.__coordinates, radius)
+        node_ids_1 = self.__node_ids[point_indices]
+        node_ids_2 = self.__node_ids[node_positions]
+        is_pair = node_ids_1 < node_ids_2
+        return node_ids_1[is_pair], node_ids_2[is_pair], np.sqrt(squared_distances[is_pair])
+
+    def __FindInRadius(self, points, radius):
+        """returns all pairs of points and nodes with a distance not larger than the radius
+        Returns: (point_indices, node_positions, squared_distances)
+        """
+        if radius < 0.0:
+            raise Exception('The radius has to be positive, got {}!'.format(radius))
+
+        results = []
+        for chunk_start in range(0, points.shape[0], POINTS_CHUNK_SIZE):
+            chunk_points = points[chunk_start:chunk_start+POINTS_CHUNK_SIZE]
+            point_indices, node_positions, squared_distances = self.__FindInRadiusChunk(chunk_points, radius)
+            results.append((point_indices+chunk_start, node_positions, squared_distances))
+
+        if len(results) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return tuple(np.concatenate(values) for values in zip(*results))
+
+    def __FindInRadiusChunk(self, points, radius):
+        # the buckets that overlap with the box around the sphere of each point
+        first_buckets = np.maximum(self.__GetBuckets(points-radius), 0)
+        last_buckets = np.minimum(self.__GetBuckets(points+radius), self.__num_buckets-1)
+        num_offsets = np.maximum((last_buckets - first_buckets).max(axis=0) + 1, 0)
+        num_buckets_to_check = int(np.prod(num_offsets))
+
+        if num_buckets_to_check > np.prod(self.__num_buckets) or (self.__bucket_starts is None and num_buckets_to_check > MAX_BUCKETS_TO_SEARCH):
+            # the radius is large compared to the buckets, hence checking all nodes (a few points at once)
+            num_nodes = self.GetNumberOfNodes()
+            points_per_chunk = max(1, MAX_PAIRS_PER_CHUNK // max(num_nodes, 1))
+            candidates = (_AllPairs(chunk_start, min(chunk_start+points_per_chunk, points.shape[0]), num_nodes) for chunk_start in range(0, points.shape[0], points_per_chunk))
+        else:
+            # the points that overlap with more than one bucket in a direction, usually only few if the radius is small
+            num_buckets_of_points = last_buckets - first_buckets + 1
+            is_inside = np.all(num_buckets_of_points > 0, axis=1) # the spheres of the other points don't overlap with the buckets
+            points_with_offset = [[None]+[np.flatnonzero(is_inside & (num_buckets_of_points[:,i] > offset)) for offset in range(1, num_offsets[i])] for i in range(3)]
+
+            candidates = []
+            for offset in itertools.product(*[range(num) for num in num_offsets.tolist()]):
+                point_indices = None # all points if there is no offset
+                for i in range(3):
+                    if offset[i] > 0:
+                        point_indices = points_with_offset[i][offset[i]] if point_indices is None else np.intersect1d(point_indices, points_with_offset[i][offset[i]], assume_unique=True)
+                if point_indices is None:
+                    point_indices = np.flatnonzero(is_inside)
+                starts, ends = self.__GetRanges(self.__GetKeys(first_buckets[point_indices] + offset))
+                candidates.append((np.repeat(point_indices, ends-starts), _ExpandRanges(starts, ends)))
+
+        results = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))]
+        squared_radius = radius**2
+        point_components = [np.ascontiguousarray(points[:,i]) for i in range(3)]
+        for point_indices, node_positions in candidates:
+            squared_distances = np.zeros(node_positions.size)
+            for node_component, point_component in zip(self.__components, point_components):
+                squared_distances += (node_component[node_positions] - point_component[point_indices])**2
+            is_in_radius = squared_distances <= squared_radius
+            results.append((point_indices[is_in_radius], node_positions[is_in_radius], squared_distances[is_in_radius]))
+
+        return tuple(np.concatenate(values) for values in zip(*results))
+
+    def __GetRadiusWithNodes(self, num_nodes):
+        """returns the radius of a sphere that contains approximately num_nodes nodes (assuming they are evenly distributed)"""
+        num_dimensions = max(int(np.count_nonzero(self.__num_buckets > 1)), 1)
+        nodes_per_bucket = max(self.GetNumberOfNodes() / np.prod(self.__num_buckets), 1E-12)
+        unit_ball_volume = {1 : 2.0, 2 : np.pi, 3 : 4.0/3.0*np.pi}[num_dimensions]
+        return self.__bucket_size * (num_nodes / (unit_ball_volume*nodes_per_bucket))**(1.0/num_dimensions)
+
+    def __GetBuckets(self, points):
+        return np.floor((points - self.__min_point) / self.__bucket_size).astype(np.int64)
+
+    def __GetKeys(self, buckets):
+        num_buckets = self.__num_buckets
+        return buckets[:,0] + num_buckets[0]*(buckets[:,1] + num_buckets[1]*buckets[:,2])
+
+    def __GetRanges(self, keys):
+        """returns the range of the (sorted) nodes in the buckets with the keys"""
+        if self.__bucket_starts is not None:
+            return self.__bucket_starts[keys], self.__bucket_starts[keys+1]
+        return np.searchsorted(self.__sorted_keys, keys, "left"), np.searchsorted(self.__sorted_keys, keys, "right")
+
+
+def GetNodesArrays(model_part):
+    """returns the Ids and the coordinates of the nodes of a ModelPart as arrays
+    The arrays are used directly if the nodes are stored in arrays (see "model_part.NodesArrayContainer"),
+    otherwise the nodes are looped once (e.g. for the ModelPart of Kratos)
+    """
+    nodes = model_part.Nodes
+    if hasattr(nodes, "GetCoordinates"):
+        return nodes.GetIds(), nodes.GetCoordinates()
+
+    root_nodes = model_part.GetRootModelPart().Nodes
+    if hasattr(root_nodes, "GetCoordinates"):
+        # SubModelPart, its nodes are selected from the arrays of the root
+        node_ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        root_node_ids = root_nodes.GetIds()
+        order = np.argsort(root_node_ids, kind="stable")
+        positions = order[np.searchsorted(root_node_ids[order], node_ids)]
+        return node_ids, root_nodes.GetCoordinates()[positions]
+
+    num_nodes = len(nodes)
+    node_ids = np.empty(num_nodes, dtype=np.int64)
+    coordinates = np.empty((num_nodes, 3), dtype=np.float64)
+    for i, node in enumerate(nodes):
+        node_ids[i] = node.Id
+        coordinates[i] = (node.X, node.Y, node.Z)
+    return node_ids, coordinates
+
+
+def GetNodesSpatialIndex(model_part):
+    """returns the spatial index of the nodes of a ModelPart
+    The python-ModelPart keeps the index (see "ModelPart.GetNodesSpatialIndex"), for other ModelParts it is created
+    """
+    if hasattr(model_part, "GetNodesSpatialIndex"):
+        return model_part.GetNodesSpatialIndex()
+    return NodesSpatialIndex(*GetNodesArrays(model_part))
+
+
+def CreateSubModelPartFromNodes(model_part, sub_model_part_name, node_ids, add_elements_and_conditions=True):
+    """creates a SubModelPart with the given nodes
+    add_elements_and_conditions -- also add the elements and conditions whose nodes are all given
+    """
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    sub_model_part = model_part.CreateSubModelPart(sub_model_part_name)
+    sub_model_part.AddNodes(node_ids.tolist())
+    if add_elements_and_conditions:
+        sub_model_part.AddElements(_GetEntitiesWithNodes(model_part.Elements, node_ids).tolist())
+        sub_model_part.AddConditions(_GetEntitiesWithNodes(model_part.Conditions, node_ids).tolist())
+
+    logger.info('Created SubModelPart "{}" with {} nodes, {} elements and {} conditions'.format(
+        sub_model_part.FullName(), sub_model_part.NumberOfNodes(), sub_model_part.NumberOfElements(), sub_model_part.NumberOfConditions()))
+
+    return sub_model_part
+
+
+def CreateSubModelPartFromPredicate(model_part, sub_model_part_name, predicate, add_elements_and_conditions=True):
+    """creates a SubModelPart with the nodes whose coordinates fulfill the predicate
+    predicate -- function that gets the coordinates of all nodes ((num_nodes x 3) array) and returns a boolean array, e.g.
+                 lambda coords: np.linalg.norm(coords - center, axis=1) < radius (the nodes inside a sphere)
+    add_elements_and_conditions -- also add the elements and conditions whose nodes all fulfill the predicate
+    """
+    node_ids = GetNodesSpatialIndex(model_part).FindNodes(predicate)
+    return CreateSubModelPartFromNodes(model_part, sub_model_part_name, node_ids, add_elements_and_conditions)
+
+
+def _GetEntitiesWithNodes(entities, node_ids):
+    """returns the Ids of the elements or conditions whose nodes are all in node_ids"""
+    if hasattr(entities, "GetBlocks"):
+        # the connectivities are stored in arrays, checking them all at once
+        entity_ids = [block_ids[np.all(np.isin(connectivities, node_ids), axis=1)] for _, block_ids, connectivities, _ in entities.GetBlocks()]
+        return np.concatenate(entity_ids) if len(entity_ids) > 0 else np.empty(0, dtype=np.int64)
+
+    node_ids = set(node_ids.tolist())
+    return np.array([entity.Id for entity in entities if all(node.Id in node_ids for node in entity.GetNodes())], dtype=np.int64)
+
+
+def _GetBucketSize(extent, num_nodes):
+    """returns the size of the buckets such that there are NODES_PER_BUCKET nodes per bucket on average
+    only the directions in which the nodes are spread are considered, e.g. for nodes in a plane
+    """
+    max_extent = float(extent.max())
+    is_spread = extent > 1E-12*max_extent
+    if num_nodes < 2 or max_extent == 0.0:
+        return max(max_extent, 1.0)
+    num_dimensions = int(np.count_nonzero(is_spread))
+    volume = float(np.prod(extent[is_spread]))
+    return (volume * NODES_PER_BUCKET / num_nodes)**(1.0/num_dimensions)
+
+def _AsPoints(points):
+    """returns the points as (num_points x 3) array and whether only one point was given"""
+    points = np.asarray(points, dtype=np.float64)
+    return points.reshape(-1, 3), points.ndim == 1
+
+def _ExpandRanges(starts, ends):
+    """returns the concatenation of the ranges [start, end)"""
+    lengths = ends - starts
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+def _AllPairs(first_point, end_point, num_nodes):
+    """returns all pairs of the points in [first_point, end_point) and the nodes"""
+    return np.repeat(np.arange(first_point, end_point), num_nodes), np.tile(np.arange(num_nodes), end_point-first_point)
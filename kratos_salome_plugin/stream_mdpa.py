@@ -0,0 +1,463 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+Writing meshes directly to a mdpa file, without creating a ModelPart with all the entities first.
+The nodes and geometries are written while they are read from the MeshInterfaces,
+only the Ids are kept in memory. Therefore meshes can be exported that are too large
+to be kept in memory as a ModelPart.
+The nodes and geometries are written in slices (see "STREAM_CHUNK_SIZE"), such that
+python objects are only created for a few of them at once.
+"""
+
+# python imports
+import os
+import time
+import shutil
+import tempfile
+from bisect import bisect_left
+from collections import namedtuple
+import logging
+logger = logging.getLogger(__name__)
+
+# plugin imports
+from .model_part import DataValueContainer, ModelPart, Properties, _AsList
+from .geometries_io import GeometriesIO
+from .write_mdpa import NODES_LINE_FORMAT, _WriteLinesChunked, _WriteHeaderMdpa, _WriteModelPartDataMdpa, _WritePropertiesMdpa, _WriteSubModelPartsMdpa
+
+# numpy imports (optional, the Ids of the written Nodes are stored in an array with it)
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# number of Nodes, Elements or Conditions that are converted to python objects at once for writing them
+STREAM_CHUNK_SIZE = 2**16
+
+# an Element or Condition that was already written,
+# providing what is needed for adding it to other SubModelParts
+_StreamedEntity = namedtuple("_StreamedEntity", ["Id", "Properties"])
+
+
+class _NodeIds:
+    """Ids of the Nodes that were written
+    With NumPy they are stored in a sorted array, otherwise in a set
+    """
+    def __init__(self):
+        if numpy_available:
+            self.__ids = np.empty(0, dtype=np.int64)
+        else:
+            self.__ids = set()
+
+    def AddNew(self, node_ids):
+        """adds the Ids and returns the positions of the Ids that did not exist yet (once for each Id, in the order of the input)"""
+        if numpy_available:
+            node_ids = np.asarray(node_ids, dtype=np.int64).reshape(-1)
+            unique_ids, first_positions = np.unique(node_ids, return_index=True)
+            is_new = ~np.isin(unique_ids, self.__ids, assume_unique=True)
+            self.__ids = np.union1d(self.__ids, unique_ids[is_new])
+            return np.sort(first_positions[is_new])
+
+        new_positions = []
+        for position, node_id in enumerate(_AsList(node_ids)):
+            if node_id not in self.__ids:
+                self.__ids.add(node_id)
+                new_positions.append(position)
+        return new_positions
+
+    def GetMaxId(self):
+        if numpy_available:
+            return int(self.__ids[-1]) if self.__ids.size > 0 else 0
+        return max(self.__ids, default=0)
+
+    def keys(self):
+        return sorted(_AsList(self.__ids))
+
+    def __contains__(self, node_id):
+        if numpy_available:
+            position = np.searchsorted(self.__ids, node_id)
+            return position < self.__ids.size and self.__ids[position] == node_id
+        return node_id in self.__ids
+
+    def __len__(self):
+        return len(self.__ids)
+
+
+class _EntitiesStream:
+    """Writes Elements or Conditions to a temporary file, in the order of creation
+    The Ids have to be consecutive (starting from 1), therefore only the Properties of the entities are stored.
+    """
+    def __init__(self, entities_name):
+        self.__entities_name = entities_name
+        self.__file = tempfile.TemporaryFile(mode="w+")
+        self.__num_entities = 0
+        # the Properties of consecutive entities, as two aligned lists:
+        self.__properties_last_ids = [] # the Id of the last entity with the Properties
+        self.__properties = []
+        self.__current_block_name = None
+
+    def Create(self, entity_name, entity_ids, connectivities, properties):
+        num_entities = len(entity_ids)
+        if num_entities == 0:
+            return
+
+        first_id = self.__num_entities + 1
+        if not _AreConsecutiveIds(entity_ids, first_id):
+            err_msg  = 'The {}s have to be created with consecutive Ids, starting with Id {}!\n'.format(self.__entities_name, first_id)
+            err_msg += 'This is required because they are written directly in the order of creation'
+            raise RuntimeError(err_msg)
+
+        if entity_name != self.__current_block_name:
+            self.__WriteEndOfBlock(self.__file)
+            self.__current_block_name = entity_name
+            self.__file.write("Begin {}s {}\n".format(self.__entities_name, entity_name))
+
+        line_format = "\t%s"*(2+len(connectivities[0])) + "\n"
+        props_id = properties.Id
+        rows = ((entity_id, props_id)+tuple(conn) for entity_id, conn in _IterSlices(entity_ids, connectivities))
+        _WriteLinesChunked(rows, line_format, self.__file, num_rows=num_entities)
+
+        self.__num_entities += num_entities
+        self.__properties_last_ids.append(self.__num_entities)
+        self.__properties.append(properties)
+
+    def Get(self, entity_id):
+        if not 0 < entity_id <= self.__num_entities:
+            raise RuntimeError('{} index not found: {}'.format(self.__entities_name, entity_id))
+        return _StreamedEntity(entity_id, self.__properties[bisect_left(self.__properties_last_ids, entity_id)])
+
+    def WriteTo(self, file_stream):
+        self.__file.seek(0)
+        shutil.copyfileobj(self.__file, file_stream)
+        self.__WriteEndOfBlock(file_stream)
+
+    def Close(self):
+        self.__file.close()
+
+    def __len__(self):
+        return self.__num_entities
+
+    def GetMaxId(self):
+        # the Ids are consecutive
+        return self.__num_entities
+
+    def __WriteEndOfBlock(self, file_stream):
+        if self.__current_block_name is not None:
+            file_stream.write("End {}s // {}\n\n".format(self.__entities_name, self.__current_block_name))
+
+
+class StreamingModelPart(DataValueContainer):
+    """ModelPart that writes the Nodes, Elements and Conditions to a mdpa file instead of storing them
+    It provides the part of the interface of the ModelPart that is used by the GeometriesIO,
+    hence it can be filled with "GeometriesIO.AddMeshes".
+    Only the Ids of the entities are stored, as they are needed for the SubModelParts and for not
+    creating entities twice from the same geometry.
+
+    The entities are written to temporary files, because the blocks in the mdpa file have a fixed order
+    (Nodes before Elements before Conditions), the mdpa file is assembled in "WriteMdpa".
+    The file is the same as when creating a ModelPart and writing it with "write_mdpa.WriteMdpa".
+    Differences to the ModelPart:
+    - Elements and Conditions have to be created with consecutive Ids
+    - The coordinates of Nodes that exist already are not checked, the Node is not written again
+    - The Nodes of the root are only available as Ids, see "_NodeIds"
+    """
+
+    def __init__(self, name="default", parent_model_part=None):
+        """Keyword arguments:
+        name -- the name of the ModelPart
+        parent_model_part -- the parent, only used when creating SubModelParts (see "CreateSubModelPart")
+        """
+        super().__init__()
+        self.Name = name
+        self.__parent_model_part = parent_model_part
+        self.__sub_model_parts = ModelPart.PointerVectorSet()
+        self.__properties = ModelPart.PointerVectorSet()
+
+        if parent_model_part is None:
+            # the root stores the Ids of all Nodes and writes the entities
+            self.__node_ids = _NodeIds()
+            self.__nodes_file = tempfile.TemporaryFile(mode="w+")
+            self.__elements = _EntitiesStream("Element")
+            self.__conditions = _EntitiesStream("Condition")
+        else:
+            # the SubModelParts only store the Ids, there are no entities that could be accessed
+            self.__node_ids = ModelPart.EntitiesSubset(None)
+            self.__elements = ModelPart.EntitiesSubset(None)
+            self.__conditions = ModelPart.EntitiesSubset(None)
+
+    def FullName(self):
+        full_name = self.Name
+        if self.IsSubModelPart():
+            full_name = self.GetParentModelPart().FullName() + "." + full_name
+        return full_name
+
+    ### Methods related to SubModelParts ###
+    @property
+    def SubModelParts(self):
+        return self.__sub_model_parts
+
+    def NumberOfSubModelParts(self):
+        return len(self.__sub_model_parts)
+
+    def CreateSubModelPart(self, name_smp):
+        if name_smp in self.__sub_model_parts:
+            raise RuntimeError('There is an already existing sub model part with name "{}" in model part: "{}"'.format(name_smp, self.Name))
+        smp = StreamingModelPart(name_smp, self)
+        self.__sub_model_parts[name_smp] = smp
+        return smp
+
+    def HasSubModelPart(self, name_smp):
+        return name_smp in self.__sub_model_parts
+
+    def GetSubModelPart(self, smp_name):
+        try:
+            return self.__sub_model_parts[smp_name]
+        except KeyError:
+            raise RuntimeError('SubModelPart "{}" not found'.format(smp_name))
+
+    def IsSubModelPart(self):
+        return self.__parent_model_part is not None
+
+    def GetParentModelPart(self):
+        if self.IsSubModelPart():
+            return self.__parent_model_part
+        else:
+            return self
+
+    def GetRootModelPart(self):
+        if self.IsSubModelPart():
+            return self.__parent_model_part.GetRootModelPart()
+        else:
+            return self
+
+    ### Methods related to Nodes ###
+    @property
+    def Nodes(self):
+        # only the Ids, the Nodes are not stored
+        return self.__node_ids
+
+    def NumberOfNodes(self):
+        return len(self.__node_ids)
+
+    def CreateNewNodes(self, node_ids, coordinates):
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewNodes(node_ids, coordinates)
+            self.__node_ids.Update(_AsList(node_ids))
+        else:
+            new_positions = self.__node_ids.AddNew(node_ids)
+            if hasattr(node_ids, "shape"):
+                new_node_ids = node_ids.reshape(-1)[new_positions]
+                new_coordinates = coordinates.reshape(-1, 3)[new_positions]
+            else:
+                new_node_ids = [node_ids[position] for position in new_positions]
+                new_coordinates = [coordinates[position] for position in new_positions]
+            rows = ((node_id, coords[0], coords[1], coords[2]) for node_id, coords in _IterSlices(new_node_ids, new_coordinates))
+            _WriteLinesChunked(rows, NODES_LINE_FORMAT, self.__nodes_file, num_rows=len(new_node_ids))
+
+    ### Methods related to Elements ###
+    @property
+    def Elements(self):
+        # only the Ids, the Elements are not stored
+        return self.__elements
+
+    def NumberOfElements(self):
+        return len(self.__elements)
+
+    def GetElement(self, element_id):
+        return self.GetRootModelPart().__elements.Get(element_id)
+
+    def AddElement(self, element, mesh_id=0):
+        # mesh_id is for compatibility with Kratos
+        if self.IsSubModelPart():
+            self.__parent_model_part.AddElement(element)
+            self.__elements.Add(element.Id)
+        # the root contains all created Elements already
+
+    def AddElements(self, element_ids):
+        # mirrors "ModelPart.AddElements", does nothing if we are on the top model part
+        if self.IsSubModelPart():
+            element_ids = _AsList(element_ids)
+            self.__parent_model_part.AddElements(element_ids)
+            self.__elements.Update(element_ids)
+
+    def CreateNewElements(self, element_name, element_ids, connectivities, properties):
+        element_ids = _AsList(element_ids)
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewElements(element_name, element_ids, connectivities, properties)
+            self.__elements.Update(element_ids)
+        else:
+            self.__elements.Create(element_name, element_ids, connectivities, properties)
+
+    ### Methods related to Conditions ###
+    @property
+    def Conditions(self):
+        # only the Ids, the Conditions are not stored
+        return self.__conditions
+
+    def NumberOfConditions(self):
+        return len(self.__conditions)
+
+    def GetCondition(self, condition_id):
+        return self.GetRootModelPart().__conditions.Get(condition_id)
+
+    def AddCondition(self, condition, mesh_id=0):
+        # mesh_id is for compatibility with Kratos
+        if self.IsSubModelPart():
+            self.__parent_model_part.AddCondition(condition)
+            self.__conditions.Add(condition.Id)
+        # the root contains all created Conditions already
+
+    def AddConditions(self, condition_ids):
+        # mirrors "ModelPart.AddConditions", does nothing if we are on the top model part
+        if self.IsSubModelPart():
+            condition_ids = _AsList(condition_ids)
+            self.__parent_model_part.AddConditions(condition_ids)
+            self.__conditions.Update(condition_ids)
+
+    def CreateNewConditions(self, condition_name, condition_ids, connectivities, properties):
+        condition_ids = _AsList(condition_ids)
+        if self.IsSubModelPart():
+            self.__parent_model_part.CreateNewConditions(condition_name, condition_ids, connectivities, properties)
+            self.__conditions.Update(condition_ids)
+        else:
+            self.__conditions.Create(condition_name, condition_ids, connectivities, properties)
+
+    ### Methods related to Properties ###
+    @property
+    def Properties(self):
+        return self.__properties
+
+    def NumberOfProperties(self):
+        return len(self.__properties)
+
+    def HasProperties(self, properties_id):
+        return properties_id in self.__properties
+
+    def RecursivelyHasProperties(self, properties_id):
+        if self.HasProperties(properties_id):
+            return True
+        else:
+            if self.IsSubModelPart():
+                return self.__parent_model_part.RecursivelyHasProperties(properties_id)
+            else:
+                return False
+
+    def GetProperties(self, properties_id, mesh_id=0):
+        # mesh_id is for compatibility with Kratos
+        if self.HasProperties(properties_id):
+            return self.__properties[properties_id]
+        else:
+            if self.IsSubModelPart():
+                # check if properties exist in parent
+                # if so, then add it also to this ModelPart
+                props = self.__parent_model_part.GetProperties(properties_id)
+                self.__properties[properties_id] = props
+                return props
+            else:
+                raise RuntimeError('Properties index not found: {}'.format(properties_id))
+
+    def CreateNewProperties(self, properties_id):
+        if self.IsSubModelPart():
+            new_properties = self.__parent_model_part.CreateNewProperties(properties_id)
+            self.__properties[properties_id] = new_properties
+            return new_properties
+        else:
+            if properties_id in self.__properties:
+                raise RuntimeError("Property #{} already existing".format(properties_id))
+            new_properties = Properties(properties_id)
+            self.__properties[properties_id] = new_properties
+            return new_properties
+
+    ### Methods related to writing ###
+    def WriteMdpa(self, file_name, additional_header="", write_creation_time=True):
+        """Assembles the mdpa file from the entities that were written so far
+        see "write_mdpa.WriteMdpa" for the arguments
+        """
+        if self.IsSubModelPart():
+            raise RuntimeError('The mdpa file can only be written from the root ModelPart, not from SubModelPart "{}"'.format(self.FullName()))
+
+        if not file_name.endswith(".mdpa"):
+            file_name += ".mdpa"
+
+        logger.info('Starting to write ModelPart "%s" to file "%s"', self.Name, os.path.abspath(file_name))
+        start_time = time.time()
+
+        with open(file_name, 'w') as mdpa_file:
+            _WriteHeaderMdpa(self, additional_header, write_creation_time, mdpa_file)
+
+            if self.HasData():
+                _WriteModelPartDataMdpa(self, mdpa_file)
+
+            _WritePropertiesMdpa(self.Properties, mdpa_file)
+
+            if self.NumberOfNodes() > 0:
+                mdpa_file.write("Begin Nodes\n")
+                self.__nodes_file.seek(0)
+                shutil.copyfileobj(self.__nodes_file, mdpa_file)
+                mdpa_file.write("End Nodes\n\n")
+            self.__elements.WriteTo(mdpa_file)
+            self.__conditions.WriteTo(mdpa_file)
+
+            for smp in self.SubModelParts:
+                _WriteSubModelPartsMdpa(smp, mdpa_file)
+
+        logger.info('Writing ModelPart took {0:.{1}f} [s]'.format(time.time()-start_time,2))
+
+    def Close(self):
+        """Removes the temporary files"""
+        if not self.IsSubModelPart():
+            self.__nodes_file.close()
+            self.__elements.Close()
+            self.__conditions.Close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+
+    def PrintInfo(self, prefix_string=""):
+        return prefix_string + 'StreamingModelPart "{}"\n'.format(self.Name)
+
+
+def _IterSlices(*columns):
+    """yields the rows of the columns (arrays or lists of the same length)
+    The columns are converted to python objects in slices of "STREAM_CHUNK_SIZE" rows
+    """
+    for start in range(0, len(columns[0]), STREAM_CHUNK_SIZE):
+        for row in zip(*[_AsList(column[start:start+STREAM_CHUNK_SIZE]) for column in columns]):
+            yield row
+
+def _AreConsecutiveIds(entity_ids, first_id):
+    if hasattr(entity_ids, "shape"):
+        return bool(np.array_equal(entity_ids.reshape(-1), np.arange(first_id, first_id+entity_ids.size)))
+    return _AsList(entity_ids) == list(range(first_id, first_id+len(entity_ids)))
+
+def StreamMeshesToMdpa(meshes, file_name, additional_header="", write_creation_time=True):
+    """Writes meshes to a mdpa file, without creating a ModelPart
+    The file is the same as when adding the meshes to a ModelPart with "GeometriesIO.AddMeshes"
+    and writing it with "write_mdpa.WriteMdpa", but much less memory is needed.
+
+    With NumPy the meshes are extracted as arrays (see "MeshInterface.GetNodesAndGeometricalEntitiesArrays"),
+    which are written in slices of "STREAM_CHUNK_SIZE" entities. Remaining limits of the memory:
+    - The arrays of one mesh have to fit into memory, and the arrays of the main mesh are kept
+      during the whole call, as they are shared by its submeshes and groups (see "geometries_io.ExtractionCache")
+    - The Ids of the written Nodes are kept in an array, and the Ids in the SubModelParts are kept as python ints
+    - Without NumPy the meshes are extracted as dicts (see "MeshInterface.GetNodesAndGeometricalEntities")
+    Keyword arguments:
+    meshes -- List of meshes from which to create the entities, see "geometries_io.Mesh"
+    file_name -- name of the mdpa file, the extension is added if missing
+    additional_header -- additional information that is written in the header of the file
+    write_creation_time -- whether the time of creation is written in the header of the file
+    """
+    with StreamingModelPart() as model_part:
+        GeometriesIO.AddMeshes(model_part, meshes)
+        model_part.WriteMdpa(file_name, additional_header, write_creation_time)
@@ -11,10 +11,63 @@
 # python imports
 import os
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby, islice
 import logging
-import copy
 logger = logging.getLogger(__name__)
 
+# the lines of the blocks (e.g. nodes) are formatted and written in chunks of this size
+# this reduces the overhead of formatting and writing each line separately
+CHUNK_SIZE = 10000
+
+# max number of chunks that are formatted in parallel at the same time (when using multiple processes)
+# this limits the memory usage
+MAX_PENDING_CHUNKS = 64
+
+# when formatting in parallel, smaller blocks are split into smaller chunks (but not smaller than this),
+# such that all processes are used, see "_GetChunkSize"
+MIN_CHUNK_SIZE = 1000
+
+# format of the lines in the nodes block: Id and coordinates (with a precision of 10 digits)
+NODES_LINE_FORMAT = '\t%s\t%.{0}f\t%.{0}f\t%.{0}f\n'.format(10)
+
+def _FormatLines(line_format, chunk):
+    # defined on module level such that it can be executed in other processes
+    return (line_format*len(chunk)) % tuple(chain.from_iterable(chunk))
+
+def _GetChunkSize(num_rows, executor=None):
+    """returns the number of rows per chunk
+    When formatting in parallel and the number of rows is known, then the rows are split into
+    (up to) MAX_PENDING_CHUNKS chunks, such that also smaller blocks are distributed to the processes
+    """
+    if executor is None or num_rows is None:
+        return CHUNK_SIZE
+    return min(CHUNK_SIZE, max(MIN_CHUNK_SIZE, -(-num_rows // MAX_PENDING_CHUNKS)))
+
+def _WriteLinesChunked(rows, line_format, file_stream, executor=None, num_rows=None):
+    """formats the rows (tuples of values) with the (%-style) line_format
+    and writes them in chunks, with one call to "write" per chunk
+    If an executor is given then the chunks are formatted in parallel,
+    the results are written in the original order
+    The number of rows (if known) is used for choosing the size of the chunks, see "_GetChunkSize"
+    """
+    rows = iter(rows)
+    chunk_size = _GetChunkSize(num_rows, executor)
+    chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+
+    if executor is None:
+        for chunk in chunks:
+            file_stream.write(_FormatLines(line_format, chunk))
+    else:
+        pending_chunks = deque()
+        for chunk in chunks:
+            pending_chunks.append(executor.submit(_FormatLines, line_format, chunk))
+            if len(pending_chunks) >= MAX_PENDING_CHUNKS:
+                file_stream.write(pending_chunks.popleft().result())
+        while pending_chunks:
+            file_stream.write(pending_chunks.popleft().result())
+
 def _WriteHeaderMdpa(model_part, additional_header, write_creation_time, file_stream):
     def WriteSubModelPartInfo(model_part,
                               file_stream,
@@ -43,28 +96,48 @@ def _WriteHeaderMdpa(model_part, additional_header, write_creation_time, file_st
     WriteSubModelPartInfo(model_part,file_stream, level=1)
     file_stream.write("\n")
 
-def _WriteNodesMdpa(nodes, file_stream):
+def _WriteNodesMdpa(nodes, file_stream, executor=None):
     if len(nodes) > 0:
         file_stream.write("Begin Nodes\n")
-        precision = 10
-        for node in nodes:
-            file_stream.write('\t{0}\t{1:.{4}f}\t{2:.{4}f}\t{3:.{4}f}\n'.format(node.Id, node.X, node.Y, node.Z, precision))
+        if hasattr(nodes, "GetCoordinates"):
+            # nodes are stored in arrays, no need to create the nodes
+            rows = ((node_id,)+tuple(coords) for node_id, coords in zip(nodes.GetIds().tolist(), nodes.GetCoordinates().tolist()))
+        else:
+            rows = ((node.Id, node.X, node.Y, node.Z) for node in nodes)
+        _WriteLinesChunked(rows, NODES_LINE_FORMAT, file_stream, executor, len(nodes))
         file_stream.write("End Nodes\n\n")
 
-def _WriteEntitiesMdpa(entities, entities_name, file_stream):
+def __GetEntitiesSegments(entities):
+    # returns segments of consecutive entities with the same name and number of nodes
+    # each segment is a tuple: (name, rows, num_rows), where each row contains (Id, Properties-Id, Node-Ids...)
+    # the number of rows is None if it is not known beforehand
+    if hasattr(entities, "GetSegments"):
+        # entities are stored in arrays, no need to create the entities
+        for name, ids, connectivities, properties_ids in entities.GetSegments():
+            rows = zip(ids.tolist(), properties_ids.tolist(), *connectivities.T.tolist())
+            yield name, rows, len(ids)
+    else:
+        def GetKey(entity):
+            return entity.name, len(entity.GetNodes())
+
+        for (name, _), segment in groupby(entities, GetKey):
+            yield name, ((entity.Id, entity.Properties.Id)+tuple(node.Id for node in entity.GetNodes()) for entity in segment), None
+
+def _WriteEntitiesMdpa(entities, entities_name, file_stream, executor=None):
     if len(entities) > 0:
-        current_entity_name = next(iter(entities)).name # get name of first entity
-
-        file_stream.write("Begin {}s {}\n".format(entities_name, current_entity_name))
+        current_entity_name = None
 
-        for entity in entities:
-            entity_name = entity.name
+        for entity_name, rows, num_rows in __GetEntitiesSegments(entities):
             if entity_name != current_entity_name:
-                file_stream.write("End {}s // {}\n\n".format(entities_name, current_entity_name))
+                if current_entity_name is not None:
+                    file_stream.write("End {}s // {}\n\n".format(entities_name, current_entity_name))
                 current_entity_name = entity_name
                 file_stream.write("Begin {}s {}\n".format(entities_name, current_entity_name))
 
-            file_stream.write('\t{}\t{}\t{}\n'.format(entity.Id, entity.Properties.Id, "\t".join([str(node.Id) for node in entity.GetNodes()])))
+            rows = iter(rows)
+            first_row = next(rows)
+            line_format = "\t%s"*len(first_row) + "\n"
+            _WriteLinesChunked(chain([first_row], rows), line_format, file_stream, executor, num_rows)
         file_stream.write("End {}s // {}\n\n".format(entities_name, current_entity_name))
 
 def __VariableFormatter(val):
@@ -88,29 +161,36 @@ def __VariableFormatter(val):
     else: # other type
         return str
 
-def _WriteEntityDataMdpa(entities, entities_name, file_stream):
-    def WriteDataBlock(entities, entities_name, variable_name, variable_formatter, file_stream):
-        if entities_name == "Nod": # nodes also need the fixity specified, currently hardcoded to 0
-            format_string = "\t{} 0\t{}\n"
-        else:
-            format_string = "\t{}\t{}\n"
-
-        file_stream.write("Begin {}alData {}\n".format(entities_name, variable_name))
-        for entity in entities:
-            if entity.Has(variable_name):
-                file_stream.write(format_string.format(entity.Id, variable_formatter(entity.GetValue(variable_name))))
-        file_stream.write("End {}alData // {}\n\n".format(entities_name, variable_name))
-
-    written_variables = []
-    # creating two indepentent iterators, since we iterate twice at the same time
-    entities_iter = iter(entities)
-    inner_entities_iter = copy.copy(entities_iter)
-
-    for entity in entities_iter:
-        for var_name in sorted(entity.GetData()): # sorting to make reading and testing easier
-            if var_name not in written_variables:
-                written_variables.append(var_name)
-                WriteDataBlock(inner_entities_iter, entities_name, var_name, __VariableFormatter(entity.GetValue(var_name)), file_stream)
+def __GetEntitiesData(entities):
+    # returns (Id, data) of the entities that have data, in the order of the container
+    if hasattr(entities, "GetDataItems"):
+        # entities are stored in arrays, no need to create the entities
+        return entities.GetDataItems()
+    else:
+        return ((entity.Id, entity.GetData()) for entity in entities if entity.HasData())
+
+def _WriteEntityDataMdpa(entities, entities_name, file_stream, executor=None):
+    # collecting the data in one pass over the entities, as columns per variable
+    # the variables are written in the order in which they are found
+    columns = OrderedDict() # map: {variable_name : (variable_formatter, [Ids], [values])}
+    for entity_id, data in __GetEntitiesData(entities):
+        for var_name in sorted(data): # sorting to make reading and testing easier
+            column = columns.get(var_name)
+            if column is None:
+                # the formatter is determined from the first value of the variable
+                column = columns[var_name] = (__VariableFormatter(data[var_name]), [], [])
+            column[1].append(entity_id)
+            column[2].append(data[var_name])
+
+    if entities_name == "Nod": # nodes also need the fixity specified, currently hardcoded to 0
+        line_format = "\t%s 0\t%s\n"
+    else:
+        line_format = "\t%s\t%s\n"
+
+    for var_name, (variable_formatter, ids, values) in columns.items():
+        file_stream.write("Begin {}alData {}\n".format(entities_name, var_name))
+        _WriteLinesChunked(zip(ids, map(variable_formatter, values)), line_format, file_stream, executor, len(ids))
+        file_stream.write("End {}alData // {}\n\n".format(entities_name, var_name))
 
 def __WriteDataValueContainer(container, file_stream, level=0):
     for key in sorted(container): # sorting to make reading and testing easier
@@ -138,11 +218,11 @@ def _WriteModelPartDataMdpa(model_part, file_stream, level=0):
     if level == 0:
         file_stream.write("\n")
 
-def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0):
+def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0, executor=None):
     def WriteSubModelPartEntities(entities, entities_name, file_stream, level):
         file_stream.write("{}Begin SubModelPart{}\n".format("\t"*level, entities_name))
-        for entity in entities:
-            file_stream.write("{}{}\n".format("\t"*(level+1), entity.Id))
+        # the keys of the containers are the Ids of the entities
+        _WriteLinesChunked(((entity_id,) for entity_id in entities.keys()), "\t"*(level+1)+"%s\n", file_stream, executor, len(entities))
         file_stream.write("{}End SubModelPart{}\n".format("\t"*level, entities_name))
 
     file_stream.write("{}Begin SubModelPart {}\n".format("\t"*level, sub_model_part.Name))
@@ -161,34 +241,52 @@ def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0):
 
     # write SubModelParts recursively
     for smp in sub_model_part.SubModelParts:
-        _WriteSubModelPartsMdpa(smp, file_stream, level+1)
+        _WriteSubModelPartsMdpa(smp, file_stream, level+1, executor)
     file_stream.write("{}End SubModelPart // {}\n".format("\t"*level, sub_model_part.Name))
 
 
-def WriteMdpa(model_part, file_name, additional_header="", write_creation_time=True):
-    if not file_name.endswith(".mdpa"):
-        file_name += ".mdpa"
+def _WriteModelPartMdpa(model_part, additional_header, write_creation_time, mdpa_file, executor=None):
+    _WriteHeaderMdpa(model_part, additional_header, write_creation_time, mdpa_file)
 
-    logger.info('Starting to write ModelPart "%s" to file "%s"', model_part.Name, os.path.abspath(file_name))
-    start_time = time.time()
+    if model_part.HasData():
+        _WriteModelPartDataMdpa(model_part, mdpa_file)
 
-    with open(file_name, 'w') as mdpa_file:
-        _WriteHeaderMdpa(model_part, additional_header, write_creation_time, mdpa_file)
+    _WritePropertiesMdpa(model_part.Properties, mdpa_file)
 
-        if model_part.HasData():
-            _WriteModelPartDataMdpa(model_part, mdpa_file)
+    _WriteNodesMdpa(model_part.Nodes, mdpa_file, executor)
+    _WriteEntitiesMdpa(model_part.Elements, "Element", mdpa_file, executor)
+    _WriteEntitiesMdpa(model_part.Conditions, "Condition", mdpa_file, executor)
 
-        _WritePropertiesMdpa(model_part.Properties, mdpa_file)
+    _WriteEntityDataMdpa(model_part.Nodes, "Nod", mdpa_file, executor)
+    _WriteEntityDataMdpa(model_part.Elements, "Element", mdpa_file, executor)
+    _WriteEntityDataMdpa(model_part.Conditions, "Condition", mdpa_file, executor)
 
-        _WriteNodesMdpa(model_part.Nodes, mdpa_file)
-        _WriteEntitiesMdpa(model_part.Elements, "Element", mdpa_file)
-        _WriteEntitiesMdpa(model_part.Conditions, "Condition", mdpa_file)
+    for smp in model_part.SubModelParts:
+        _WriteSubModelPartsMdpa(smp, mdpa_file, executor=executor)
 
-        _WriteEntityDataMdpa(model_part.Nodes, "Nod", mdpa_file)
-        _WriteEntityDataMdpa(model_part.Elements, "Element", mdpa_file)
-        _WriteEntityDataMdpa(model_part.Conditions, "Condition", mdpa_file)
 
-        for smp in model_part.SubModelParts:
-            _WriteSubModelPartsMdpa(smp, mdpa_file)
+def WriteMdpa(model_part, file_name, additional_header="", write_creation_time=True, num_workers=1):
+    """Writes a ModelPart to a mdpa file
+    Keyword arguments:
+    model_part -- the ModelPart to write
+    file_name -- name of the mdpa file, the extension is added if missing
+    additional_header -- additional information that is written in the header of the file
+    write_creation_time -- whether the time of creation is written in the header of the file
+    num_workers -- number of processes that are used for formatting the blocks (nodes, elements, ...) of large files.
+                   The file is the same as when writing in serial.
+    """
+    if not file_name.endswith(".mdpa"):
+        file_name += ".mdpa"
+
+    logger.info('Starting to write ModelPart "%s" to file "%s"', model_part.Name, os.path.abspath(file_name))
+    start_time = time.time()
+
+    with open(file_name, 'w') as mdpa_file:
+        if num_workers > 1:
+            logger.info('Using %d processes for writing', num_workers)
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                _WriteModelPartMdpa(model_part, additional_header, write_creation_time, mdpa_file, executor)
+        else:
+            _WriteModelPartMdpa(model_part, additional_header, write_creation_time, mdpa_file)
 
     logger.info('Writing ModelPart took {0:.{1}f} [s]'.format(time.time()-start_time,2))
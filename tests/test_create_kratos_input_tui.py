@@ -12,14 +12,15 @@
 import initialize_testing_environment
 
 # python imports
-import unittest
+import unittest, os
 
 # plugin imports
 from kratos_salome_plugin import salome_utilities
+from kratos_salome_plugin.model_part import ModelPart, NodesArrayContainer
 import create_kratos_input_tui
 
 # tests imports
-from testing_utilities import SalomeTestCaseWithBox, CompareMdpaWithReferenceFile
+from testing_utilities import SalomeTestCaseWithBox, CompareMdpaWithReferenceFile, CheckIfNumpyAvailable, CheckIfH5pyAvailable, WriteMedFile
 
 
 class TestSalomeMesh(SalomeTestCaseWithBox):
@@ -171,6 +172,11 @@ class TestCreateMdpaFile(SalomeTestCaseWithBox):
 
         CompareMdpaWithReferenceFile(mdpa_file_name, self)
 
+        # writing the entities directly has to give the same file
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, streaming=True)
+
+        CompareMdpaWithReferenceFile(mdpa_file_name, self)
+
     def test_multiple_meshes(self):
         mesh_description_3D = {
             "elements" : {
@@ -208,6 +214,89 @@ class TestCreateMdpaFile(SalomeTestCaseWithBox):
 
         CompareMdpaWithReferenceFile(mdpa_file_name, self)
 
+        # writing the entities directly has to give the same file
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, streaming=True)
+
+        CompareMdpaWithReferenceFile(mdpa_file_name, self)
+
+
+@unittest.skipUnless(CheckIfNumpyAvailable(), "NumPy not available")
+class TestCreateMdpaFileFromDatFile(unittest.TestCase):
+    def test_DatMesh(self):
+        dat_file_name = "create_mdpa_dat_mesh.dat"
+        with open(dat_file_name, "w") as dat_file:
+            dat_file.write("4 3\n1 0.0 0.0 0.0\n2 1.0 0.0 0.0\n3 0.0 1.0 0.0\n4 1.0 1.0 0.0\n1 102 1 2\n2 203 1 2 3\n3 203 2 4 3\n")
+
+        meshes = [
+            create_kratos_input_tui.DatMesh(dat_file_name, {"elements" : {"Triangle" : {"Element2D3N" : 0}}}, "domain"),
+            create_kratos_input_tui.DatMesh(dat_file_name, {"conditions" : {"Edge" : {"LineCondition2D2N" : 1}}}, "domain.bottom")
+        ]
+
+        model_part = create_kratos_input_tui.CreateModelPart(meshes)
+        self.assertEqual(4, model_part.NumberOfNodes())
+        self.assertEqual(2, model_part.NumberOfElements())
+        self.assertEqual(1, model_part.NumberOfConditions())
+        self.assertEqual(4, model_part.GetSubModelPart("domain").GetSubModelPart("bottom").NumberOfNodes()) # all nodes of the file
+        self.assertIsInstance(model_part.Nodes, ModelPart.PointerVectorSet) # the entities are stored as objects by default
+
+        if CheckIfNumpyAvailable():
+            model_part_arrays = create_kratos_input_tui.CreateModelPart(meshes, use_array_storage=True)
+            self.assertIsInstance(model_part_arrays.Nodes, NodesArrayContainer)
+            GetNodes = lambda mp: [(node.Id, node.X, node.Y, node.Z) for node in mp.Nodes]
+            self.assertEqual(GetNodes(model_part), GetNodes(model_part_arrays))
+            self.assertEqual(1, model_part_arrays.GetSubModelPart("domain").GetSubModelPart("bottom").NumberOfConditions())
+
+        # writing the entities directly has to give the same file
+        mdpa_file_name = "create_mdpa_dat_mesh"
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name)
+        with open(mdpa_file_name+".mdpa") as mdpa_file:
+            mdpa_lines = [line for line in mdpa_file if not line.startswith("// File created on")]
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, streaming=True)
+        with open(mdpa_file_name+".mdpa") as mdpa_file:
+            mdpa_lines_streaming = [line for line in mdpa_file if not line.startswith("// File created on")]
+
+        self.assertEqual(mdpa_lines, mdpa_lines_streaming)
+        os.remove(mdpa_file_name+".mdpa")
+
+        # only the expected number of entities is reported, nothing is written
+        dry_run = create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, dry_run=True)
+        self.assertEqual(4, dry_run["nodes"])
+        self.assertEqual(2, dry_run["elements"])
+        self.assertEqual(1, dry_run["conditions"])
+        self.assertGreater(dry_run["memory"], 0)
+        self.assertFalse(os.path.isfile(mdpa_file_name+".mdpa"))
+
+        os.remove(dat_file_name)
+
+
+@unittest.skipUnless(CheckIfNumpyAvailable() and CheckIfH5pyAvailable(), "h5py not available")
+class TestCreateMdpaFileFromMedFile(unittest.TestCase):
+    def test_MedMesh(self):
+        med_file_name = "create_mdpa_med_mesh.med"
+        nodes = {1 : [0.0, 0.0, 0.0], 2 : [1.0, 0.0, 0.0], 3 : [0.0, 1.0, 0.0], 4 : [1.0, 1.0, 0.0]}
+        cells = {"SE2" : {1 : [1, 2]}, "TR3" : {2 : [1, 2, 3], 3 : [2, 4, 3]}}
+        WriteMedFile(med_file_name, "Mesh_1", nodes, cells, groups={"bottom" : ([], [1])})
+
+        meshes = [
+            create_kratos_input_tui.MedMesh(med_file_name, {"elements" : {"Triangle" : {"Element2D3N" : 0}}}, "domain"),
+            create_kratos_input_tui.MedMesh(med_file_name, {"conditions" : {"Edge" : {"LineCondition2D2N" : 1}}}, "domain.bottom", group_name="bottom")
+        ]
+
+        model_part = create_kratos_input_tui.CreateModelPart(meshes)
+        self.assertEqual(4, model_part.NumberOfNodes())
+        self.assertEqual(2, model_part.NumberOfElements())
+        self.assertEqual(1, model_part.NumberOfConditions())
+        smp_bottom = model_part.GetSubModelPart("domain").GetSubModelPart("bottom")
+        self.assertEqual([1, 2], list(smp_bottom.Nodes.keys()))
+        self.assertEqual([1], list(smp_bottom.Conditions.keys()))
+
+        mdpa_file_name = "create_mdpa_med_mesh"
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, streaming=True)
+        self.assertTrue(os.path.isfile(mdpa_file_name+".mdpa"))
+
+        os.remove(med_file_name)
+        os.remove(mdpa_file_name+".mdpa")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+
+# plugin imports
+from kratos_salome_plugin import dat_file_io
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+# an excerpt of a DAT file exported by Salome
+dat_file_content = '''5 3
+1 0.00000000000000e+00 0.00000000000000e+00 0.00000000000000e+00
+2 2.00000000000000e+02 0.00000000000000e+00 0.00000000000000e+00
+4 2.00000000000000e+02 2.00000000000000e+02 -1.25000000000000e+01
+3 1.23456789012345e-03 2.00000000000000e+02 0.00000000000000e+00
+7 1.00000000000000e+02 1.00000000000000e+02 2.00000000000000e+02
+1 102 1 2
+2 203 1 2 3
+3 304 1 2 3 7
+'''
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestReadDatFile(unittest.TestCase):
+    def setUp(self):
+        self.file_name = "test_dat_file_io.dat"
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write(dat_file_content)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_ReadDatFile(self):
+        (node_ids, coordinates), (element_ids, element_types, offsets, connectivities) = dat_file_io.ReadDatFile(self.file_name)
+
+        self.assertEqual([1, 2, 4, 3, 7], node_ids.tolist())
+        self.assertEqual((5, 3), coordinates.shape)
+        self.assertEqual([1, 2, 3], element_ids.tolist())
+        self.assertEqual([102, 203, 304], element_types.tolist())
+        self.assertEqual([0, 2, 5, 9], offsets.tolist())
+        self.assertEqual(9, connectivities.size)
+
+    def test_ReadNodesFromDatFile(self):
+        node_ids, coordinates = dat_file_io.ReadNodesFromDatFile(self.file_name)
+
+        self.assertEqual(np.int64, node_ids.dtype)
+        self.assertEqual([1, 2, 4, 3, 7], node_ids.tolist())
+        self.assertEqual((5, 3), coordinates.shape)
+        self.assertEqual([200.0, 200.0, -12.5], coordinates[2].tolist())
+        self.assertEqual(1.23456789012345e-03, coordinates[3,0])
+
+    def test_ReadNumberOfEntitiesFromDatFile(self):
+        self.assertEqual((5, 3), dat_file_io.ReadNumberOfEntitiesFromDatFile(self.file_name))
+
+    def test_ReadNodesFromDatFile_invalid_header(self):
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write("5\n")
+
+        with self.assertRaisesRegex(Exception, 'The header of DAT file "test_dat_file_io.dat" is not valid!'):
+            dat_file_io.ReadNodesFromDatFile(self.file_name)
+
+    def test_ReadNodesFromDatFile_missing_nodes(self):
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write("\n".join(dat_file_content.splitlines()[:3]))
+
+        with self.assertRaisesRegex(Exception, 'Reading the nodes from DAT file "test_dat_file_io.dat" failed, expected 5 nodes!'):
+            dat_file_io.ReadNodesFromDatFile(self.file_name)
+
+
+    def test_ReadElementsFromDatFile(self):
+        element_ids, element_types, offsets, connectivities = dat_file_io.ReadElementsFromDatFile(self.file_name)
+
+        self.assertEqual(np.int64, connectivities.dtype)
+        self.assertEqual([1, 2, 3], element_ids.tolist())
+        self.assertEqual([102, 203, 304], element_types.tolist())
+        self.assertEqual([0, 2, 5, 9], offsets.tolist())
+        self.assertEqual([1, 2, 1, 2, 3, 1, 2, 3, 7], connectivities.tolist())
+        self.assertEqual([1, 2, 3, 7], connectivities[offsets[2]:offsets[3]].tolist())
+
+    def test_ReadElementsFromDatFile_no_elements(self):
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write("\n".join(dat_file_content.splitlines()[:6]).replace("5 3", "5 0", 1))
+
+        element_ids, element_types, offsets, connectivities = dat_file_io.ReadElementsFromDatFile(self.file_name)
+
+        self.assertEqual(0, element_ids.size)
+        self.assertEqual(0, element_types.size)
+        self.assertEqual([0], offsets.tolist())
+        self.assertEqual(0, connectivities.size)
+
+    def test_ReadElementsFromDatFile_missing_elements(self):
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write("\n".join(dat_file_content.splitlines()[:8]))
+
+        with self.assertRaisesRegex(Exception, 'Reading the elements from DAT file "test_dat_file_io.dat" failed, expected 3 elements!'):
+            dat_file_io.ReadElementsFromDatFile(self.file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+from unittest.mock import patch
+
+# plugin imports
+from kratos_salome_plugin import dat_mesh_interface
+from kratos_salome_plugin.dat_mesh_interface import DatMeshInterface
+from kratos_salome_plugin.geometries_io import ExtractionCache
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+
+# a DAT file as exported by Salome, with Ids that are not sorted
+dat_file_content = '''5 5
+1 0.0 0.0 0.0
+2 200.0 0.0 0.0
+4 200.0 200.0 -12.5
+3 0.0 200.0 0.0
+7 100.0 100.0 200.0
+5 102 1 2
+2 102 2 3
+3 203 1 2 3
+4 304 1 2 3 7
+8 205 1 2 4 3 7
+'''
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestDatMeshInterface(unittest.TestCase):
+    def setUp(self):
+        self.file_name = "test_dat_mesh_interface.dat"
+        with open(self.file_name, "w") as dat_file:
+            dat_file.write(dat_file_content)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_GetNodes(self):
+        nodes = DatMeshInterface(self.file_name).GetNodes()
+
+        self.assertEqual([1, 2, 3, 4, 7], list(nodes.keys()))
+        self.assertEqual([200.0, 200.0, -12.5], nodes[4])
+
+    def test_GetNodesAndGeometricalEntities(self):
+        nodes, geometries = DatMeshInterface(self.file_name).GetNodesAndGeometricalEntities(["Edge", "Tetra", "Polygon", "Node"])
+
+        self.assertEqual(5, len(nodes))
+        self.assertEqual(["Edge", "Tetra", "Polygon", "Node"], list(geometries.keys()))
+        self.assertEqual({2 : [2, 3], 5 : [1, 2]}, geometries["Edge"])
+        self.assertEqual([2, 5], list(geometries["Edge"].keys()))
+        self.assertEqual({4 : [1, 2, 3, 7]}, geometries["Tetra"])
+        self.assertEqual({8 : [1, 2, 4, 3, 7]}, geometries["Polygon"])
+        self.assertEqual({1 : [1], 2 : [2], 3 : [3], 4 : [4], 7 : [7]}, geometries["Node"])
+
+    def test_GetNodesAndGeometricalEntitiesArrays(self):
+        (node_ids, coordinates), geometries = DatMeshInterface(self.file_name).GetNodesAndGeometricalEntitiesArrays(["Triangle", "Edge"])
+
+        self.assertEqual([1, 2, 3, 4, 7], node_ids.tolist())
+        self.assertEqual((5, 3), coordinates.shape)
+        self.assertEqual([0.0, 200.0, 0.0], coordinates[2].tolist())
+
+        entities_ids, connectivities = geometries["Edge"]
+        self.assertEqual([2, 5], entities_ids.tolist())
+        self.assertEqual([[2, 3], [1, 2]], connectivities.tolist())
+
+        entities_ids, connectivities = geometries["Triangle"]
+        self.assertEqual([3], entities_ids.tolist())
+        self.assertEqual((1, 3), connectivities.shape)
+
+    def test_entity_type_not_in_mesh(self):
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='WARNING') as cm:
+            nodes, geometries = DatMeshInterface(self.file_name).GetNodesAndGeometricalEntities(["Hexa"])
+
+        self.assertEqual(5, len(nodes))
+        self.assertEqual({"Hexa" : {}}, geometries)
+        self.assertEqual(cm.output, ['WARNING:kratos_salome_plugin.file_mesh_interface:Entity type "Hexa" not in Mesh "test_dat_mesh_interface"!'])
+
+    def test_extraction_cache(self):
+        mesh_interface = DatMeshInterface(self.file_name)
+        with ExtractionCache() as extraction_cache:
+            _, geometries_1 = mesh_interface.GetNodesAndGeometricalEntitiesArrays(["Edge"], extraction_cache)
+            _, geometries_2 = DatMeshInterface(self.file_name).GetNodesAndGeometricalEntitiesArrays(["Edge"], extraction_cache)
+
+            self.assertEqual(1, len(extraction_cache))
+            self.assertIs(geometries_1["Edge"][1], geometries_2["Edge"][1])
+
+    def test_GetMeshInformation(self):
+        mesh_interface = DatMeshInterface(self.file_name)
+
+        self.assertEqual({"Edge" : 2, "Triangle" : 1, "Polygon" : 1, "Tetra" : 1}, mesh_interface.GetMeshInformation())
+        self.assertEqual(["Edge", "Triangle", "Polygon", "Tetra"], mesh_interface.GetEntityTypesInMesh())
+        self.assertEqual("test_dat_mesh_interface", mesh_interface.GetMeshName())
+        self.assertEqual("DatFile", mesh_interface.GetMeshType())
+        self.assertIn("Polygon: 1", str(mesh_interface))
+
+    def test_GetNumberOfNodes_and_Geometries(self):
+        mesh_interface = DatMeshInterface(self.file_name)
+
+        self.assertEqual(5, mesh_interface.GetNumberOfNodes())
+        self.assertEqual(2, mesh_interface.GetNumberOfGeometries("Edge"))
+        self.assertEqual(1, mesh_interface.GetNumberOfGeometries("Polygon"))
+        self.assertEqual(5, mesh_interface.GetNumberOfGeometries("Node"))
+        self.assertEqual(0, mesh_interface.GetNumberOfGeometries("Hexa"))
+
+        with ExtractionCache() as extraction_cache:
+            self.assertEqual(2, DatMeshInterface(self.file_name).GetNumberOfGeometries("Edge", extraction_cache))
+            self.assertEqual(1, len(extraction_cache)) # the file is read once, also for the extraction afterwards
+
+    def test_mesh_counts_are_kept(self):
+        mesh_interface = DatMeshInterface(self.file_name)
+
+        with patch.object(dat_mesh_interface, "ReadDatFile", wraps=dat_mesh_interface.ReadDatFile) as read_mock, \
+             patch.object(dat_mesh_interface._DatMesh, "Close", autospec=True) as close_mock:
+            self.assertEqual({"Edge" : 2, "Triangle" : 1, "Polygon" : 1, "Tetra" : 1}, mesh_interface.GetMeshInformation())
+            self.assertEqual(["Edge", "Triangle", "Polygon", "Tetra"], mesh_interface.GetEntityTypesInMesh())
+            self.assertEqual(2, mesh_interface.GetNumberOfGeometries("Edge"))
+            self.assertIn("Polygon: 1", str(mesh_interface))
+
+            # the file is read once, the temporary data is closed
+            self.assertEqual(1, read_mock.call_count)
+            self.assertEqual(1, close_mock.call_count)
+
+            mesh_interface.GetNodesAndGeometricalEntitiesArrays(["Edge"])
+            self.assertEqual(2, read_mock.call_count)
+            self.assertEqual(2, close_mock.call_count)
+
+            # the file is read again after it was modified
+            with open(self.file_name, "w") as dat_file:
+                dat_file.write(dat_file_content.replace("5 5", "5 4").replace("8 205 1 2 4 3 7\n", ""))
+
+            self.assertEqual({"Edge" : 2, "Triangle" : 1, "Tetra" : 1}, mesh_interface.GetMeshInformation())
+            self.assertEqual(0, mesh_interface.GetNumberOfGeometries("Polygon"))
+            self.assertEqual(3, read_mock.call_count)
+
+    def test_non_existing_file(self):
+        mesh_interface = DatMeshInterface("not_existing.dat")
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL'):
+            self.assertFalse(mesh_interface.CheckMeshIsValid())
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL'):
+            self.assertEqual(({}, {}), mesh_interface.GetNodesAndGeometricalEntities(["Edge"]))
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL'):
+            self.assertEqual(0, mesh_interface.GetNumberOfNodes())
+            self.assertEqual(0, mesh_interface.GetNumberOfGeometries("Edge"))
+
+    def test_DoMeshesBelongToSameMainMesh(self):
+        mesh_interface = DatMeshInterface(self.file_name)
+        mesh_interface_part = DatMeshInterface(self.file_name, main_mesh_file_name=os.path.abspath(self.file_name))
+        mesh_interface_other = DatMeshInterface(self.file_name, main_mesh_file_name="other_main_mesh.dat")
+
+        self.assertTrue(DatMeshInterface.DoMeshesBelongToSameMainMesh([]))
+        self.assertTrue(DatMeshInterface.DoMeshesBelongToSameMainMesh([mesh_interface, mesh_interface_part]))
+        self.assertFalse(DatMeshInterface.DoMeshesBelongToSameMainMesh([mesh_interface, mesh_interface_other]))
+
+
+if __name__ == '__main__':
+    unittest.main()
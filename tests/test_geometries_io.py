@@ -23,26 +23,35 @@ from kratos_salome_plugin.mesh_interface import MeshInterface
 from kratos_salome_plugin import salome_utilities
 
 # tests imports
-from testing_utilities import SalomeTestCaseWithBox, CheckIfKratosAvailable
+from testing_utilities import SalomeTestCaseWithBox, CheckIfKratosAvailable, CheckIfNumpyAvailable
 
 # Kratos imports
 kratos_available = CheckIfKratosAvailable()
 if kratos_available:
     import KratosMultiphysics as KM
 
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
 
 class TestGeometriesIOWithMockMeshInterfaces:
     """This TestCase contains basic tests for the GeometriesIO where the MeshInterface is substituted by a Mock object
     """
     class BaseTests(unittest.TestCase, metaclass=ABCMeta):
+        # whether the mocks provide the nodes and geometries as arrays, see "CreateMeshInterfaceMock"
+        use_array_extraction = False
+
         @abstractmethod
         def _CreateModelPart(self, name): pass
 
+        def _CreateMeshInterfaceMock(self):
+            return CreateMeshInterfaceMock(self.use_array_extraction)
+
         def test_not_same_main_mesh(self):
             model_part = self._CreateModelPart()
             # apparently if not configuring this, it returns True
             attrs = { 'DoMeshesBelongToSameMainMesh.return_value': False }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, {})]
@@ -63,7 +72,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, {}) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, {}, model_part_name)]
@@ -96,17 +105,17 @@ class TestGeometriesIOWithMockMeshInterfaces:
 
             nodes_mesh_1 = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
             attrs_mesh_1 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_1, {}) }
-            mesh_interface_mock_mesh_1 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_1 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_1.configure_mock(**attrs_mesh_1)
 
             nodes_mesh_2 = {i+25 : [i+3.5,i-13.22,i*2] for i in range(5)}
             attrs_mesh_2 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_2, {}) }
-            mesh_interface_mock_mesh_2 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_2 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_2.configure_mock(**attrs_mesh_2)
 
             nodes_mesh_3 = {i+1 : [i+1,i*2,i+3.5] for i in range(3)} # those nodes have the same coord, hence no new nodes will be created!
             attrs_mesh_3 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_3, {}) }
-            mesh_interface_mock_mesh_3 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_3 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_3.configure_mock(**attrs_mesh_3)
 
             meshes = [
@@ -134,6 +143,30 @@ class TestGeometriesIOWithMockMeshInterfaces:
             self.__RecursiveCheckModelParts(model_part, model_part_name, CheckModelPart)
 
 
+        def test_extraction_cache_is_shared(self):
+            # the meshes added in one call share the extraction cache, it is closed afterwards
+            model_part = self._CreateModelPart()
+
+            extraction_caches = []
+            def GetNodesAndGeometricalEntities(geometrical_entity_types, extraction_cache):
+                extraction_caches.append(extraction_cache)
+                extraction_cache.GetOrCreate("0:1:2:3", MagicMock)
+                return {i+1 : [i+1,i*2,i+3.5] for i in range(5)}, {}
+
+            meshes = []
+            for model_part_name in ["", "sub_1", "sub_2"]:
+                mesh_interface_mock = self._CreateMeshInterfaceMock()
+                mesh_interface_mock.GetNodesAndGeometricalEntities.side_effect = GetNodesAndGeometricalEntities
+                meshes.append(geometries_io.Mesh(mesh_interface_mock, {}, model_part_name))
+
+            geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+            self.assertEqual(3, len(extraction_caches))
+            self.assertIsInstance(extraction_caches[0], geometries_io.ExtractionCache)
+            self.assertIs(extraction_caches[0], extraction_caches[1])
+            self.assertIs(extraction_caches[0], extraction_caches[2])
+            self.assertEqual(0, len(extraction_caches[0])) # was closed
+
         def test_add_elements_from_one_mesh_to_main_model_part(self):
             self.__ExecuteTestAddElementsFromOneMeshToModelPart("")
 
@@ -156,7 +189,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             the_geom_entities = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, model_part_name)]
@@ -204,20 +237,20 @@ class TestGeometriesIOWithMockMeshInterfaces:
             nodes_mesh_1 = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
             geometries_mesh_1 = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
             attrs_mesh_1 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_1, geometries_mesh_1) }
-            mesh_interface_mock_mesh_1 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_1 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_1.configure_mock(**attrs_mesh_1)
 
             nodes_mesh_2 = {i+1 : [i*2,i+88.5, i-1] for i in range(33,39)}
             geometries_mesh_2 = {geometry_name : {i+1 : [i+1, i+2] for i in range(33,38)}}
             attrs_mesh_2 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_2, geometries_mesh_2) }
-            mesh_interface_mock_mesh_2 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_2 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_2.configure_mock(**attrs_mesh_2)
 
             # this mesh is a subset of mesh 1, hence NO new entities should be created from this mesh!
             nodes_mesh_3 = {i+1 : [i+1,i*2,i+3.5] for i in range(5)}
             geometries_mesh_3 = {geometry_name : {i+1 : [i+1, i+2] for i in range(3)}}
             attrs_mesh_3 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_3, geometries_mesh_3) }
-            mesh_interface_mock_mesh_3 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_3 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_3.configure_mock(**attrs_mesh_3)
 
             meshes = [
@@ -293,7 +326,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             }
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, model_part.Name)]
@@ -383,11 +416,11 @@ class TestGeometriesIOWithMockMeshInterfaces:
             attrs_1D = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities_1D) }
             attrs_2D = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities_2D) }
             attrs_3D = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities_3D) }
-            mesh_interface_mock_1D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_1D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_1D.configure_mock(**attrs_1D)
-            mesh_interface_mock_2D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_2D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_2D.configure_mock(**attrs_2D)
-            mesh_interface_mock_3D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_3D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_3D.configure_mock(**attrs_3D)
 
             meshes = [
@@ -475,7 +508,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             the_geom_entities = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, model_part_name)]
@@ -523,20 +556,20 @@ class TestGeometriesIOWithMockMeshInterfaces:
             nodes_mesh_1 = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
             geometries_mesh_1 = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
             attrs_mesh_1 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_1, geometries_mesh_1) }
-            mesh_interface_mock_mesh_1 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_1 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_1.configure_mock(**attrs_mesh_1)
 
             nodes_mesh_2 = {i+1 : [i*2,i+88.5, i-1] for i in range(33,39)}
             geometries_mesh_2 = {geometry_name : {i+1 : [i+1, i+2] for i in range(33,38)}}
             attrs_mesh_2 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_2, geometries_mesh_2) }
-            mesh_interface_mock_mesh_2 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_2 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_2.configure_mock(**attrs_mesh_2)
 
             # this mesh is a subset of mesh 1, hence NO new entities should be created from this mesh!
             nodes_mesh_3 = {i+1 : [i+1,i*2,i+3.5] for i in range(5)}
             geometries_mesh_3 = {geometry_name : {i+1 : [i+1, i+2] for i in range(3)}}
             attrs_mesh_3 = { 'GetNodesAndGeometricalEntities.return_value': (nodes_mesh_3, geometries_mesh_3) }
-            mesh_interface_mock_mesh_3 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_mesh_3 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_mesh_3.configure_mock(**attrs_mesh_3)
 
             meshes = [
@@ -588,7 +621,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, {}) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, {}, sub_model_part.Name)]
@@ -606,6 +639,65 @@ class TestGeometriesIOWithMockMeshInterfaces:
 
             self.__RecursiveCheckModelParts(main_model_part, sub_model_part.Name, CheckModelPart)
 
+        def test_add_to_not_empty_modelpart(self):
+            model_part = self._CreateModelPart()
+            model_part.CreateNewNode(1, 0.0, 0.0, 0.0)
+
+            meshes = [geometries_io.Mesh(self._CreateMeshInterfaceMock(), {})]
+            with self.assertRaisesRegex(Exception, 'The Root-ModelPart "for_test" is not empty!'):
+                geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+        def test_add_meshes_incrementally(self):
+            # e.g. for combining the main meshes of the fluid and the structure, whose Ids overlap
+            model_part = self._CreateModelPart()
+
+            # existing entities with non-consecutive Ids
+            props = model_part.CreateNewProperties(1)
+            model_part.CreateNewNode(1, 0.0, 0.0, 0.0)
+            model_part.CreateNewNode(7, 1.0, 0.0, 0.0)
+            model_part.CreateNewNode(3, 0.0, 1.0, 0.0)
+            model_part.CreateNewElement("Element2D3N", 5, [1, 7, 3], props)
+            model_part.CreateNewCondition("LineCondition2D2N", 1, [1, 7], props)
+
+            the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(4)}
+            the_triangles = {i+1 : [i+1,i+2,i+3] for i in range(2)}
+            the_lines = {i+11 : [i+1,i+2] for i in range(3)}
+            attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, {"Triangle" : the_triangles, "Line" : the_lines}) }
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
+            mesh_interface_mock.configure_mock(**attrs)
+
+            mesh_description = {"elements" : {"Triangle" : {"Element2D3N" : 2}}, "conditions" : {"Line" : {"LineCondition2D2N" : 2}}}
+            meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, "structure")]
+            geometries_io.GeometriesIO.AddMeshes(model_part, meshes, incremental=True)
+
+            # the Ids of the Nodes are shifted by the largest existing Id
+            self.assertEqual(3+4, model_part.NumberOfNodes())
+            for node_id, coords in the_nodes.items():
+                node = model_part.GetNode(node_id+7)
+                self.assertAlmostEqual(coords[0], node.X)
+                self.assertAlmostEqual(coords[1], node.Y)
+                self.assertAlmostEqual(coords[2], node.Z)
+
+            # the Elements and Conditions are numbered after the existing ones
+            self.assertEqual(1+2, model_part.NumberOfElements())
+            self.assertEqual([8, 9, 10], [node.Id for node in model_part.GetElement(6).GetNodes()])
+            self.assertEqual([9, 10, 11], [node.Id for node in model_part.GetElement(7).GetNodes()])
+            self.assertEqual(1+3, model_part.NumberOfConditions())
+            self.assertEqual([8, 9], [node.Id for node in model_part.GetCondition(2).GetNodes()])
+            self.assertEqual([10, 11], [node.Id for node in model_part.GetCondition(4).GetNodes()])
+            self.assertEqual([1, 7], [node.Id for node in model_part.GetCondition(1).GetNodes()])
+
+            smp_structure = model_part.GetSubModelPart("structure")
+            self.assertEqual(4, smp_structure.NumberOfNodes())
+            self.assertEqual(2, smp_structure.NumberOfElements())
+            self.assertEqual(3, smp_structure.NumberOfConditions())
+
+            # adding more meshes continues the numbering
+            geometries_io.GeometriesIO.AddMeshes(model_part, meshes[:1], incremental=True)
+            self.assertEqual(3+4+4, model_part.NumberOfNodes())
+            self.assertEqual([12, 13, 14], [node.Id for node in model_part.GetElement(8).GetNodes()])
+            self.assertEqual(1+3+3, model_part.NumberOfConditions())
+
         def test_use_exsting_properties(self):
             # in the other tests the properties that are used for the creation of element/conditions
             # exist already. In this test the properties of the parent ModelPart are used
@@ -624,7 +716,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             the_geom_entities = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, sub_model_part.Name)]
@@ -667,10 +759,10 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (nodes, geometries) }
 
-            mesh_interface_mock_sub_mp = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_sub_mp = self._CreateMeshInterfaceMock()
             mesh_interface_mock_sub_mp.configure_mock(**attrs)
 
-            mesh_interface_mock_main_mp = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_main_mp = self._CreateMeshInterfaceMock()
             mesh_interface_mock_main_mp.configure_mock(**attrs)
 
             meshes = [
@@ -718,10 +810,10 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (nodes, geometries) }
 
-            mesh_interface_mock_sub_mp_1 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_sub_mp_1 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_sub_mp_1.configure_mock(**attrs)
 
-            mesh_interface_mock_sub_mp_2 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_sub_mp_2 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_sub_mp_2.configure_mock(**attrs)
 
             meshes = [
@@ -770,10 +862,10 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries = {geometry_name : {i+1 : [i+1, i+2] for i in range(14)}}
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (nodes, geometries) }
 
-            mesh_interface_mock_sub_mp_1 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_sub_mp_1 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_sub_mp_1.configure_mock(**attrs)
 
-            mesh_interface_mock_sub_mp_2 = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_sub_mp_2 = self._CreateMeshInterfaceMock()
             mesh_interface_mock_sub_mp_2.configure_mock(**attrs)
 
             meshes = [
@@ -806,7 +898,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
                 geometry_name_2D : {i+1 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(25)}}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, geometries) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh( mesh_interface_mock, mesh_description, smp_name)]
@@ -866,11 +958,11 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries_2D = {geometry_name_2D : {i+1 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(25)}}
 
             attrs_1D = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, geometries_1D) }
-            mesh_interface_mock_1D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_1D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_1D.configure_mock(**attrs_1D)
 
             attrs_2D = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, geometries_2D) }
-            mesh_interface_mock_2D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_2D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_2D.configure_mock(**attrs_2D)
 
             meshes = [
@@ -959,7 +1051,7 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries = {geometry_name_2D : {i+1 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(25)}}
 
             attrs = { 'GetNodesAndGeometricalEntities.return_value': (the_nodes, geometries) }
-            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock = self._CreateMeshInterfaceMock()
             mesh_interface_mock.configure_mock(**attrs)
 
             meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description, smp_name)]
@@ -1055,23 +1147,23 @@ class TestGeometriesIOWithMockMeshInterfaces:
             geometries_0D_from_Nodes = {geometry_name_0D_from_Nodes : {x: [x] for x in sorted(nodes_1D.keys())}}
 
             attrs_3D = { 'GetNodesAndGeometricalEntities.return_value': (nodes_3D, geometries_3D) }
-            mesh_interface_mock_3D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_3D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_3D.configure_mock(**attrs_3D)
 
             attrs_2D = { 'GetNodesAndGeometricalEntities.return_value': (nodes_2D, geometries_2D) }
-            mesh_interface_mock_2D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_2D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_2D.configure_mock(**attrs_2D)
 
             attrs_1D = { 'GetNodesAndGeometricalEntities.return_value': (nodes_1D, geometries_1D) }
-            mesh_interface_mock_1D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_1D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_1D.configure_mock(**attrs_1D)
 
             attrs_0D = { 'GetNodesAndGeometricalEntities.return_value': (nodes_1D, geometries_0D) }
-            mesh_interface_mock_0D = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_0D = self._CreateMeshInterfaceMock()
             mesh_interface_mock_0D.configure_mock(**attrs_0D)
 
             attrs_0D_from_nodes = { 'GetNodesAndGeometricalEntities.return_value': (nodes_1D, geometries_0D_from_Nodes) }
-            mesh_interface_mock_0D_from_nodes = MagicMock(spec=MeshInterface)
+            mesh_interface_mock_0D_from_nodes = self._CreateMeshInterfaceMock()
             mesh_interface_mock_0D_from_nodes.configure_mock(**attrs_0D_from_nodes)
 
             meshes = [
@@ -1168,6 +1260,218 @@ class TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPart(TestGeometriesIOW
     def _CreateModelPart(self, name="for_test"):
         return py_model_part.ModelPart(name)
 
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPartArrayStorage(TestGeometriesIOWithMockMeshInterfaces.BaseTests):
+    def _CreateModelPart(self, name="for_test"):
+        return py_model_part.ModelPart(name, use_array_storage=True)
+
+    def test_storage_is_preallocated(self):
+        model_part = self._CreateModelPart()
+        the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
+        the_triangles = {i+1 : [i+1,i+2,i+3] for i in range(13)}
+
+        mesh_interface_mock = CreateMeshInterfaceMockWithCounters(15, {"Triangle" : 13}, self.use_array_extraction)
+        mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (the_nodes, {"Triangle" : the_triangles})
+
+        meshes = [geometries_io.Mesh(mesh_interface_mock, {"elements" : {"Triangle" : {"Element2D3N" : 0}}, "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 0}}})]
+        geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+        # the storage was allocated once with the counts of the mesh
+        self.assertEqual(15, model_part.Nodes._ids.shape[0])
+        self.assertEqual(13, model_part.Elements._ids.shape[0])
+        self.assertEqual(13, model_part.Conditions._ids.shape[0])
+        self.assertEqual(15, model_part.NumberOfNodes())
+        self.assertEqual(13, model_part.NumberOfElements())
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPartArrayExtraction(TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPart):
+    use_array_extraction = True
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPartArrayStorageArrayExtraction(TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPartArrayStorage):
+    use_array_extraction = True
+
+    def test_nodes_and_geometries_are_not_converted(self):
+        # the arrays of the MeshInterface are used directly, the dicts are not requested
+        model_part = self._CreateModelPart()
+        mesh_interface_mock = self._CreateMeshInterfaceMock()
+        mesh_interface_mock.GetNodesAndGeometricalEntitiesArrays.side_effect = None
+        mesh_interface_mock.GetNodesAndGeometricalEntitiesArrays.return_value = (
+            (np.array([1, 2, 3, 4, 5]), np.arange(15, dtype=float).reshape(5, 3)),
+            {"Tetra" : (np.array([7, 9]), np.array([[1, 2, 3, 4], [2, 3, 4, 5]]))})
+
+        meshes = [geometries_io.Mesh(mesh_interface_mock, {"elements" : {"Tetra" : {"Element3D4N" : 0}}})]
+        geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+        mesh_interface_mock.GetNodesAndGeometricalEntities.assert_not_called()
+        self.assertEqual(5, model_part.NumberOfNodes())
+        self.assertEqual([[1, 3, 2, 4], [2, 4, 3, 5]], [[node.Id for node in element.GetNodes()] for element in model_part.Elements]) # reordered
+
+
+class TestExtractionCache(unittest.TestCase):
+    def test_GetOrCreate(self):
+        create_function = MagicMock()
+        with geometries_io.ExtractionCache() as extraction_cache:
+            entry = extraction_cache.GetOrCreate("0:1:2:3", create_function)
+            self.assertIs(entry, extraction_cache.GetOrCreate("0:1:2:3", create_function))
+            self.assertEqual(1, create_function.call_count) # created only once
+
+            extraction_cache.GetOrCreate("0:1:2:4", create_function)
+            self.assertEqual(2, create_function.call_count)
+            self.assertEqual(2, len(extraction_cache))
+
+        # the entries are closed at the end
+        self.assertEqual(0, len(extraction_cache))
+        self.assertEqual(2, entry.Close.call_count) # same mock returned for both entries
+
+
+class TestCreatedEntities(unittest.TestCase):
+    def test_Find(self):
+        created_entities = geometries_io.CreatedEntities()
+        created_entities.Add([15, 3, 8], [1, 2, 3], 5)
+        created_entities.Add([1], [4], 5)
+        self.assertEqual(4, len(created_entities))
+
+        new_positions, existing_entity_ids = created_entities.Find([1, 2, 3, 99, 15, 8], 5)
+        self.assertEqual([1, 3], list(new_positions))
+        self.assertEqual([4, 2, 1, 3], list(existing_entity_ids))
+
+        new_positions, existing_entity_ids = created_entities.Find([], 5)
+        self.assertEqual(0, len(new_positions))
+        self.assertEqual(0, len(existing_entity_ids))
+
+    def test_Find_properties_mismatch(self):
+        created_entities = geometries_io.CreatedEntities()
+        created_entities.Add([1, 2], [1, 2], 5)
+
+        # geometries from which no entities were created can use any Properties
+        new_positions, _ = created_entities.Find([3, 4], 6)
+        self.assertEqual([0, 1], list(new_positions))
+
+        with self.assertRaisesRegex(Exception, 'Mismatch in properties Ids!\nTrying to use properties with Id 6 with an existing entity that has the properties with Id 5'):
+            created_entities.Find([3, 2], 6)
+
+
+class TestReorderConnectivities(unittest.TestCase):
+    # edges of the quadratic entities, in the order of their nodes, in Salome (same as MED) and in Kratos
+    salome_edges = {
+        "Quad_Tetra" : [(0,1), (1,2), (2,0), (0,3), (1,3), (2,3)],
+        "Quad_Hexa"  : [(0,1), (1,2), (2,3), (3,0), (4,5), (5,6), (6,7), (7,4), (0,4), (1,5), (2,6), (3,7)],
+        "Quad_Penta" : [(0,1), (1,2), (2,0), (3,4), (4,5), (5,3), (0,3), (1,4), (2,5)]
+    }
+    kratos_edges = {
+        "Quad_Tetra" : [(0,1), (1,2), (2,0), (0,3), (1,3), (2,3)],
+        "Quad_Hexa"  : [(0,1), (1,2), (2,3), (3,0), (0,4), (1,5), (2,6), (3,7), (4,5), (5,6), (6,7), (7,4)],
+        "Quad_Penta" : [(0,1), (1,2), (2,0), (0,3), (1,4), (2,5), (3,4), (4,5), (5,3)]
+    }
+
+    def test_permutations(self):
+        for entity_type, permutation in geometries_io.NODE_ORDER_PERMUTATIONS.items():
+            with self.subTest(entity_type=entity_type):
+                self.assertEqual(list(range(len(permutation))), sorted(permutation))
+
+    def test_quadratic_entities(self):
+        for entity_type, linear_entity_type in [("Quad_Tetra", "Tetra"), ("Quad_Hexa", "Hexa"), ("Quad_Penta", "Penta")]:
+            with self.subTest(entity_type=entity_type):
+                num_corners = len(geometries_io.NODE_ORDER_PERMUTATIONS[linear_entity_type])
+                # the Id of a node on an edge is given by the Ids of the corners of the edge
+                def EdgeNodeId(corner_1, corner_2):
+                    return 100*min(corner_1, corner_2) + max(corner_1, corner_2)
+                corners = list(range(1, num_corners+1))
+                salome_connectivity = corners + [EdgeNodeId(corners[i], corners[j]) for i, j in self.salome_edges[entity_type]]
+
+                kratos_connectivity = geometries_io.GetReorderFunction(entity_type)(salome_connectivity)
+
+                # the corners are reordered like the ones of the linear entities
+                kratos_corners = kratos_connectivity[:num_corners]
+                self.assertEqual(geometries_io.GetReorderFunction(linear_entity_type)(corners), kratos_corners)
+                # the nodes on the edges follow the corners
+                self.assertEqual([EdgeNodeId(kratos_corners[i], kratos_corners[j]) for i, j in self.kratos_edges[entity_type]], kratos_connectivity[num_corners:])
+
+    def test_ReorderConnectivities(self):
+        connectivities = [[1, 2, 3, 4], [5, 6, 7, 8]]
+        reordered_connectivities = geometries_io.ReorderConnectivities("Tetra", connectivities)
+        self.assertEqual([[1, 3, 2, 4], [5, 7, 6, 8]], [list(conn) for conn in reordered_connectivities])
+
+        # entities that don't have to be reordered are returned as they are
+        self.assertIs(connectivities, geometries_io.ReorderConnectivities("Quadrangle", connectivities))
+        self.assertEqual([], geometries_io.ReorderConnectivities("Hexa", []))
+
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_ReorderConnectivities_array(self):
+        connectivities = np.arange(1, 8*1000+1).reshape(-1, 8)
+
+        reordered_connectivities = geometries_io.ReorderConnectivities("Hexa", connectivities)
+
+        self.assertEqual((1000, 8), reordered_connectivities.shape)
+        reorder_fct = geometries_io.GetReorderFunction("Hexa")
+        self.assertEqual([reorder_fct(conn) for conn in connectivities.tolist()], reordered_connectivities.tolist())
+
+
+class TestGeometriesIODryRun(unittest.TestCase):
+    def test_DryRun(self):
+        mesh_description_3D = {"elements" : {"Tetra" : {"Element3D4N" : 0}}}
+        mesh_description_2D = {"conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 1, "SurfaceLoad" : 2}}}
+        mesh_description_0D = {"elements" : {"Node" : {"PointMass" : 3}}}
+
+        meshes = [
+            geometries_io.Mesh(CreateMeshInterfaceMockWithCounters(100, {"Tetra" : 300, "Triangle" : 40}), mesh_description_3D),
+            geometries_io.Mesh(CreateMeshInterfaceMockWithCounters(20, {"Triangle" : 10}), mesh_description_2D),
+            geometries_io.Mesh(CreateMeshInterfaceMockWithCounters(5, {}), mesh_description_0D)
+        ]
+
+        with self.assertLogs('kratos_salome_plugin.geometries_io', level='INFO') as cm:
+            dry_run = geometries_io.GeometriesIO.DryRun(meshes)
+
+        self.assertEqual(100, dry_run["nodes"]) # the nodes are shared by the meshes
+        self.assertEqual(305, dry_run["elements"])
+        self.assertEqual(20, dry_run["conditions"]) # one condition per name
+        expected_memory  = 100 * geometries_io.MEMORY_PER_NODE
+        expected_memory += 300 * (geometries_io.MEMORY_PER_GEOMETRICAL_OBJECT + 4*geometries_io.MEMORY_PER_CONNECTIVITY_NODE)
+        expected_memory += 5 * (geometries_io.MEMORY_PER_GEOMETRICAL_OBJECT + 1*geometries_io.MEMORY_PER_CONNECTIVITY_NODE)
+        expected_memory += 20 * (geometries_io.MEMORY_PER_GEOMETRICAL_OBJECT + 3*geometries_io.MEMORY_PER_CONNECTIVITY_NODE)
+        self.assertEqual(expected_memory, dry_run["memory"])
+        self.assertIn("Adding the meshes creates 100 Nodes, 305 Elements and 20 Conditions (at most)", cm.output[0])
+
+        # the entities are not extracted
+        for mesh in meshes:
+            mesh.mesh_interface.GetNodesAndGeometricalEntities.assert_not_called()
+
+    def test_DryRun_no_meshes(self):
+        self.assertEqual({"nodes" : 0, "elements" : 0, "conditions" : 0, "memory" : 0}, geometries_io.GeometriesIO.DryRun([]))
+
+
+def CreateMeshInterfaceMock(with_arrays=False):
+    """the nodes and geometries of the mock are configured as dicts (in "GetNodesAndGeometricalEntities")
+    with_arrays -- the mock also provides them as arrays (in "GetNodesAndGeometricalEntitiesArrays"), converted from the dicts
+                   Otherwise the mock does not have "GetNodesAndGeometricalEntitiesArrays", like a MeshInterface without NumPy
+    """
+    if not with_arrays:
+        return MagicMock(spec=[name for name in dir(MeshInterface) if name != "GetNodesAndGeometricalEntitiesArrays"])
+
+    mesh_interface_mock = MagicMock(spec=MeshInterface)
+    def GetNodesAndGeometricalEntitiesArrays(geometrical_entity_types=[], extraction_cache=None):
+        nodes, geometries = mesh_interface_mock.GetNodesAndGeometricalEntities(geometrical_entity_types, extraction_cache)
+        geometries_arrays = {}
+        for entity_type, entities in geometries.items():
+            connectivities = list(entities.values())
+            if len(set(len(conn) for conn in connectivities)) == 1:
+                connectivities = np.array(connectivities, dtype=np.int64)
+            elif len(connectivities) == 0:
+                connectivities = np.empty((0, 0), dtype=np.int64)
+            geometries_arrays[entity_type] = (np.array(list(entities.keys()), dtype=np.int64), connectivities)
+        return (np.array(list(nodes.keys()), dtype=np.int64), np.array(list(nodes.values()), dtype=np.float64).reshape(-1, 3)), geometries_arrays
+    mesh_interface_mock.GetNodesAndGeometricalEntitiesArrays.side_effect = GetNodesAndGeometricalEntitiesArrays
+    return mesh_interface_mock
+
+def CreateMeshInterfaceMockWithCounters(num_nodes, num_geometries, with_arrays=False):
+    mesh_interface_mock = CreateMeshInterfaceMock(with_arrays)
+    mesh_interface_mock.GetNumberOfNodes.return_value = num_nodes
+    def GetNumberOfGeometries(geometry_type, extraction_cache=None):
+        return num_nodes if geometry_type == "Node" else num_geometries.get(geometry_type, 0)
+    mesh_interface_mock.GetNumberOfGeometries.side_effect = GetNumberOfGeometries
+    return mesh_interface_mock
+
 
 class TestGeometriesIOWithSalome(SalomeTestCaseWithBox):
     # Note: the number of nodes & geometries are hardcoded and could theoretically change with different versions of salome
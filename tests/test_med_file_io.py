@@ -0,0 +1,128 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+
+# plugin imports
+from kratos_salome_plugin import med_file_io
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable, CheckIfH5pyAvailable, WriteMedFile
+
+h5py_available = CheckIfNumpyAvailable() and CheckIfH5pyAvailable()
+
+nodes = {
+    1 : [0.0, 0.0, 0.0],
+    2 : [2.0, 0.0, 0.0],
+    4 : [2.0, 2.0, -1.5],
+    3 : [0.0, 2.0, 0.0],
+    7 : [1.0, 1.0, 2.0]
+}
+cells = {
+    "SE2" : {11 : [1, 2], 10 : [2, 4]},
+    "QU4" : {13 : [1, 2, 4, 3]},
+    "TR3" : {12 : [1, 2, 3]},
+    "TE4" : {15 : [1, 2, 3, 7]},
+    "POG" : {20 : [1, 2, 4, 3], 21 : [1, 2, 7]}
+}
+
+
+@unittest.skipUnless(h5py_available, "h5py not available")
+class TestReadMedFile(unittest.TestCase):
+    def setUp(self):
+        self.file_name = "test_med_file_io.med"
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_ReadMedFile(self):
+        WriteMedFile(self.file_name, "my_mesh", nodes, cells)
+
+        (node_ids, coordinates, node_families), geometries, groups = med_file_io.ReadMedFile(self.file_name)
+
+        self.assertEqual([1, 2, 4, 3, 7], node_ids.tolist())
+        self.assertEqual((5, 3), coordinates.shape)
+        self.assertEqual([2.0, 2.0, -1.5], coordinates[2].tolist())
+        self.assertEqual([0, 0, 0, 0, 0], node_families.tolist())
+
+        self.assertEqual(["Edge", "Triangle", "Quadrangle", "Tetra", "Polygon"], list(geometries.keys()))
+        entities_ids, connectivities, _ = geometries["Edge"]
+        self.assertEqual([11, 10], entities_ids.tolist())
+        self.assertEqual([[1, 2], [2, 4]], connectivities.tolist())
+        entities_ids, connectivities, _ = geometries["Tetra"]
+        self.assertEqual([15], entities_ids.tolist())
+        self.assertEqual([[1, 2, 3, 7]], connectivities.tolist())
+        entities_ids, connectivities, _ = geometries["Polygon"]
+        self.assertEqual([20, 21], entities_ids.tolist())
+        self.assertEqual([[1, 2, 4, 3], [1, 2, 7]], connectivities)
+
+        self.assertEqual({}, groups)
+
+    def test_ReadMedFile_2D_without_ids(self):
+        WriteMedFile(self.file_name, "my_mesh", nodes, cells, dimension=2, write_ids=False)
+
+        (node_ids, coordinates, _), geometries, _ = med_file_io.ReadMedFile(self.file_name)
+
+        self.assertEqual([1, 2, 3, 4, 5], node_ids.tolist())
+        self.assertEqual([2.0, 2.0, 0.0], coordinates[2].tolist())
+
+        # the entities are numbered consecutively, in the order of the numbers of the types in MED
+        self.assertEqual([1, 2], geometries["Edge"][0].tolist())
+        self.assertEqual([[1, 2], [2, 3]], geometries["Edge"][1].tolist())
+        self.assertEqual([3], geometries["Triangle"][0].tolist())
+        self.assertEqual([4], geometries["Quadrangle"][0].tolist())
+        self.assertEqual([5], geometries["Tetra"][0].tolist())
+        self.assertEqual([[1, 2, 4, 5]], geometries["Tetra"][1].tolist())
+        self.assertEqual([6, 7], geometries["Polygon"][0].tolist())
+
+    def test_ReadMedFile_groups(self):
+        WriteMedFile(self.file_name, "my_mesh", nodes, cells, groups={
+            "edges" : ([], [10, 11]),
+            "surface" : ([7], [11, 12]),
+            "point" : ([7], [])
+        })
+
+        (_, _, node_families), geometries, groups = med_file_io.ReadMedFile(self.file_name)
+
+        self.assertEqual(["edges", "point", "surface"], sorted(groups.keys()))
+        self.assertEqual([0, 0, 0, 0, 1], node_families.tolist())
+        self.assertEqual([1], groups["point"])
+        self.assertEqual([-2, -1], sorted(groups["edges"]))
+        self.assertEqual([-3, -1, 1], sorted(groups["surface"]))
+        self.assertEqual([-1, -2], geometries["Edge"][2].tolist())
+        self.assertEqual([-3], geometries["Triangle"][2].tolist())
+
+    def test_multiple_meshes(self):
+        WriteMedFile(self.file_name, "mesh_1", nodes, cells)
+        WriteMedFile("test_med_file_io_2.med", "mesh_2", nodes, cells)
+        # copying the second mesh to the first file
+        import h5py
+        with h5py.File(self.file_name, "a") as med_file, h5py.File("test_med_file_io_2.med", "r") as med_file_2:
+            med_file_2.copy("ENS_MAA/mesh_2", med_file["ENS_MAA"])
+        os.remove("test_med_file_io_2.med")
+
+        self.assertEqual(["mesh_1", "mesh_2"], med_file_io.GetMeshNamesInMedFile(self.file_name))
+
+        with self.assertRaisesRegex(Exception, 'MED file "test_med_file_io.med" contains 2 meshes, the name of the mesh has to be specified! Available meshes: "mesh_1", "mesh_2"'):
+            med_file_io.ReadMedFile(self.file_name)
+
+        with self.assertRaisesRegex(Exception, 'Mesh "mesh_3" is not in MED file "test_med_file_io.med"!'):
+            med_file_io.ReadMedFile(self.file_name, "mesh_3")
+
+        (node_ids, _, _), _, _ = med_file_io.ReadMedFile(self.file_name, "mesh_2")
+        self.assertEqual(5, node_ids.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+from unittest.mock import patch
+
+# plugin imports
+from kratos_salome_plugin import med_mesh_interface
+from kratos_salome_plugin.med_mesh_interface import MedMeshInterface
+from kratos_salome_plugin.geometries_io import ExtractionCache
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable, CheckIfH5pyAvailable, WriteMedFile
+
+h5py_available = CheckIfNumpyAvailable() and CheckIfH5pyAvailable()
+
+
+@unittest.skipUnless(h5py_available, "h5py not available")
+class TestMedMeshInterface(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.file_name = "test_med_mesh_interface.med"
+        nodes = {i : [float(i), 0.0, 1.0] for i in [3, 1, 2, 4, 5, 6]}
+        cells = {
+            "SE2" : {1 : [1, 2], 2 : [2, 3]},
+            "TR3" : {4 : [1, 2, 4], 3 : [2, 3, 4]},
+            "QU4" : {5 : [3, 4, 5, 6]}
+        }
+        WriteMedFile(cls.file_name, "Mesh_1", nodes, cells, groups={
+            "edge" : ([], [2]),
+            "faces" : ([], [3, 5]),
+            "corner" : ([6], [])
+        })
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.file_name)
+
+    def test_mesh(self):
+        mesh_interface = MedMeshInterface(self.file_name)
+
+        nodes, geometries = mesh_interface.GetNodesAndGeometricalEntities(["Triangle", "Quadrangle"])
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], list(nodes.keys()))
+        self.assertEqual([4.0, 0.0, 1.0], nodes[4])
+        self.assertEqual({3 : [2, 3, 4], 4 : [1, 2, 4]}, geometries["Triangle"])
+        self.assertEqual([3, 4], list(geometries["Triangle"].keys()))
+        self.assertEqual({5 : [3, 4, 5, 6]}, geometries["Quadrangle"])
+
+        self.assertEqual({"Edge" : 2, "Triangle" : 2, "Quadrangle" : 1}, mesh_interface.GetMeshInformation())
+        self.assertEqual("test_med_mesh_interface", mesh_interface.GetMeshName())
+        self.assertEqual("MedFile", mesh_interface.GetMeshType())
+
+    def test_group(self):
+        mesh_interface = MedMeshInterface(self.file_name, "faces")
+
+        (node_ids, coordinates), geometries = mesh_interface.GetNodesAndGeometricalEntitiesArrays(["Triangle", "Quadrangle", "Node"])
+
+        self.assertEqual([2, 3, 4, 5, 6], node_ids.tolist())
+        self.assertEqual((5, 3), coordinates.shape)
+        self.assertEqual([3], geometries["Triangle"][0].tolist())
+        self.assertEqual([[2, 3, 4]], geometries["Triangle"][1].tolist())
+        self.assertEqual([5], geometries["Quadrangle"][0].tolist())
+        self.assertEqual([2, 3, 4, 5, 6], geometries["Node"][0].tolist())
+
+        self.assertEqual({"Triangle" : 1, "Quadrangle" : 1}, mesh_interface.GetMeshInformation())
+        self.assertEqual("faces", mesh_interface.GetMeshName())
+        self.assertEqual("MedGroup", mesh_interface.GetMeshType())
+
+    def test_GetNumberOfNodes_and_Geometries(self):
+        mesh_interface = MedMeshInterface(self.file_name)
+        self.assertEqual(6, mesh_interface.GetNumberOfNodes())
+        self.assertEqual(2, mesh_interface.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(0, mesh_interface.GetNumberOfGeometries("Tetra"))
+
+        mesh_interface = MedMeshInterface(self.file_name, "faces")
+        self.assertEqual(5, mesh_interface.GetNumberOfNodes())
+        self.assertEqual(5, mesh_interface.GetNumberOfGeometries("Node"))
+        self.assertEqual(1, mesh_interface.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(0, mesh_interface.GetNumberOfGeometries("Edge"))
+
+    def test_mesh_counts_are_kept(self):
+        mesh_interface = MedMeshInterface(self.file_name, "faces")
+
+        with patch.object(med_mesh_interface, "ReadMedFile", wraps=med_mesh_interface.ReadMedFile) as read_mock, \
+             patch.object(med_mesh_interface._MedMeshGroup, "Close", autospec=True) as close_mock:
+            self.assertEqual({"Triangle" : 1, "Quadrangle" : 1}, mesh_interface.GetMeshInformation())
+            self.assertEqual(["Triangle", "Quadrangle"], mesh_interface.GetEntityTypesInMesh())
+            self.assertEqual(5, mesh_interface.GetNumberOfNodes())
+            self.assertEqual(1, mesh_interface.GetNumberOfGeometries("Quadrangle"))
+            self.assertIn("Quadrangle: 1", str(mesh_interface))
+
+            # the file is read once, the temporary data is closed
+            self.assertEqual(1, read_mock.call_count)
+            self.assertEqual(1, close_mock.call_count)
+
+    def test_group_of_nodes(self):
+        nodes, geometries = MedMeshInterface(self.file_name, "corner").GetNodesAndGeometricalEntities(["Node"])
+
+        self.assertEqual({6 : [6.0, 0.0, 1.0]}, nodes)
+        self.assertEqual({"Node" : {6 : [6]}}, geometries)
+
+    def test_entity_type_not_in_group(self):
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='WARNING') as cm:
+            nodes, geometries = MedMeshInterface(self.file_name, "edge").GetNodesAndGeometricalEntities(["Edge", "Triangle"])
+
+        self.assertEqual([2, 3], list(nodes.keys()))
+        self.assertEqual({"Edge" : {2 : [2, 3]}, "Triangle" : {}}, geometries)
+        self.assertEqual(cm.output, ['WARNING:kratos_salome_plugin.file_mesh_interface:Entity type "Triangle" not in Mesh "edge"!'])
+
+    def test_non_existing_group(self):
+        with self.assertRaisesRegex(Exception, 'Group "abc" is not in the mesh of MED file "test_med_mesh_interface.med"! Available groups: "corner", "edge", "faces"'):
+            MedMeshInterface(self.file_name, "abc").GetNodes()
+
+    def test_extraction_cache(self):
+        with ExtractionCache() as extraction_cache:
+            _, geometries_1 = MedMeshInterface(self.file_name, "faces").GetNodesAndGeometricalEntitiesArrays(["Triangle"], extraction_cache)
+            _, geometries_2 = MedMeshInterface(self.file_name, "faces").GetNodesAndGeometricalEntitiesArrays(["Triangle"], extraction_cache)
+            MedMeshInterface(self.file_name, "edge").GetNodesAndGeometricalEntitiesArrays(["Edge"], extraction_cache)
+
+            # the file is read once, the groups are selected once
+            self.assertEqual(3, len(extraction_cache))
+            self.assertIs(geometries_1["Triangle"][1], geometries_2["Triangle"][1])
+
+    def test_DoMeshesBelongToSameMainMesh(self):
+        mesh_interfaces = [MedMeshInterface(self.file_name), MedMeshInterface(self.file_name, "faces"), MedMeshInterface(self.file_name, "edge")]
+
+        self.assertTrue(MedMeshInterface.DoMeshesBelongToSameMainMesh(mesh_interfaces))
+        self.assertFalse(MedMeshInterface.DoMeshesBelongToSameMainMesh(mesh_interfaces+[MedMeshInterface(self.file_name, mesh_name="Mesh_2")]))
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL'):
+            self.assertFalse(MedMeshInterface.DoMeshesBelongToSameMainMesh(mesh_interfaces+[MedMeshInterface("not_existing.med")]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+from shutil import rmtree
+
+# plugin imports
+from kratos_salome_plugin.mesh_disk_cache import MeshDiskCache, GetFingerprint
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+def CreateNodesAndGeometries(num_nodes):
+    node_ids = np.arange(1, num_nodes+1, dtype=np.int64)
+    coordinates = np.arange(3*num_nodes, dtype=np.float64).reshape(num_nodes, 3) / 7.0
+    geometries = {
+        "Triangle" : (np.array([4, 7]), np.array([[1, 2, 3], [2, 3, 1]])),
+        "Polygon" : (np.array([9, 11]), [[1, 2, 3, 4], [2, 3, 4]]),
+        "Hexa" : (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.int64))
+    }
+    return (node_ids, coordinates), geometries
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestMeshDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_directory = "test_mesh_disk_cache"
+
+    def tearDown(self):
+        rmtree(self.cache_directory, ignore_errors=True)
+
+    def test_Store_Load(self):
+        disk_cache = MeshDiskCache(self.cache_directory)
+        self.assertIsNone(disk_cache.Load("abc"))
+        self.assertEqual(0, len(disk_cache))
+
+        disk_cache.Store("abc", CreateNodesAndGeometries(10))
+
+        (node_ids, coordinates), geometries = disk_cache.Load("abc")
+        (exp_node_ids, exp_coordinates), exp_geometries = CreateNodesAndGeometries(10)
+        self.assertEqual(exp_node_ids.tolist(), node_ids.tolist())
+        self.assertEqual(exp_coordinates.tolist(), coordinates.tolist())
+        self.assertEqual(["Triangle", "Polygon", "Hexa"], list(geometries.keys()))
+        self.assertEqual([4, 7], geometries["Triangle"][0].tolist())
+        self.assertEqual([[1, 2, 3], [2, 3, 1]], geometries["Triangle"][1].tolist())
+        self.assertEqual([[1, 2, 3, 4], [2, 3, 4]], geometries["Polygon"][1])
+        self.assertEqual((0, 0), geometries["Hexa"][1].shape)
+
+        self.assertEqual(1, len(disk_cache))
+        disk_cache.Clear()
+        self.assertEqual(0, len(disk_cache))
+
+    def test_least_recently_used_entries_are_removed(self):
+        disk_cache = MeshDiskCache(self.cache_directory)
+        disk_cache.Store("first", CreateNodesAndGeometries(100))
+        entry_size = disk_cache.GetSize()
+
+        disk_cache.max_size = 2*entry_size
+        disk_cache.Store("second", CreateNodesAndGeometries(100))
+        os.utime(os.path.join(self.cache_directory, "first.npz"), ns=(1, 1))
+        os.utime(os.path.join(self.cache_directory, "second.npz"), ns=(2, 2))
+        disk_cache.Load("first") # now "second" is the least recently used one
+
+        disk_cache.Store("third", CreateNodesAndGeometries(100))
+
+        self.assertEqual(2, len(disk_cache))
+        self.assertLessEqual(disk_cache.GetSize(), disk_cache.max_size)
+        self.assertIsNotNone(disk_cache.Load("first"))
+        self.assertIsNone(disk_cache.Load("second"))
+        self.assertIsNotNone(disk_cache.Load("third"))
+
+    def test_invalid_file(self):
+        disk_cache = MeshDiskCache(self.cache_directory)
+        disk_cache.Store("abc", CreateNodesAndGeometries(10))
+        with open(os.path.join(self.cache_directory, "abc.npz"), "w") as cache_file:
+            cache_file.write("not a cache file")
+
+        with self.assertLogs('kratos_salome_plugin.mesh_disk_cache', level='WARNING'):
+            self.assertIsNone(disk_cache.Load("abc"))
+
+        self.assertEqual(0, len(disk_cache))
+
+    def test_GetFingerprint(self):
+        fingerprint = GetFingerprint("0:1:2:3", [("Entity_Tetra", 12)], np.array([1, 2, 3]))
+
+        self.assertEqual(fingerprint, GetFingerprint("0:1:2:3", [("Entity_Tetra", 12)], np.array([1, 2, 3])))
+        self.assertNotEqual(fingerprint, GetFingerprint("0:1:2:3", [("Entity_Tetra", 13)], np.array([1, 2, 3])))
+        self.assertNotEqual(fingerprint, GetFingerprint("0:1:2:3", [("Entity_Tetra", 12)], np.array([1, 2, 4])))
+        self.assertNotEqual(fingerprint, GetFingerprint("0:1:2:3", [("Entity_Tetra", 12)], np.array([1.0, 2.0, 3.0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
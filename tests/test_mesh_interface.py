@@ -12,11 +12,18 @@
 import initialize_testing_environment
 
 # python imports
-import unittest
+import unittest, weakref
+from shutil import rmtree
+from unittest.mock import patch, MagicMock
+from contextlib import ExitStack
 
 # plugin imports
+from kratos_salome_plugin import mesh_interface
+from kratos_salome_plugin import geometries_io
 from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin.mesh_disk_cache import MeshDiskCache
 from kratos_salome_plugin import salome_utilities
+from kratos_salome_plugin import salome_study_utilities
 
 # tests imports
 import testing_utilities
@@ -25,11 +32,562 @@ import testing_utilities
 import SMESH
 
 
+numpy_available = testing_utilities.CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+def PatchSalome(salome_mesh, entities_ids={}):
+    # the stand-in is used as a MeshProxy, with the entity types of "entities_ids" in the mesh
+    def GetEntitiesIds(mesh_interface_self, current_mesh, entity_type):
+        return salome_mesh, list(entities_ids[entity_type])
+
+    patcher = ExitStack()
+    patcher.enter_context(patch.object(MeshInterface, 'CheckMeshIsValid', return_value=True))
+    patcher.enter_context(patch.object(MeshInterface, 'GetMeshName', return_value="stand_in"))
+    patcher.enter_context(patch.object(MeshInterface, 'GetMeshType', return_value="MeshProxy"))
+    patcher.enter_context(patch.object(MeshInterface, 'GetEntityTypesInMesh', return_value=list(entities_ids.keys())))
+    patcher.enter_context(patch.object(MeshInterface, '_MeshInterface__GetEntitiesIds', GetEntitiesIds))
+    patcher.enter_context(patch('kratos_salome_plugin.salome_utilities.GetSalomeObject', return_value=salome_mesh))
+    patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsSubMeshProxy', return_value=False))
+    patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsMeshGroup', return_value=False))
+    patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeFromString', side_effect=lambda entity_type: entity_type))
+    patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeToString', side_effect=lambda entity_type: entity_type))
+    return patcher
+
+
 class TestMeshInterfaceObservers(unittest.TestCase):
     def test_observers(self):
         self.skipTest("This test is not yet implemented")
 
 
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestMeshInterfaceBulkExtraction(unittest.TestCase):
+    """The mesh is extracted through exported files, using a stand-in for the mesh of Salome"""
+
+    def setUp(self):
+        self.nodes = {i : [i*1.5, -i/3.0, 100.0+i**1.5] for i in [5, 2, 9, 17, 3, 11, 4]}
+        self.tetras = {i : [5, 2, 9, i] for i in [21, 23, 25, 26]}
+        self.triangles = {i : [17, 3, i-20] for i in [22, 24, 31]}
+        self.elements = dict(self.tetras)
+        self.elements.update(self.triangles)
+
+    def test_GetNodeCoordinates(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            node_ids, coordinates = mesh_interface._GetNodeCoordinates(salome_mesh, salome_mesh.GetNodesId(), dat_export)
+
+        self.__CheckNodes(node_ids, coordinates)
+
+        # only one export and the checks of some nodes
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertLessEqual(salome_mesh.num_calls["GetNodeXYZ"], 3)
+
+    def test_GetNodeCoordinates_renumbered_export(self):
+        # if the export changes the Ids then the nodes are requested separately
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, renumber_in_export=True)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            node_ids, coordinates = mesh_interface._GetNodeCoordinates(salome_mesh, salome_mesh.GetNodesId(), dat_export)
+
+        self.__CheckNodes(node_ids, coordinates)
+        self.assertEqual(len(self.nodes), salome_mesh.num_calls["GetNodeXYZ"])
+
+    def test_GetNodeCoordinates_empty(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn({})
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            node_ids, coordinates = mesh_interface._GetNodeCoordinates(salome_mesh, [], dat_export)
+
+        self.assertEqual(0, node_ids.size)
+        self.assertEqual((0, 3), coordinates.shape)
+        self.assertEqual(0, salome_mesh.num_calls["ExportPartToDAT"])
+
+    def test_GetConnectivities(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            tetra_ids, tetra_connectivities = mesh_interface._GetConnectivities(salome_mesh, list(self.tetras.keys()), dat_export)
+            triangle_ids, triangle_connectivities = mesh_interface._GetConnectivities(salome_mesh, list(self.triangles.keys()), dat_export)
+
+        self.assertEqual(sorted(self.tetras.keys()), tetra_ids.tolist())
+        self.assertEqual((len(self.tetras), 4), tetra_connectivities.shape)
+        self.assertEqual([self.tetras[i] for i in sorted(self.tetras.keys())], tetra_connectivities.tolist())
+
+        self.assertEqual(sorted(self.triangles.keys()), triangle_ids.tolist())
+        self.assertEqual([self.triangles[i] for i in sorted(self.triangles.keys())], triangle_connectivities.tolist())
+
+        # the mesh is exported once for all entity types
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertLessEqual(salome_mesh.num_calls["GetElemNodes"], 6)
+
+    def test_GetConnectivities_renumbered_export(self):
+        # if the export changes the Ids then the connectivities are requested separately
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements, renumber_in_export=True)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            tetra_ids, tetra_connectivities = mesh_interface._GetConnectivities(salome_mesh, list(self.tetras.keys()), dat_export)
+
+        self.assertEqual(sorted(self.tetras.keys()), tetra_ids.tolist())
+        self.assertEqual([self.tetras[i] for i in sorted(self.tetras.keys())], tetra_connectivities.tolist())
+        self.assertEqual(len(self.tetras), salome_mesh.num_calls["GetElemNodes"])
+
+    def test_GetConnectivities_missing_in_export(self):
+        # if entities are not in the exported file then the connectivities are requested separately
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+        salome_mesh_with_triangles = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export:
+            triangle_ids, triangle_connectivities = mesh_interface._GetConnectivities(salome_mesh_with_triangles, list(self.triangles.keys()), dat_export)
+
+        self.assertEqual([self.triangles[i] for i in sorted(self.triangles.keys())], triangle_connectivities.tolist())
+        self.assertEqual(len(self.triangles), salome_mesh_with_triangles.num_calls["GetElemNodes"])
+
+    def test_GetConnectivities_concurrent_requests(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements, renumber_in_export=True)
+
+        with mesh_interface._DatExport(salome_mesh, salome_mesh) as dat_export, mesh_interface._EntitiesRequests(3, 2) as requests:
+            node_ids, coordinates = mesh_interface._GetNodeCoordinates(salome_mesh, salome_mesh.GetNodesId(), dat_export, requests)
+            tetra_ids, tetra_connectivities = mesh_interface._GetConnectivities(salome_mesh, list(self.tetras.keys()), dat_export, requests)
+
+        self.__CheckNodes(node_ids, coordinates)
+        self.assertEqual([self.tetras[i] for i in sorted(self.tetras.keys())], tetra_connectivities.tolist())
+
+    def test_GetNodes(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes)
+
+        with PatchSalome(salome_mesh):
+            nodes = MeshInterface("0:1:2:3").GetNodes()
+
+        self.assertEqual(sorted(self.nodes.keys()), list(nodes.keys()))
+        self.__CheckNodes(list(nodes.keys()), list(nodes.values()))
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+
+    def test_GetNodesAndGeometricalEntities(self):
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements)
+
+        with PatchSalome(salome_mesh, {"Tetra" : self.tetras.keys(), "Triangle" : self.triangles.keys()}):
+            nodes, geometries = MeshInterface("0:1:2:3").GetNodesAndGeometricalEntities(["Tetra", "Triangle", "Node", "Hexa"])
+
+        self.__CheckNodes(list(nodes.keys()), list(nodes.values()))
+        self.assertEqual(["Tetra", "Triangle", "Node", "Hexa"], list(geometries.keys()))
+        self.assertEqual({i : self.tetras[i] for i in sorted(self.tetras.keys())}, geometries["Tetra"])
+        self.assertEqual({i : self.triangles[i] for i in sorted(self.triangles.keys())}, geometries["Triangle"])
+        self.assertEqual({i : [i] for i in sorted(self.nodes.keys())}, geometries["Node"])
+        self.assertEqual({}, geometries["Hexa"]) # not in the mesh
+
+        # nodes and geometries are extracted with one export
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+
+    def test_GetNodesAndGeometricalEntitiesArrays_extraction_cache(self):
+        # the main mesh is extracted once, the entities of the submesh are selected from it
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.elements)
+        sub_mesh = object()
+        sub_mesh_node_ids = [17, 3, 11, 2]
+        sub_mesh_entities_ids = {"Triangle" : [31, 22], "Tetra" : [26]}
+
+        def GetMainMeshAndNodeIds(mesh):
+            return salome_mesh, sub_mesh_node_ids if mesh is sub_mesh else salome_mesh.GetNodesId()
+
+        def GetEntitiesIds(mesh_interface_self, current_mesh, entity_type):
+            if current_mesh is sub_mesh:
+                return salome_mesh, sub_mesh_entities_ids[entity_type]
+            return salome_mesh, list({"Tetra" : self.tetras, "Triangle" : self.triangles}[entity_type].keys())
+
+        with PatchSalome(salome_mesh, {"Tetra" : [], "Triangle" : []}), \
+             patch.object(MeshInterface, '_MeshInterface__GetEntitiesIds', GetEntitiesIds), \
+             patch('kratos_salome_plugin.mesh_interface._GetMainMeshAndNodeIds', side_effect=GetMainMeshAndNodeIds), \
+             patch('kratos_salome_plugin.salome_utilities.GetSalomeID', return_value="0:1:2:3"), \
+             patch('kratos_salome_plugin.salome_utilities.GetSalomeObject', side_effect=lambda identifier: sub_mesh if identifier == "0:1:2:3:5" else salome_mesh):
+
+            with geometries_io.ExtractionCache() as extraction_cache:
+                (node_ids, coordinates), geometries = MeshInterface("0:1:2:3").GetNodesAndGeometricalEntitiesArrays(["Tetra"], extraction_cache)
+                (sub_node_ids, sub_coordinates), sub_geometries = MeshInterface("0:1:2:3:5").GetNodesAndGeometricalEntitiesArrays(["Triangle", "Tetra", "Node"], extraction_cache)
+
+                self.assertEqual(1, len(extraction_cache)) # both meshes belong to the same main mesh
+
+        self.__CheckNodes(node_ids, coordinates)
+        self.assertEqual([self.tetras[i] for i in sorted(self.tetras.keys())], geometries["Tetra"][1].tolist())
+
+        self.assertEqual(sorted(sub_mesh_node_ids), sub_node_ids.tolist())
+        for node_id, coords in zip(sorted(sub_mesh_node_ids), sub_coordinates):
+            for exp_coord, coord in zip(self.nodes[node_id], coords):
+                self.assertAlmostEqual(exp_coord, coord, 12)
+        self.assertEqual(["Triangle", "Tetra", "Node"], list(sub_geometries.keys()))
+        self.assertEqual([22, 31], sub_geometries["Triangle"][0].tolist())
+        self.assertEqual([self.triangles[22], self.triangles[31]], sub_geometries["Triangle"][1].tolist())
+        self.assertEqual([26], sub_geometries["Tetra"][0].tolist())
+        self.assertEqual([self.tetras[26]], sub_geometries["Tetra"][1].tolist())
+        self.assertEqual(sorted(sub_mesh_node_ids), sub_geometries["Node"][0].tolist())
+
+        # everything was extracted with one export
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+
+    def test_GetNodesAndGeometricalEntitiesArrays_disk_cache(self):
+        cache_directory = "test_mesh_interface_disk_cache"
+        self.addCleanup(rmtree, cache_directory, ignore_errors=True)
+        disk_cache = MeshDiskCache(cache_directory)
+
+        def GetNodesAndGeometries(salome_mesh, mesh_information={"Entity_Tetra" : 4}):
+            with PatchSalome(salome_mesh, {"Tetra" : self.tetras.keys()}), \
+                 patch.object(MeshInterface, 'GetMeshInformation', return_value=mesh_information):
+                return MeshInterface("0:1:2:3", disk_cache=disk_cache).GetNodesAndGeometricalEntitiesArrays(["Tetra"])
+
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+        (node_ids, coordinates), geometries = GetNodesAndGeometries(salome_mesh)
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertEqual(1, len(disk_cache))
+
+        # the mesh did not change, hence it is loaded from the cache, only some nodes are requested for the fingerprint
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+        (cached_node_ids, cached_coordinates), cached_geometries = GetNodesAndGeometries(salome_mesh)
+        self.assertEqual(0, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertEqual(0, salome_mesh.num_calls["GetElemNodes"])
+        self.assertLessEqual(salome_mesh.num_calls["GetNodeXYZ"], mesh_interface.FINGERPRINT_NUM_SAMPLES)
+
+        self.assertEqual(node_ids.tolist(), cached_node_ids.tolist())
+        self.assertEqual(coordinates.tolist(), cached_coordinates.tolist())
+        self.assertEqual(["Tetra"], list(cached_geometries.keys()))
+        self.assertEqual(geometries["Tetra"][0].tolist(), cached_geometries["Tetra"][0].tolist())
+        self.assertEqual(geometries["Tetra"][1].tolist(), cached_geometries["Tetra"][1].tolist())
+
+        # the mesh changed, hence it is extracted again
+        moved_nodes = {node_id : [x+1.0, y, z] for node_id, (x, y, z) in self.nodes.items()}
+        salome_mesh = testing_utilities.SalomeMeshStandIn(moved_nodes, self.tetras)
+        (_, moved_coordinates), _ = GetNodesAndGeometries(salome_mesh)
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertAlmostEqual(coordinates[0,0]+1.0, moved_coordinates[0,0], 12)
+
+        salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+        GetNodesAndGeometries(salome_mesh, {"Entity_Tetra" : 4, "Entity_Triangle" : 3})
+        self.assertEqual(1, salome_mesh.num_calls["ExportPartToDAT"])
+        self.assertEqual(3, len(disk_cache))
+
+    def test_SelectEntities(self):
+        ids = np.array([2, 5, 7, 11])
+        values = np.array([[2, 0], [5, 0], [7, 0], [11, 0]])
+        selected_ids, selected_values = mesh_interface._SelectEntities((ids, values), [12, 7, 1, 2, 7])
+        self.assertEqual([2, 7], selected_ids.tolist())
+        self.assertEqual([[2, 0], [7, 0]], selected_values.tolist())
+
+        # entities with a varying number of nodes
+        selected_ids, selected_values = mesh_interface._SelectEntities((ids, [[2], [5, 5], [7], [11, 11, 11]]), [11, 5])
+        self.assertEqual([5, 11], selected_ids.tolist())
+        self.assertEqual([[5, 5], [11, 11, 11]], selected_values)
+
+        selected_ids, selected_values = mesh_interface._SelectEntities((np.empty(0, dtype=np.int64), np.empty((0, 3))), [1, 2])
+        self.assertEqual(0, selected_ids.size)
+        self.assertEqual((0, 3), selected_values.shape)
+
+    def __CheckNodes(self, node_ids, coordinates):
+        self.assertEqual(sorted(self.nodes.keys()), list(node_ids))
+        self.assertEqual(len(self.nodes), len(coordinates))
+        for node_id, coords in zip(node_ids, coordinates):
+            for exp_coord, coord in zip(self.nodes[node_id], coords):
+                self.assertAlmostEqual(exp_coord, coord, 12)
+
+
+class TestMeshInterfaceConcurrentRequests(unittest.TestCase):
+    """The entities are requested separately from Salome (as done without NumPy), using a pool of threads"""
+
+    def setUp(self):
+        self.nodes = {i : [i*1.5, -i/3.0, 100.0+i] for i in range(1, 50, 2)}
+        self.tetras = {i : [1, 3, 5, i] for i in range(101, 140)}
+        self.salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+
+    def test_EntitiesRequests(self):
+        ids = list(range(20, 0, -1))
+        for num_workers, chunk_size in [(1, 1000), (4, 3), (2, 1), (3, 100)]:
+            with mesh_interface._EntitiesRequests(num_workers, chunk_size) as requests:
+                requested = requests.Submit(lambda i: 2*i, ids)
+                self.assertEqual([2*i for i in ids], requested.Results()) # the order of the Ids is kept
+                self.assertEqual([], requests.Submit(lambda i: 2*i, []).Results())
+
+    def test_EntitiesRequests_invalid_input(self):
+        with self.assertRaisesRegex(Exception, 'The number of workers has to be at least 1, got 0!'):
+            mesh_interface._EntitiesRequests(0)
+        with self.assertRaisesRegex(Exception, 'The chunk size has to be at least 1, got 0!'):
+            mesh_interface._EntitiesRequests(2, 0)
+
+    def test_EntitiesRequests_exception(self):
+        def Request(i):
+            if i == 7:
+                raise Exception("request failed")
+            return i
+
+        with mesh_interface._EntitiesRequests(2, 2) as requests:
+            requested = requests.Submit(Request, list(range(10)))
+            with self.assertRaisesRegex(Exception, 'request failed'):
+                requested.Results()
+
+    def test_GetNodesAndGeometricalEntities(self):
+        exp_tetras = {i : self.tetras[i] for i in sorted(self.tetras.keys())}
+        for num_workers, chunk_size in [(1, 1000), (4, 5)]:
+            salome_mesh = testing_utilities.SalomeMeshStandIn(self.nodes, self.tetras)
+            with PatchSalome(salome_mesh, {"Tetra" : self.tetras.keys()}), patch.object(mesh_interface, 'numpy_available', False):
+                nodes, geometries = MeshInterface("0:1:2:3", num_workers, chunk_size).GetNodesAndGeometricalEntities(["Node", "Tetra", "Hexa"])
+
+            self.assertEqual(sorted(self.nodes.keys()), list(nodes.keys()))
+            self.assertEqual(self.nodes, nodes)
+            self.assertEqual(["Node", "Tetra", "Hexa"], list(geometries.keys()))
+            self.assertEqual({i : [i] for i in sorted(self.nodes.keys())}, geometries["Node"])
+            self.assertEqual(list(exp_tetras.items()), list(geometries["Tetra"].items())) # also checking the order
+            self.assertEqual({}, geometries["Hexa"])
+
+            # every entity is requested once
+            self.assertEqual(len(self.nodes), salome_mesh.num_calls["GetNodeXYZ"])
+            self.assertEqual(len(self.tetras), salome_mesh.num_calls["GetElemNodes"])
+            self.assertEqual(0, salome_mesh.num_calls["ExportPartToDAT"])
+
+    def test_GetNodes(self):
+        with PatchSalome(self.salome_mesh), patch.object(mesh_interface, 'numpy_available', False):
+            nodes = MeshInterface("0:1:2:3", num_workers=3, chunk_size=4).GetNodes()
+
+        self.assertEqual(self.nodes, nodes)
+        self.assertEqual(sorted(self.nodes.keys()), list(nodes.keys()))
+
+
+class TestMeshInterfaceSubMeshEntities(unittest.TestCase):
+    """The entities of a submesh are determined with one geometrical query for all entity types"""
+
+    def setUp(self):
+        self.ids_of_types = {"Triangle" : [1, 2, 3, 4, 5], "Edge" : [6, 7, 8, 9], "0D" : [10, 11]}
+        self.sub_mesh_ids = [11, 2, 4, 9, 7, 5] # ids of all entities that belong to the geometry of the submesh
+
+        self.smesh_mock = MagicMock()
+        self.main_mesh = self.smesh_mock.Mesh.return_value
+        self.main_mesh.GetIdsFromFilter.return_value = self.sub_mesh_ids
+        self.entities_source = self.main_mesh.GetIDSource.return_value
+
+        def GetFilter(elem_type, functor, *args):
+            # the filters of the entity types select among the entities of the source (the server side filtering)
+            entities_filter = MagicMock()
+            if len(args) == 2:
+                entity_type = args[1]
+                entities_filter.GetElementsIdFromParts.side_effect = lambda sources: [i for i in self.sub_mesh_ids if sources == [self.entities_source] and i in self.ids_of_types[entity_type]]
+            return entities_filter
+
+        self.patcher = ExitStack()
+        self.patcher.enter_context(patch.object(mesh_interface, 'smesh', self.smesh_mock))
+        self.smesh_mock.GetFilter.side_effect = GetFilter
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsSubMeshProxy', return_value=True))
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeToString', side_effect=lambda entity_type: entity_type))
+
+    def tearDown(self):
+        self.patcher.close()
+
+    def test_one_geometrical_query(self):
+        entities_ids_by_type = MeshInterface("0:1:2:3")._MeshInterface__GetEntitiesIdsByType(MagicMock(), ["Triangle", "Node", "Edge", "0D", "Hexa"], ["Triangle", "Edge", "0D", "Node"])
+
+        self.assertEqual(["Triangle", "Edge", "0D"], list(entities_ids_by_type.keys()))
+        self.assertEqual([2, 4, 5], sorted(entities_ids_by_type["Triangle"][1]))
+        self.assertEqual([7, 9], sorted(entities_ids_by_type["Edge"][1]))
+        self.assertEqual([11], entities_ids_by_type["0D"][1])
+        for main_mesh, _ in entities_ids_by_type.values():
+            self.assertIs(self.main_mesh, main_mesh)
+
+        self.assertEqual(1, self.main_mesh.GetIdsFromFilter.call_count)
+        self.assertEqual(0, self.smesh_mock.GetCriterion.call_count)
+
+        # the entity types are filtered only among the entities of the submesh, no Ids of the main mesh are requested
+        self.main_mesh.GetIDSource.assert_called_once_with(self.sub_mesh_ids, mesh_interface.SMESH.ALL)
+        self.assertEqual(1 + 3, self.smesh_mock.GetFilter.call_count)
+        self.assertEqual(1, self.entities_source.UnRegister.call_count)
+
+    def test_mesh_group(self):
+        # groups can contain entities of different types, they are filtered among the entities of the group
+        mesh_group = MagicMock()
+        self.entities_source = mesh_group
+        with patch('kratos_salome_plugin.salome_mesh_utilities.IsSubMeshProxy', return_value=False), \
+             patch('kratos_salome_plugin.salome_mesh_utilities.IsMeshGroup', return_value=True):
+            entities_ids_by_type = MeshInterface("0:1:2:3")._MeshInterface__GetEntitiesIdsByType(mesh_group, ["Triangle", "Edge"], ["Triangle", "Edge"])
+
+        self.assertEqual([2, 4, 5], sorted(entities_ids_by_type["Triangle"][1]))
+        self.assertEqual([7, 9], sorted(entities_ids_by_type["Edge"][1]))
+        for main_mesh, _ in entities_ids_by_type.values():
+            self.assertIs(mesh_group.GetMesh.return_value, main_mesh)
+        self.assertEqual(0, mesh_group.GetListOfID.call_count)
+
+    def test_one_entity_type(self):
+        # with only one entity type the combined filter is used
+        entities_ids_by_type = MeshInterface("0:1:2:3")._MeshInterface__GetEntitiesIdsByType(MagicMock(), ["Edge", "Hexa"], ["Triangle", "Edge"])
+
+        self.assertEqual(["Edge"], list(entities_ids_by_type.keys()))
+        self.assertEqual(1, self.main_mesh.GetIdsFromFilter.call_count)
+        self.assertEqual(2, self.smesh_mock.GetCriterion.call_count)
+
+
+class TestMeshInterfaceObjectResolution(unittest.TestCase):
+    """The object of the mesh is resolved from the study once and cached"""
+
+    class MeshObject:
+        pass
+
+    def setUp(self):
+        self.obj_ref = MagicMock()
+        self.obj_ref.GetObject.side_effect = lambda: self.MeshObject() # like in Salome, every lookup returns a new proxy
+        self.obj_ref.GetName.return_value = "my_mesh"
+
+        self.patcher = ExitStack()
+        self.get_obj_ref_mock = self.patcher.enter_context(patch('kratos_salome_plugin.salome_utilities.GetSalomeObjectReference', return_value=self.obj_ref))
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsSubMeshProxy', return_value=False))
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsMeshGroup', return_value=True))
+        self.get_mesh_info_mock = self.patcher.enter_context(patch.object(mesh_interface.smesh, 'GetMeshInfo', return_value={"Entity_Triangle" : 5, "Entity_Edge" : 0}))
+
+    def tearDown(self):
+        self.patcher.close()
+
+    def test_object_is_resolved_once(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+
+        for _ in range(3):
+            self.assertTrue(mesh_interface_obj.CheckMeshIsValid())
+            self.assertEqual("my_mesh", mesh_interface_obj.GetMeshName())
+            self.assertEqual("MeshGroup", mesh_interface_obj.GetMeshType())
+            self.assertEqual({"Entity_Triangle" : 5}, mesh_interface_obj.GetMeshInformation())
+            self.assertEqual(["Entity_Triangle"], mesh_interface_obj.GetEntityTypesInMesh())
+            self.assertIn("Triangle: 5", mesh_interface_obj.PrintData())
+
+        # the object is looked up once, the existence is checked once per call, the name every time it is requested
+        self.assertEqual(1 + 3*(6+1), self.get_obj_ref_mock.call_count)
+        self.assertEqual(1, self.obj_ref.GetObject.call_count)
+
+    def test_study_changed(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertTrue(mesh_interface_obj.CheckMeshIsValid())
+        self.assertEqual(2, self.get_obj_ref_mock.call_count)
+
+        salome_study_utilities.NotifyStudyChanged()
+        self.assertEqual("my_mesh", mesh_interface_obj.GetMeshName())
+        self.assertEqual(5, self.get_obj_ref_mock.call_count)
+        self.assertEqual(2, self.obj_ref.GetObject.call_count)
+
+    def test_identifier_changed(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertTrue(mesh_interface_obj.CheckMeshIsValid())
+
+        self.get_obj_ref_mock.return_value = None # the new object does not exist
+        mesh_interface_obj.mesh_identifier = "1:55555:114777"
+        with self.assertLogs("kratos_salome_plugin.mesh_interface", level="CRITICAL"):
+            self.assertFalse(mesh_interface_obj.CheckMeshIsValid())
+        self.assertEqual("", mesh_interface_obj.GetMeshName())
+
+    def test_object_deleted(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertEqual({"Entity_Triangle" : 5}, mesh_interface_obj.GetMeshInformation())
+
+        # e.g. the mesh was deleted in the GUI, the study did not change
+        self.get_obj_ref_mock.return_value = None
+        with self.assertLogs("kratos_salome_plugin.mesh_interface", level="CRITICAL") as cm:
+            self.assertFalse(mesh_interface_obj.CheckMeshIsValid())
+            self.assertEqual({}, mesh_interface_obj.GetMeshInformation())
+            self.assertEqual("", mesh_interface_obj.GetMeshName())
+            self.assertEqual(0, mesh_interface_obj.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(4, len(cm.output))
+        self.assertIn('Mesh with identifier "0:1:2:3" in MeshInterface does not exist', cm.output[0])
+        self.assertEqual(1, self.get_mesh_info_mock.call_count) # the proxy is not used anymore
+
+        # the object exists again, it is resolved again
+        self.get_obj_ref_mock.return_value = self.obj_ref
+        self.assertEqual({"Entity_Triangle" : 5}, mesh_interface_obj.GetMeshInformation())
+        self.assertEqual(2, self.obj_ref.GetObject.call_count)
+
+    def test_object_renamed(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertEqual("my_mesh", mesh_interface_obj.GetMeshName())
+
+        self.obj_ref.GetName.return_value = "renamed_mesh"
+        self.assertEqual("renamed_mesh", mesh_interface_obj.GetMeshName())
+        self.assertEqual(1, self.obj_ref.GetObject.call_count)
+
+    def test_object_is_kept(self):
+        resolved_mesh = mesh_interface._ResolvedMesh("0:1:2:3")
+        mesh_object = resolved_mesh.GetObject()
+        mesh_object_ref = weakref.ref(mesh_object)
+        del mesh_object
+
+        # the object is kept, even though nothing else refers to it
+        self.assertIsNotNone(mesh_object_ref())
+        self.assertIs(mesh_object_ref(), resolved_mesh.GetObject())
+        self.assertEqual(1, self.get_obj_ref_mock.call_count)
+
+    def test_mesh_changed(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertEqual(["Entity_Triangle"], mesh_interface_obj.GetEntityTypesInMesh())
+
+        # e.g. the mesh was computed again, the object stays the same
+        self.get_mesh_info_mock.return_value = {"Entity_Triangle" : 7, "Entity_Edge" : 4}
+        self.assertEqual({"Entity_Triangle" : 7, "Entity_Edge" : 4}, mesh_interface_obj.GetMeshInformation())
+        self.assertEqual(["Entity_Triangle", "Entity_Edge"], mesh_interface_obj.GetEntityTypesInMesh())
+        self.assertEqual(1, self.obj_ref.GetObject.call_count)
+
+
+class TestMeshInterfaceCounters(unittest.TestCase):
+    """The number of entities is taken from the counters of Salome, without extracting the entities"""
+
+    def setUp(self):
+        self.mesh_object = MagicMock()
+        self.mesh_object.NbNodes.return_value = 49
+        self.mesh_object.GetNumberOfNodes.return_value = 12
+        obj_ref = MagicMock()
+        obj_ref.GetObject.side_effect = lambda: self.mesh_object
+        obj_ref.GetName.return_value = "my_mesh"
+
+        self.patcher = ExitStack()
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_utilities.GetSalomeObjectReference', return_value=obj_ref))
+        self.is_sub_mesh_mock = self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsSubMeshProxy', return_value=False))
+        self.is_group_mock = self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsMeshGroup', return_value=False))
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.IsMeshProxy', return_value=True))
+        self.patcher.enter_context(patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeFromString', side_effect=lambda entity_type: "Entity_"+entity_type))
+        self.get_mesh_info_mock = self.patcher.enter_context(patch.object(mesh_interface.smesh, 'GetMeshInfo', return_value={"Entity_Triangle" : 80, "Entity_Edge" : 0}))
+
+    def tearDown(self):
+        self.patcher.close()
+
+    def test_mesh_proxy(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+
+        for _ in range(2):
+            self.assertEqual(49, mesh_interface_obj.GetNumberOfNodes())
+            self.assertEqual(49, mesh_interface_obj.GetNumberOfGeometries("Node"))
+            self.assertEqual(80, mesh_interface_obj.GetNumberOfGeometries("Triangle"))
+            self.assertEqual(0, mesh_interface_obj.GetNumberOfGeometries("Edge"))
+            self.assertEqual(0, mesh_interface_obj.GetNumberOfGeometries("Hexa"))
+
+        # the entities are not requested
+        self.mesh_object.GetNodesId.assert_not_called()
+        self.mesh_object.GetElemNodes.assert_not_called()
+
+    def test_mesh_changed(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        self.assertEqual(49, mesh_interface_obj.GetNumberOfNodes())
+        self.assertEqual(80, mesh_interface_obj.GetNumberOfGeometries("Triangle"))
+
+        # the counters are requested again, e.g. after the mesh was computed again
+        self.mesh_object.NbNodes.return_value = 60
+        self.get_mesh_info_mock.return_value = {"Entity_Triangle" : 100, "Entity_Edge" : 8}
+        self.assertEqual(60, mesh_interface_obj.GetNumberOfNodes())
+        self.assertEqual(100, mesh_interface_obj.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(8, mesh_interface_obj.GetNumberOfGeometries("Edge"))
+
+    def test_sub_mesh_proxy(self):
+        self.is_sub_mesh_mock.return_value = True
+        self.assertEqual(12, MeshInterface("0:1:2:3").GetNumberOfNodes())
+        self.mesh_object.GetNumberOfNodes.assert_called_once_with(True) # including the nodes on the boundary
+
+    def test_mesh_group(self):
+        self.is_group_mock.return_value = True
+        self.assertEqual(12, MeshInterface("0:1:2:3").GetNumberOfNodes())
+        self.mesh_object.GetNumberOfNodes.assert_called_once_with()
+
+    def test_invalid_mesh(self):
+        mesh_interface_obj = MeshInterface("0:1:2:3")
+        with patch.object(MeshInterface, 'CheckMeshIsValid', return_value=False):
+            self.assertEqual(0, mesh_interface_obj.GetNumberOfNodes())
+            self.assertEqual(0, mesh_interface_obj.GetNumberOfGeometries("Triangle"))
+
+
 # The expected definitions are here to make the handling of the
 # multiline-stings easier (no need to deal with indentation)
 mesh_interface_str = '''MeshInterface
@@ -119,6 +677,17 @@ class TestMeshInterfaceMeshRelatedMethods(testing_utilities.SalomeTestCaseWithBo
         for node_coords in nodes.values():
             self.assertEqual(3, len(node_coords))
 
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_GetNodeIdsAndCoordinates(self):
+        # the coordinates extracted at once have to be the same as when requesting each node separately
+        for mesh_interface_to_check in [self.mesh_interface_main_mesh_tetra, self.mesh_interface_sub_mesh_tetra_face, self.mesh_interface_tetra_mesh_group_f1_nodes]:
+            node_ids, coordinates = mesh_interface_to_check.GetNodeIdsAndCoordinates()
+            main_mesh = salome_utilities.GetSalomeObject(self.mesh_interface_main_mesh_tetra.mesh_identifier)
+            self.assertEqual(node_ids.tolist(), sorted(node_ids.tolist()))
+            for node_id, coords in zip(node_ids.tolist(), coordinates.tolist()):
+                for exp_coord, coord in zip(main_mesh.GetNodeXYZ(node_id), coords):
+                    self.assertAlmostEqual(exp_coord, coord, 10)
+
     def test_GetNodes_SubMeshOnEdge(self):
         nodes = self.mesh_interface_sub_mesh_tetra_edge.GetNodes()
         self.assertEqual(5, len(nodes)) # this might fail if different versions of salome give different meshes
@@ -13,19 +13,23 @@ import initialize_testing_environment
 
 # python imports
 import unittest
+from unittest.mock import patch
+import tracemalloc
 from abc import ABCMeta, abstractmethod
 
 # plugin imports
 import kratos_salome_plugin.model_part as py_model_part
 
 # tests imports
-from testing_utilities import CheckIfKratosAvailable
+from testing_utilities import CheckIfKratosAvailable, CheckIfNumpyAvailable, ModelPartForTests
 
 # Kratos import
 kratos_available = CheckIfKratosAvailable()
 if kratos_available:
     import KratosMultiphysics as KM
 
+numpy_available = CheckIfNumpyAvailable()
+
 
 """This set of tests makes sure that the python-version of the ModelPart
 behaves in the same way as the real ModelPart
@@ -650,6 +654,385 @@ class TestPyKratosModelPart(TestModelPart.BaseTests):
         with self.assertRaisesRegex(Exception, "Properties index not found: 212"):
             self.model_part.GetProperties(212) # Kratos also needs the Mesh-Index, this segfaults in Kratos as there is no Mesh with Id 212
 
+    def test_add_entities_with_same_Id(self):
+        # only the stored entities can be added again, also if the entities are stored in arrays
+        props = self.model_part.CreateNewProperties(1)
+        node = self.model_part.CreateNewNode(2, 1.0, 2.0, 3.0)
+        self.model_part.CreateNewNode(3, 1.0, 2.0, 4.0)
+        elem = self.model_part.CreateNewElement("Element2D2N", 1, [2, 3], props)
+        cond = self.model_part.CreateNewCondition("LineCondition2D2N", 1, [2, 3], props)
+
+        smp = self.model_part.CreateSubModelPart("sub")
+        smp.AddNode(node)
+        smp.AddElement(elem)
+        smp.AddCondition(cond)
+        self.assertListEqual([2], list(smp.Nodes.keys()))
+
+        with self.assertRaisesRegex(RuntimeError, r"unfortunately a \(different\) node with the same Id already exists"):
+            self.model_part.AddNode(py_model_part.Node(2, 1.0, 2.0, 3.0))
+        with self.assertRaisesRegex(RuntimeError, r"unfortunately a \(different\) element with the same Id already exists"):
+            self.model_part.AddElement(py_model_part.GeometricalObject(1, elem.GetNodes(), "Element2D2N", props))
+        with self.assertRaisesRegex(RuntimeError, r"unfortunately a \(different\) condition with the same Id already exists"):
+            self.model_part.AddCondition(py_model_part.GeometricalObject(1, cond.GetNodes(), "LineCondition2D2N", props))
+
+    def test_Reserve(self):
+        # the storage is only preallocated if the entities are stored in arrays
+        self.model_part.Reserve(num_nodes=100, num_elements=50, num_conditions=10)
+        self.assertEqual(self.model_part.NumberOfNodes(), 0)
+        self.assertEqual(self.model_part.NumberOfElements(), 0)
+
+    def test_GetMaxId(self):
+        self.assertEqual(0, self.model_part.Nodes.GetMaxId())
+        smp = self.model_part.CreateSubModelPart("sub")
+        smp.CreateNewNodes([5, 3, 8], [[1.0, 2.0, 3.0], [-1.5, 0.0, 2.2], [0.0, 0.0, 7.1]])
+        self.model_part.CreateNewNode(4, 0.0, 0.0, 0.0)
+        self.assertEqual(8, self.model_part.Nodes.GetMaxId())
+
+        props = self.model_part.CreateNewProperties(1)
+        self.model_part.CreateNewElement("Element2D2N", 12, [5, 3], props)
+        self.model_part.CreateNewElement("Element2D2N", 2, [3, 8], props)
+        self.assertEqual(12, self.model_part.Elements.GetMaxId())
+        self.assertEqual(0, self.model_part.Conditions.GetMaxId())
+
+    def test_CreateNewNodes(self):
+        smp = self.model_part.CreateSubModelPart("sub")
+        smp.CreateNewNodes([5, 3, 8], [[1.0, 2.0, 3.0], [-1.5, 0.0, 2.2], [0.0, 0.0, 7.1]])
+
+        self.assertEqual(self.model_part.NumberOfNodes(), 3)
+        self.assertEqual(smp.NumberOfNodes(), 3)
+        self.assertListEqual([node.Id for node in self.model_part.Nodes], [5, 3, 8])
+        self.assertListEqual(self.model_part.GetNode(3).Coordinates(), [-1.5, 0.0, 2.2])
+        self.assertIs(self.model_part.GetNode(8), smp.GetNode(8))
+
+        # existing nodes (also within the input) are reused if the coordinates coincide
+        self.model_part.CreateNewNodes([3, 10, 10], [[-1.5, 0.0, 2.2], [0.0, 1.0, 7.1], [0.0, 1.0, 7.1]])
+        self.assertEqual(self.model_part.NumberOfNodes(), 4)
+        self.assertEqual(smp.NumberOfNodes(), 3)
+
+        with self.assertRaisesRegex(RuntimeError, "A node with Id #3 already exists in the root model part with different Coordinates!"):
+            smp.CreateNewNodes([11, 3], [[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+
+        with self.assertRaisesRegex(RuntimeError, "A node with Id #12 already exists in the root model part with different Coordinates!"):
+            self.model_part.CreateNewNodes([12, 12], [[1.0, 2.0, 3.0], [1.0, 2.5, 3.0]])
+
+    def test_CreateNewElements(self):
+        smp = self.model_part.CreateSubModelPart("sub")
+        props = self.model_part.CreateNewProperties(2)
+        self.model_part.CreateNewNodes(list(range(1, 6)), [[float(i), 0.0, 0.0] for i in range(5)])
+
+        smp.CreateNewElements("Element2D3N", [4, 2], [[1, 2, 3], [3, 4, 5]], props)
+        self.model_part.CreateNewElements("Element2D2N", [7], [[1, 5]], props)
+
+        self.assertEqual(self.model_part.NumberOfElements(), 3)
+        self.assertEqual(smp.NumberOfElements(), 2)
+        self.assertListEqual([elem.Id for elem in self.model_part.Elements], [4, 2, 7])
+        self.assertListEqual([node.Id for node in smp.GetElement(2).GetNodes()], [3, 4, 5])
+        self.assertEqual(smp.GetElement(4).name, "Element2D3N")
+        self.assertIs(smp.GetElement(4).Properties, props)
+
+        with self.assertRaisesRegex(RuntimeError, "trying to construct an element with ID 7 however an element with the same Id already exists"):
+            smp.CreateNewElements("Element2D2N", [8, 7], [[1, 5], [1, 4]], props)
+
+        with self.assertRaisesRegex(RuntimeError, "Node index not found: 6"):
+            self.model_part.CreateNewElements("Element2D2N", [11, 12], [[1, 5], [1, 6]], props)
+
+    def test_CreateNewConditions(self):
+        smp = self.model_part.CreateSubModelPart("sub")
+        props = self.model_part.CreateNewProperties(2)
+        self.model_part.CreateNewNodes(list(range(1, 6)), [[float(i), 0.0, 0.0] for i in range(5)])
+
+        smp.CreateNewConditions("LineCondition2D2N", [1, 2, 3], [[1, 2], [2, 3], [3, 4]], props)
+
+        self.assertEqual(self.model_part.NumberOfConditions(), 3)
+        self.assertEqual(smp.NumberOfConditions(), 3)
+        self.assertListEqual([node.Id for node in smp.GetCondition(3).GetNodes()], [3, 4])
+
+        with self.assertRaisesRegex(RuntimeError, "trying to construct a condition with ID 3 however a condition with the same Id already exists"):
+            self.model_part.CreateNewConditions("LineCondition2D2N", [3], [[1, 5]], props)
+
+        with self.assertRaisesRegex(RuntimeError, "Node index not found: 16"):
+            smp.CreateNewConditions("LineCondition2D2N", [11], [[16, 2]], props)
+
+    def test_sub_model_parts_store_ids(self):
+        smp = self.model_part.CreateSubModelPart("Parts_Fluid")
+        smp_inlet = smp.CreateSubModelPart("inlet")
+        smp_sub = smp_inlet.CreateSubModelPart("sub")
+        props = self.model_part.CreateNewProperties(2)
+
+        self.model_part.CreateNewNodes([9, 3, 7, 1], [[float(i), 0.0, 0.0] for i in range(4)])
+        smp_sub.AddNodes([7, 3])
+        smp_inlet.AddNodes([9, 3])
+        smp_sub.CreateNewElements("Element2D2N", [5, 2], [[9, 3], [7, 1]], props)
+
+        self.assertIsInstance(smp.Nodes, py_model_part.ModelPart.EntitiesSubset)
+
+        # the entities are taken from the root and iterated in the order of the Ids
+        for model_part, exp_ids in zip([smp, smp_inlet, smp_sub], [[3, 7, 9], [3, 7, 9], [3, 7]]):
+            self.assertListEqual([node.Id for node in model_part.Nodes], exp_ids)
+            self.assertListEqual(list(model_part.Nodes.keys()), exp_ids)
+            for node in model_part.Nodes:
+                self.assertIs(node, self.model_part.GetNode(node.Id))
+            self.assertListEqual([elem.Id for elem in model_part.Elements], [2, 5])
+
+        self.assertNotIn(1, smp.Nodes)
+        with self.assertRaisesRegex(RuntimeError, "Node index not found: 1"):
+            smp.GetNode(1)
+
+        smp_sub.CreateNewNode(4, 0.0, 0.0, 1.0)
+        self.assertListEqual(list(smp.Nodes.keys()), [3, 4, 7, 9])
+        self.assertListEqual([node.Id for node in self.model_part.Nodes], [9, 3, 7, 1, 4])
+
+        # nested iteration over the same container
+        pairs = [(n1.Id, n2.Id) for n1 in smp_sub.Nodes for n2 in smp_sub.Nodes]
+        self.assertEqual(len(pairs), 9)
+
+    def test_filter_entities(self):
+        ModelPartForTests.CreateNodesAndLineElements(self.model_part)
+        smp = self.model_part.CreateSubModelPart("sub")
+        smp.AddElements([2, 4, 7])
+        self.model_part.CreateNewElement("Element2D3N", 22, [1, 2, 3], self.model_part.GetProperties(1))
+
+        tri_elements = self.model_part.Elements.Filter(lambda elem: elem.name == "Element2D3N")
+        self.assertListEqual([elem.Id for elem in tri_elements], [22])
+
+        props_15_elements = self.model_part.Elements.Filter(lambda elem: elem.Properties.Id == 15)
+        self.assertListEqual([elem.Id for elem in props_15_elements], [1, 4, 7, 10])
+
+        smp_props_15_elements = smp.Elements.Filter(lambda elem: elem.Properties.Id == 15)
+        self.assertListEqual([elem.Id for elem in smp_props_15_elements], [4, 7])
+
+        nodes_with_low_ids = self.model_part.Nodes.Filter(lambda node: node.Id < 3)
+        self.assertEqual(len(nodes_with_low_ids), 2)
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestPyKratosModelPartArrayStorage(TestPyKratosModelPart):
+    def _CreateModelPart(self, name="for_test"):
+        return py_model_part.ModelPart(name, use_array_storage=True)
+
+    def test_nodes_stored_in_arrays(self):
+        for i in range(20):
+            self.model_part.CreateNewNode(i+1, i*1.5, -i*0.5, 2.0)
+
+        self.assertIsInstance(self.model_part.Nodes, py_model_part.NodesArrayContainer)
+        self.assertListEqual(self.model_part.Nodes.GetIds().tolist(), list(range(1,21)))
+        coords = self.model_part.Nodes.GetCoordinates()
+        self.assertEqual(coords.shape, (20,3))
+        self.assertAlmostEqual(coords[4,0], 6.0)
+        self.assertAlmostEqual(coords[4,1], -2.0)
+        self.assertAlmostEqual(coords[4,2], 2.0)
+
+        # the coordinates are changed through the nodes
+        with self.assertRaises(ValueError):
+            coords[4,0] = 1.0
+
+    def test_node_views(self):
+        node = self.model_part.CreateNewNode(5, 1.0, 2.0, 3.0)
+        self.assertIsInstance(node, py_model_part.NodeView)
+
+        # views that are alive are reused
+        self.assertIs(node, self.model_part.GetNode(5))
+
+        # changing the coordinates of the view changes the stored coordinates
+        node.X = 10.5
+        self.assertAlmostEqual(self.model_part.Nodes.GetCoordinates()[0,0], 10.5)
+
+        # the data outlives the view
+        node.SetValue("DISP", 1.5)
+        del node
+        self.assertTrue(self.model_part.GetNode(5).Has("DISP"))
+        self.assertEqual(self.model_part.GetNode(5).GetValue("DISP"), 1.5)
+        self.assertFalse(self.model_part.GetNode(5).Has("VELOCITY"))
+
+    def test_compare_with_object_storage(self):
+        model_part_objects = py_model_part.ModelPart("for_test")
+        for mp in [self.model_part, model_part_objects]:
+            for i in range(8):
+                mp.CreateNewNode(i+1, i**1.1, i*2.2, 2.6)
+            mp.GetNode(3).SetValue("abc", 12)
+
+        self.assertEqual(self.model_part, model_part_objects)
+        self.assertEqual(model_part_objects, self.model_part)
+
+        self.model_part.GetNode(4).SetValue("abc", 12)
+        self.assertNotEqual(self.model_part, model_part_objects)
+
+    def test_elements_stored_in_arrays(self):
+        props = self.model_part.CreateNewProperties(3)
+        for i in range(6):
+            self.model_part.CreateNewNode(i+1, i*1.5, 0.0, 0.0)
+        for i in range(4):
+            self.model_part.CreateNewElement("Element2D3N", 10+i, [i+1, i+2, i+3], props)
+        self.model_part.CreateNewElement("Element2D2N", 5, [1, 6], props)
+        self.model_part.CreateNewElement("Element2D3N", 4, [1, 2, 6], props)
+
+        self.assertIsInstance(self.model_part.Elements, py_model_part.GeometricalObjectsArrayContainer)
+        self.assertListEqual(self.model_part.Elements.GetIds().tolist(), [10,11,12,13,5,4])
+        self.assertListEqual(list(self.model_part.Elements.keys()), [10,11,12,13,5,4])
+
+        blocks = self.model_part.Elements.GetBlocks()
+        self.assertEqual(len(blocks), 2)
+        name, ids, connectivities, properties_ids = blocks[0]
+        self.assertEqual(name, "Element2D3N")
+        self.assertListEqual(ids.tolist(), [10,11,12,13,4])
+        self.assertListEqual(connectivities.tolist(), [[1,2,3], [2,3,4], [3,4,5], [4,5,6], [1,2,6]])
+        self.assertListEqual(properties_ids.tolist(), [3]*5)
+        name, ids, connectivities, properties_ids = blocks[1]
+        self.assertEqual(name, "Element2D2N")
+        self.assertListEqual(ids.tolist(), [5])
+        self.assertListEqual(connectivities.tolist(), [[1,6]])
+
+    def test_geometrical_object_views(self):
+        props = self.model_part.CreateNewProperties(3)
+        for i in range(3):
+            self.model_part.CreateNewNode(i+1, i*1.5, 0.0, 0.0)
+        elem = self.model_part.CreateNewElement("Element2D3N", 1, [3, 1, 2], props)
+        self.assertIsInstance(elem, py_model_part.GeometricalObjectView)
+
+        self.assertIs(elem, self.model_part.GetElement(1))
+        self.assertIs(props, elem.Properties)
+        self.assertEqual("Element2D3N", elem.name)
+        self.assertListEqual([3, 1, 2], [node.Id for node in elem.GetNodes()])
+        self.assertIs(self.model_part.GetNode(3), elem.GetNodes()[0])
+
+        # the data outlives the view
+        elem.SetValue("THICKNESS", 0.25)
+        del elem
+        self.assertEqual(self.model_part.GetElement(1).GetValue("THICKNESS"), 0.25)
+
+    def test_remove_geometrical_objects(self):
+        props_1 = self.model_part.CreateNewProperties(1)
+        props_2 = self.model_part.CreateNewProperties(2)
+        for i in range(6):
+            self.model_part.CreateNewNode(i+1, i*1.5, 0.0, 0.0)
+        for i in range(4):
+            self.model_part.CreateNewElement("Element2D3N", i+1, [i+1, i+2, i+3], props_1)
+        self.model_part.CreateNewElement("Element2D2N", 5, [1, 6], props_2)
+        self.model_part.CreateNewElement("Element2D3N", 6, [1, 2, 6], props_2)
+        self.model_part.CreateNewElement("Element2D2N", 7, [2, 6], props_1)
+
+        elem_4 = self.model_part.GetElement(4)
+        elem_7 = self.model_part.GetElement(7)
+        elem_4.SetValue("THICKNESS", 0.25)
+
+        elements = self.model_part.Elements
+        elements.RemoveGeometricalObjects([2, 5])
+
+        self.assertEqual(5, self.model_part.NumberOfElements())
+        self.assertListEqual([1, 3, 4, 6, 7], elements.GetIds().tolist())
+        self.assertNotIn(2, elements)
+
+        # the blocks are compacted, the remaining geometrical objects keep their order
+        blocks = elements.GetBlocks()
+        self.assertListEqual([1, 3, 4, 6], blocks[0][1].tolist())
+        self.assertListEqual([[1,2,3], [3,4,5], [4,5,6], [1,2,6]], blocks[0][2].tolist())
+        self.assertListEqual([1, 1, 1, 2], blocks[0][3].tolist())
+        self.assertListEqual([7], blocks[1][1].tolist())
+        self.assertListEqual([[2, 6]], blocks[1][2].tolist())
+        self.assertListEqual([[1, 3, 4, 6], [7]], [segment[1].tolist() for segment in elements.GetSegments()])
+
+        # the views that are alive are moved
+        self.assertIs(elem_4, self.model_part.GetElement(4))
+        self.assertListEqual([4, 5, 6], [node.Id for node in elem_4.GetNodes()])
+        self.assertEqual(0.25, elem_4.GetValue("THICKNESS"))
+        self.assertListEqual([2, 6], [node.Id for node in elem_7.GetNodes()])
+        self.assertIs(props_1, elem_7.Properties)
+
+        # the geometrical objects are created after the remaining ones
+        self.model_part.CreateNewElement("Element2D3N", 8, [2, 3, 4], props_1)
+        self.assertListEqual([1, 3, 4, 6, 7, 8], list(elements.keys()))
+        self.assertListEqual([[2, 3, 4]], elements.GetSegments()[-1][2].tolist())
+
+    def test_remove_nodes(self):
+        for i in range(5):
+            self.model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+        node_2 = self.model_part.GetNode(2)
+        node_4 = self.model_part.GetNode(4)
+
+        self.model_part.Nodes.RemoveNodes([2, 3])
+
+        self.assertListEqual([1, 4, 5], list(self.model_part.Nodes.keys()))
+        self.assertListEqual([0.0, 3.0, 4.0], [node.X for node in self.model_part.Nodes])
+        self.assertIs(node_4, self.model_part.GetNode(4))
+        self.assertEqual(3.0, node_4.X)
+        with self.assertRaisesRegex(RuntimeError, 'Node #2 was removed, it cannot be used anymore!'):
+            node_2.Coordinates()
+        with self.assertRaisesRegex(RuntimeError, 'Node #2 was removed, it cannot be used anymore!'):
+            node_2.SetValue("DISP", 1.0)
+
+    def test_iterate_in_slices(self):
+        for i in range(10):
+            self.model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+
+        with patch.object(py_model_part, "ITERATION_CHUNK_SIZE", 3):
+            self.assertListEqual(list(range(1, 11)), list(self.model_part.Nodes.keys()))
+            self.assertListEqual([float(i) for i in range(10)], [node.X for node in self.model_part.Nodes])
+            self.assertListEqual(list(range(1, 11)), [node_id for node_id, node in self.model_part.Nodes.items() if node.Id == node_id])
+
+            pairs = [(n1.Id, n2.Id) for n1 in self.model_part.Nodes for n2 in self.model_part.Nodes]
+            self.assertEqual(100, len(pairs))
+            self.assertEqual((5, 7), pairs[46])
+
+    def test_modify_while_iterating(self):
+        for i in range(5):
+            self.model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+
+        with self.assertRaisesRegex(RuntimeError, 'NodesArrayContainer changed during iteration'):
+            for node in self.model_part.Nodes:
+                if node.Id == 2:
+                    self.model_part.Nodes.RemoveNodes([4])
+
+        with self.assertRaisesRegex(RuntimeError, 'NodesArrayContainer changed during iteration'):
+            for node_id in self.model_part.Nodes.keys():
+                self.model_part.CreateNewNode(node_id+10, 0.0, 0.0, 0.0)
+
+        # changing the entities themselves is possible
+        for node in self.model_part.Nodes:
+            node.X += 1.0
+        self.assertListEqual([1.0, 2.0, 3.0, 5.0, 1.0], self.model_part.Nodes.GetCoordinates()[:, 0].tolist())
+
+    def test_removed_geometrical_object_view(self):
+        props = self.model_part.CreateNewProperties(1)
+        for i in range(3):
+            self.model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+        elem = self.model_part.CreateNewElement("Element2D2N", 1, [1, 2], props)
+        self.model_part.CreateNewElement("Element2D2N", 2, [2, 3], props)
+
+        self.model_part.Elements.RemoveGeometricalObjects([1])
+
+        with self.assertRaisesRegex(RuntimeError, 'GeometricalObject #1 was removed, it cannot be used anymore!'):
+            elem.GetNodes()
+        with self.assertRaisesRegex(RuntimeError, 'GeometricalObject #1 was removed, it cannot be used anymore!'):
+            elem.name
+
+    def test_create_element_missing_node(self):
+        props = self.model_part.CreateNewProperties(3)
+        self.model_part.CreateNewNode(1, 0.0, 0.0, 0.0)
+        with self.assertRaisesRegex(RuntimeError, "Node index not found: 2"):
+            self.model_part.CreateNewElement("Element2D2N", 1, [1, 2], props)
+        self.assertEqual(self.model_part.NumberOfElements(), 0)
+
+    def test_Reserve(self):
+        smp = self.model_part.CreateSubModelPart("sub")
+        smp.Reserve(num_nodes=100, num_elements=50) # the storage of the root is preallocated
+
+        nodes = self.model_part.Nodes
+        self.assertEqual(nodes._ids.shape[0], 100)
+        self.assertEqual(nodes._coordinates.shape[0], 100)
+        self.assertEqual(self.model_part.Elements._ids.shape[0], 50)
+        self.assertEqual(self.model_part.Conditions._ids.shape[0], 0)
+
+        # no resizing when adding the reserved number of entities
+        coordinates = nodes._coordinates
+        smp.CreateNewNodes(list(range(1, 101)), [[float(i), 0.0, 0.0] for i in range(100)])
+        self.assertIs(coordinates, nodes._coordinates)
+        self.assertEqual(smp.NumberOfNodes(), 100)
+
+        # the storage is never shrunk
+        self.model_part.Reserve(num_nodes=10)
+        self.assertEqual(nodes._ids.shape[0], 100)
+        self.assertListEqual(nodes.GetIds().tolist(), list(range(1, 101)))
+
 
 class TestDataValueContainer:
     '''Interface matches the one of Kratos
@@ -950,6 +1333,75 @@ class TestPyKratosNode(TestDataValueContainer.BaseTests):
         self.assertNotEqual(node_1, node_3)
 
 
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestPyKratosNodeView(TestPyKratosNode):
+    '''NodeView derives from Node, hence also checking this interface
+    '''
+    def _CreateDataValueContainer(self):
+        return py_model_part.NodesArrayContainer().CreateNode(1, 1.557, 2.0, -3.000000002222)
+
+
+class TestPyKratosNodeMemoryUsage(unittest.TestCase):
+    '''Checking that the memory usage of the nodes is lower than with the previous implementation
+    (without slots and with an eagerly allocated dict for the data)
+    '''
+    class PreviousNode(py_model_part.DataValueContainer):
+        # shaped like the Node of the previous implementation: the attributes are in a __dict__ and the dict for the data is always allocated
+        def __init__(self, Id, X, Y, Z):
+            super().__init__()
+            self._DataValueContainer__var_data = {}
+            self.Id = Id
+            self.X = X
+            self.Y = Y
+            self.Z = Z
+
+    @staticmethod
+    def _GetMemoryUsage(node_type, node_ids):
+        # the coordinates are shared, such that only the memory of the nodes themselves is measured
+        tracemalloc.start()
+        nodes = [node_type(node_id, 1.5, 2.5, 3.5) for node_id in node_ids]
+        memory_usage = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del nodes
+        return memory_usage
+
+    def test_memory_usage_nodes(self):
+        node_ids = list(range(100000))
+        memory_usage_previous = self._GetMemoryUsage(TestPyKratosNodeMemoryUsage.PreviousNode, node_ids)
+        memory_usage = self._GetMemoryUsage(py_model_part.Node, node_ids)
+
+        self.assertLess(memory_usage, 0.5*memory_usage_previous)
+
+        node = py_model_part.Node(1, 0.0, 0.0, 0.0)
+        self.assertTrue(hasattr(TestPyKratosNodeMemoryUsage.PreviousNode(1, 0.0, 0.0, 0.0), "__dict__"))
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertFalse(node.HasData())
+        self.assertEqual(len(node.GetData()), 0)
+        node.SetValue("DISP", 1.0)
+        self.assertTrue(node.HasData())
+
+    def test_GetData(self):
+        # the data is returned as dict, also before data was set
+        node = py_model_part.Node(1, 0.0, 0.0, 0.0)
+        self.assertIs(dict, type(node.GetData()))
+        node.GetData()["DISP"] = 1.5
+        self.assertTrue(node.Has("DISP"))
+        self.assertEqual(1.5, node.GetValue("DISP"))
+        self.assertIs(node.GetData(), node.GetData())
+
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_GetData_view(self):
+        # the data of a view is stored in the container, also if it is modified through "GetData"
+        nodes = py_model_part.NodesArrayContainer()
+        nodes.CreateNode(1, 0.0, 0.0, 0.0)
+        nodes.CreateNode(2, 0.0, 0.0, 0.0)
+        self.assertIs(dict, type(nodes[2].GetData()))
+        nodes[1].GetData()["DISP"] = 1.5
+
+        self.assertEqual(1.5, nodes[1].GetValue("DISP"))
+        self.assertEqual([(1, {"DISP" : 1.5})], nodes.GetDataItems())
+
+
 class TestPyKratosGeometricalObject(TestDataValueContainer.BaseTests):
     '''GeometricalObject derives from DataValueContainer, hence also checking this interface
     '''
@@ -1044,6 +1496,20 @@ class TestPyKratosGeometricalObject(TestDataValueContainer.BaseTests):
         self.assertNotEqual(geom_obj_1, geom_obj_3)
 
 
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestPyKratosGeometricalObjectView(TestPyKratosGeometricalObject):
+    '''GeometricalObjectView derives from GeometricalObject, hence also checking this interface
+    '''
+    def _CreateDataValueContainer(self):
+        nodes = py_model_part.NodesArrayContainer()
+        nodes.CreateNode(1, 1.0, 2.7, 3.0).SetValue("CvT", -13.55)
+        nodes.CreateNode(2, 11.1, -3.5, 5.103)
+        props = py_model_part.Properties(1)
+        props.SetValue("YOUNGS_MOD", 5E9)
+        props.SetValue("DENSITY", 7850)
+        return py_model_part.GeometricalObjectsArrayContainer(nodes).CreateGeometricalObject("myCondition", 1, [1, 2], props)
+
+
 class TestPyKratosProperties(TestDataValueContainer.BaseTests):
     '''Properties derives from DataValueContainer, hence also checking this interface
     '''
@@ -1161,6 +1627,40 @@ class TestPyKratosModelPartMissingMethods(TestDataValueContainer.BaseTests):
 
 
 class TestPointerVectorSet(unittest.TestCase):
+    def test_nested_iteration(self):
+        pvs = py_model_part.ModelPart.PointerVectorSet()
+        for i in range(4):
+            pvs[i] = i**2
+
+        pairs = [(v1, v2) for v1 in pvs for v2 in pvs]
+        self.assertEqual(len(pairs), 16)
+        self.assertEqual(pairs[5], (1, 1))
+
+    def test_modify_while_iterating(self):
+        pvs = py_model_part.ModelPart.PointerVectorSet()
+        for i in range(4):
+            pvs[i] = i**2
+
+        # like for every dict, the values are not copied for iterating
+        with self.assertRaisesRegex(RuntimeError, 'OrderedDict mutated during iteration'):
+            for v in pvs:
+                pvs[v+10] = v
+
+    def test_filter(self):
+        pvs = py_model_part.ModelPart.PointerVectorSet()
+        for i in range(8):
+            pvs[i] = i**2
+
+        even_values = pvs.Filter(lambda v: v%2 == 0)
+        self.assertListEqual(list(even_values), [0, 4, 16, 36])
+        self.assertEqual(len(even_values), 4)
+
+        # the filter is a view, hence changes are reflected
+        pvs[8] = 64
+        self.assertListEqual(list(even_values), [0, 4, 16, 36, 64])
+
+        self.assertListEqual(list(even_values.Filter(lambda v: v > 10)), [16, 36, 64])
+
     def test_printing(self):
         pvs = py_model_part.ModelPart.PointerVectorSet()
         # adding some entities
@@ -83,6 +83,19 @@ class TestSalomeTestCaseStudyCleaning(SalomeTestCase):
             TestSalomeTestCaseStudyCleaning.num_objs_in_study = salome_study_utilities.GetNumberOfObjectsInStudy()
 
 
+class TestStudyGeneration(unittest.TestCase):
+    def test_NotifyStudyChanged(self):
+        generation = salome_study_utilities.GetStudyGeneration()
+        salome_study_utilities.NotifyStudyChanged()
+        self.assertEqual(generation+1, salome_study_utilities.GetStudyGeneration())
+
+    def test_ResetStudy(self):
+        generation = salome_study_utilities.GetStudyGeneration()
+        with patch.object(salome_study_utilities, 'myStudy'):
+            salome_study_utilities.ResetStudy()
+        self.assertGreater(salome_study_utilities.GetStudyGeneration(), generation)
+
+
 class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
 
     def test_GetNumberOfObjectsInComponent(self):
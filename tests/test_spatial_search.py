@@ -0,0 +1,358 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest
+
+# plugin imports
+from kratos_salome_plugin.spatial_search import NodesSpatialIndex, GetNodesArrays, CreateSubModelPartFromNodes, CreateSubModelPartFromPredicate
+from kratos_salome_plugin.model_part import ModelPart
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+def CreateRandomNodes(num_nodes, planar=False):
+    random_state = np.random.RandomState(42)
+    node_ids = 3*np.arange(1, num_nodes+1) # non-consecutive Ids
+    coordinates = random_state.rand(num_nodes, 3)
+    if planar:
+        coordinates[:,2] = 1.5
+    return node_ids, coordinates
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestNodesSpatialIndex(unittest.TestCase):
+    def test_FindNodesInRadius(self):
+        for planar in (False, True):
+            with self.subTest(planar=planar):
+                node_ids, coordinates = CreateRandomNodes(500, planar)
+                spatial_index = NodesSpatialIndex(node_ids, coordinates)
+                points = np.vstack((np.random.RandomState(1).rand(20, 3), [[10.0, 10.0, 10.0], [-0.1, 0.5, 1.5]]))
+
+                for radius in (0.0, 0.05, 0.2, 5.0):
+                    nodes_in_radius = spatial_index.FindNodesInRadius(points, radius)
+                    self.assertEqual(len(points), len(nodes_in_radius))
+                    for point, found_node_ids in zip(points, nodes_in_radius):
+                        distances = np.linalg.norm(coordinates - point, axis=1)
+                        order = np.argsort(distances, kind="stable")
+                        self.assertEqual(node_ids[order[distances[order] <= radius]].tolist(), found_node_ids.tolist())
+
+    def test_FindNodesInRadius_one_point(self):
+        spatial_index = NodesSpatialIndex([1, 2, 3], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.5, 0.0]])
+        self.assertEqual([3, 1], spatial_index.FindNodesInRadius([0.0, 0.4, 0.0], 0.6).tolist())
+        self.assertEqual([], spatial_index.FindNodesInRadius([5.0, 0.4, 0.0], 0.6).tolist())
+
+    def test_FindNearestNodes(self):
+        for planar in (False, True):
+            with self.subTest(planar=planar):
+                node_ids, coordinates = CreateRandomNodes(500, planar)
+                spatial_index = NodesSpatialIndex(node_ids, coordinates)
+                points = np.vstack((np.random.RandomState(1).rand(20, 3), [[10.0, 10.0, 10.0]]))
+
+                nearest_node_ids, nearest_distances = spatial_index.FindNearestNodes(points, 4)
+                self.assertEqual((21, 4), nearest_node_ids.shape)
+                for point, found_node_ids, found_distances in zip(points, nearest_node_ids, nearest_distances):
+                    distances = np.linalg.norm(coordinates - point, axis=1)
+                    order = np.argsort(distances, kind="stable")[:4]
+                    self.assertEqual(node_ids[order].tolist(), found_node_ids.tolist())
+                    self.assertTrue(np.allclose(distances[order], found_distances))
+
+    def test_FindNearestNodes_one_point(self):
+        spatial_index = NodesSpatialIndex([1, 2, 3], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.5, 0.0]])
+        node_ids, distances = spatial_index.FindNearestNodes([0.9, 0.1, 0.0])
+        self.assertEqual([2], node_ids.tolist())
+        self.assertAlmostEqual(np.sqrt(0.02), distances[0])
+
+        with self.assertRaisesRegex(Exception, 'Cannot find 4 nearest nodes, there are only 3 nodes!'):
+            spatial_index.FindNearestNodes([0.9, 0.1, 0.0], 4)
+
+    def test_FindNodesInBoundingBox(self):
+        node_ids, coordinates = CreateRandomNodes(500)
+        spatial_index = NodesSpatialIndex(node_ids, coordinates)
+
+        for min_point, max_point in [([0.2, 0.1, 0.3], [0.6, 0.5, 0.4]), ([-1.0, -1.0, -1.0], [2.0, 2.0, 2.0]), ([0.5, 0.5, 0.5], [0.5, 0.5, 0.5]), ([3.0, 0.0, 0.0], [4.0, 1.0, 1.0])]:
+            is_inside = np.all((coordinates >= min_point) & (coordinates <= max_point), axis=1)
+            self.assertEqual(np.sort(node_ids[is_inside]).tolist(), spatial_index.FindNodesInBoundingBox(min_point, max_point).tolist())
+
+    def test_FindNodes(self):
+        node_ids, coordinates = CreateRandomNodes(500)
+        spatial_index = NodesSpatialIndex(node_ids, coordinates)
+
+        found_node_ids = spatial_index.FindNodes(lambda coords: coords[:,0] < 0.25)
+        self.assertEqual(np.sort(node_ids[coordinates[:,0] < 0.25]).tolist(), found_node_ids.tolist())
+
+    def test_FindPairsInRadius(self):
+        spatial_index = NodesSpatialIndex([1, 2, 3, 4], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1E-8, 0.0], [1.0, 0.0, 1E-9]])
+        node_ids_1, node_ids_2, distances = spatial_index._FindPairsInRadius(1E-6)
+        self.assertEqual([(1, 3), (2, 4)], sorted(zip(node_ids_1.tolist(), node_ids_2.tolist())))
+        self.assertEqual(2, len(distances))
+
+    def test_FindCoincidentNodes(self):
+        # 2 and 5 coincide with 1, 4 is within the tolerance of 5 only (a chain), 3 and 6 coincide
+        spatial_index = NodesSpatialIndex([5, 2, 6, 1, 3, 4, 7], [[1.0, 0.0, 8E-9], [1.0, 1E-9, 0.0], [0.0, 2.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 0.0, 1.6E-8], [0.0, 2.0, 1E-3]])
+        node_ids, target_node_ids = spatial_index.FindCoincidentNodes(1E-8)
+        self.assertEqual([2, 4, 5, 6], node_ids.tolist())
+        self.assertEqual([1, 1, 1, 3], target_node_ids.tolist())
+
+        node_ids, target_node_ids = spatial_index.FindCoincidentNodes(1E-12)
+        self.assertEqual([6], node_ids.tolist())
+        self.assertEqual([3], target_node_ids.tolist())
+
+    def test_FindCoincidentNodes_duplicated_nodes(self):
+        node_ids, coordinates = CreateRandomNodes(1000)
+        # every third node is duplicated with a small perturbation
+        duplicated_ids = node_ids[::3] + 10000
+        duplicated_coordinates = coordinates[::3] + np.random.RandomState(2).uniform(-1E-8, 1E-8, (duplicated_ids.size, 3))
+        spatial_index = NodesSpatialIndex(np.concatenate((node_ids, duplicated_ids)), np.vstack((coordinates, duplicated_coordinates)))
+
+        merged_node_ids, target_node_ids = spatial_index.FindCoincidentNodes(1E-6)
+        self.assertEqual(duplicated_ids.tolist(), merged_node_ids.tolist())
+        self.assertEqual(node_ids[::3].tolist(), target_node_ids.tolist())
+
+    def test_special_cases(self):
+        # no nodes
+        spatial_index = NodesSpatialIndex([], [])
+        self.assertEqual(0, spatial_index.GetNumberOfNodes())
+        self.assertEqual([[]], [node_ids.tolist() for node_ids in spatial_index.FindNodesInRadius([[0.0, 0.0, 0.0]], 1.0)])
+        self.assertEqual([], spatial_index.FindNodesInBoundingBox([0.0, 0.0, 0.0], [1.0, 1.0, 1.0]).tolist())
+
+        # all nodes at the same position
+        spatial_index = NodesSpatialIndex([1, 2], [[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+        self.assertEqual([1, 2], sorted(spatial_index.FindNodesInRadius([1.0, 2.0, 3.0], 0.0).tolist()))
+
+    def test_bucket_size(self):
+        node_ids, coordinates = CreateRandomNodes(100)
+        spatial_index = NodesSpatialIndex(node_ids, coordinates, bucket_size=0.01)
+        self.assertEqual(0.01, spatial_index.GetBucketSize())
+        self.assertEqual(node_ids[:1].tolist(), spatial_index.FindNearestNodes(coordinates[0])[0].tolist())
+
+        with self.assertRaisesRegex(Exception, 'The size of the buckets has to be positive, got 0.0!'):
+            NodesSpatialIndex(node_ids, coordinates, bucket_size=0.0)
+
+        with self.assertRaisesRegex(Exception, 'The number of node Ids \\(2\\) does not match the number of coordinates \\(1\\)!'):
+            NodesSpatialIndex([1, 2], [[0.0, 0.0, 0.0]])
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestModelPartNodesSpatialIndex(unittest.TestCase):
+    def _CreateModelPart(self):
+        model_part = ModelPart(use_array_storage=self.use_array_storage)
+        props = model_part.CreateNewProperties(1)
+        for i in range(5):
+            model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+        model_part.CreateNewElement("Element2D2N", 1, [1, 2], props)
+        model_part.CreateNewElement("Element2D2N", 2, [2, 3], props)
+        model_part.CreateNewElement("Element2D2N", 3, [3, 4], props)
+        model_part.CreateNewCondition("PointCondition3D1N", 1, [4], props)
+        return model_part
+
+    def setUp(self):
+        self.use_array_storage = False
+
+    def test_GetNodesSpatialIndex(self):
+        model_part = self._CreateModelPart()
+        spatial_index = model_part.GetNodesSpatialIndex()
+        self.assertEqual(5, spatial_index.GetNumberOfNodes())
+        self.assertIs(spatial_index, model_part.GetNodesSpatialIndex()) # the index is kept
+
+        # adding nodes creates the index again
+        model_part.CreateSubModelPart("sub").CreateNewNode(6, 5.0, 0.0, 0.0)
+        spatial_index = model_part.GetNodesSpatialIndex()
+        self.assertEqual(6, spatial_index.GetNumberOfNodes())
+        self.assertEqual([6, 5], spatial_index.FindNodesInRadius([4.9, 0.0, 0.0], 1.0).tolist())
+
+    def test_GetNodesSpatialIndex_modified_nodes(self):
+        model_part = self._CreateModelPart()
+        smp = model_part.CreateSubModelPart("sub")
+        smp.AddNodes([1, 2])
+        spatial_index = smp.GetNodesSpatialIndex()
+
+        # creating elements does not change the nodes
+        model_part.CreateNewElement("Element2D2N", 4, [4, 5], model_part.GetProperties(1))
+        self.assertIs(spatial_index, smp.GetNodesSpatialIndex())
+
+        # setting the coordinates creates the index again, although the number of nodes did not change
+        model_part.GetNode(2).X = 10.0
+        spatial_index = smp.GetNodesSpatialIndex()
+        self.assertEqual([2], spatial_index.FindNodesInRadius([10.0, 0.0, 0.0], 0.1).tolist())
+        self.assertEqual([2], model_part.GetNodesSpatialIndex().FindNodesInRadius([10.0, 0.0, 0.0], 0.1).tolist())
+        self.assertIs(spatial_index, smp.GetNodesSpatialIndex())
+
+        # merging a node and adding another one, the number of nodes is the same again
+        model_part.GetNode(1).X = 10.0
+        model_part.GetNode(2).X = 10.0
+        spatial_index = smp.GetNodesSpatialIndex()
+        self.assertEqual(1, smp.MergeCoincidentNodes())
+        smp.AddNodes([3])
+        self.assertEqual(2, smp.NumberOfNodes())
+        self.assertIsNot(spatial_index, smp.GetNodesSpatialIndex())
+        self.assertEqual([1, 3], sorted(smp.GetNodesSpatialIndex().FindNodesInRadius([5.0, 0.0, 0.0], 10.0).tolist()))
+
+    def test_GetNodesSpatialIndex_other_model_part(self):
+        model_part = self._CreateModelPart()
+        other_model_part = self._CreateModelPart()
+        spatial_index = model_part.GetNodesSpatialIndex()
+
+        # the modifications are counted per root ModelPart
+        other_model_part.GetNode(2).X = 10.0
+        other_model_part.CreateNewNode(10, 1.0, 1.0, 0.0)
+        self.assertIs(spatial_index, model_part.GetNodesSpatialIndex())
+
+        # the changes of a node that is also in the other ModelPart are detected (if it is not copied into arrays)
+        model_part.AddNode(other_model_part.GetNode(10))
+        model_part.GetNodesSpatialIndex()
+        other_model_part.GetNode(10).Y = 20.0
+        node_10 = model_part.GetNode(10)
+        self.assertEqual([10], model_part.GetNodesSpatialIndex().FindNodesInRadius(node_10.Coordinates(), 0.1).tolist())
+
+        node_10.Z = 5.0
+        self.assertEqual([10], model_part.GetNodesSpatialIndex().FindNodesInRadius([1.0, node_10.Y, 5.0], 0.1).tolist())
+
+    def test_GetNodesArrays(self):
+        model_part = self._CreateModelPart()
+        sub_model_part = model_part.CreateSubModelPart("sub")
+        sub_model_part.AddNodes([4, 2])
+
+        node_ids, coordinates = GetNodesArrays(model_part)
+        self.assertEqual([1, 2, 3, 4, 5], node_ids.tolist())
+        self.assertEqual([0.0, 1.0, 2.0, 3.0, 4.0], coordinates[:,0].tolist())
+
+        node_ids, coordinates = GetNodesArrays(sub_model_part)
+        self.assertEqual([2, 4], node_ids.tolist())
+        self.assertEqual([[1.0, 0.0, 0.0], [3.0, 0.0, 0.0]], coordinates.tolist())
+
+    def test_CreateSubModelPartFromPredicate(self):
+        model_part = self._CreateModelPart()
+
+        sub_model_part = CreateSubModelPartFromPredicate(model_part, "left", lambda coords: coords[:,0] < 2.5)
+        self.assertEqual([1, 2, 3], list(sub_model_part.Nodes.keys()))
+        self.assertEqual([1, 2], list(sub_model_part.Elements.keys())) # the elements whose nodes are all selected
+        self.assertEqual([], list(sub_model_part.Conditions.keys()))
+
+        sub_model_part = CreateSubModelPartFromPredicate(model_part, "right", lambda coords: coords[:,0] > 2.5, add_elements_and_conditions=False)
+        self.assertEqual([4, 5], list(sub_model_part.Nodes.keys()))
+        self.assertEqual(0, sub_model_part.NumberOfElements())
+
+    def test_CreateSubModelPartFromNodes(self):
+        model_part = self._CreateModelPart()
+        node_ids = model_part.GetNodesSpatialIndex().FindNodesInBoundingBox([2.5, -1.0, -1.0], [3.5, 1.0, 1.0])
+
+        sub_model_part = CreateSubModelPartFromNodes(model_part, "box", node_ids)
+        self.assertEqual([4], list(sub_model_part.Nodes.keys()))
+        self.assertEqual([1], list(sub_model_part.Conditions.keys()))
+
+    def test_MergeCoincidentNodes(self):
+        model_part = self._CreateModelPart()
+        sub_model_part = model_part.CreateSubModelPart("sub")
+        sub_sub_model_part = sub_model_part.CreateSubModelPart("sub_sub")
+        props = model_part.GetProperties(1)
+        # a second mesh that shares the nodes 4 and 5 with the first one
+        sub_model_part.CreateNewNode(11, 3.0, 0.0, 0.0)
+        sub_sub_model_part.CreateNewNode(12, 4.0, 1E-12, 0.0)
+        sub_sub_model_part.CreateNewNode(13, 5.0, 0.0, 0.0)
+        sub_sub_model_part.CreateNewElement("Element2D2N", 11, [11, 12], props)
+        sub_sub_model_part.CreateNewElement("Element2D2N", 12, [12, 13], props)
+        sub_model_part.CreateNewCondition("PointCondition3D1N", 11, [13], props)
+        sub_model_part.CreateNewCondition("PointCondition3D1N", 12, [12], props)
+        node_4 = model_part.GetNode(4)
+        node_13 = model_part.GetNode(13)
+
+        self.assertEqual(2, model_part.MergeCoincidentNodes())
+
+        self.assertEqual([1, 2, 3, 4, 5, 13], list(model_part.Nodes.keys()))
+        self.assertEqual([4, 5, 13], list(sub_model_part.Nodes.keys()))
+        self.assertEqual([5, 13], list(sub_sub_model_part.Nodes.keys()))
+
+        element_node_ids = {element.Id : [node.Id for node in element.GetNodes()] for element in model_part.Elements}
+        self.assertEqual({1 : [1, 2], 2 : [2, 3], 3 : [3, 4], 11 : [4, 5], 12 : [5, 13]}, element_node_ids)
+        condition_node_ids = {condition.Id : [node.Id for node in condition.GetNodes()] for condition in model_part.Conditions}
+        self.assertEqual({1 : [4], 11 : [13], 12 : [5]}, condition_node_ids)
+
+        # the existing nodes are still valid
+        self.assertEqual([3.0, 0.0, 0.0], node_4.Coordinates())
+        self.assertEqual(13, node_13.Id)
+        self.assertEqual([5.0, 0.0, 0.0], node_13.Coordinates())
+        self.assertIs(node_13, model_part.GetNode(13))
+        self.assertEqual([5.0, 0.0, 0.0], model_part.GetElement(12).GetNodes()[1].Coordinates())
+
+        # the spatial index is updated
+        self.assertEqual(6, model_part.GetNodesSpatialIndex().GetNumberOfNodes())
+        self.assertEqual([13], model_part.GetNodesSpatialIndex().FindNodesInRadius([5.0, 0.0, 0.0], 0.1).tolist())
+
+        # nothing left to merge
+        self.assertEqual(0, model_part.MergeCoincidentNodes())
+        model_part.CreateNewNode(20, 2.0, 1E-9, 0.0)
+        self.assertEqual(0, model_part.MergeCoincidentNodes(1E-12)) # not within the tolerance
+        self.assertEqual(1, model_part.MergeCoincidentNodes(1E-8))
+        self.assertEqual([2, 3], [node.Id for node in model_part.GetElement(2).GetNodes()])
+
+    def test_MergeCoincidentNodes_SubModelPart(self):
+        model_part = self._CreateModelPart()
+        sub_model_part = model_part.CreateSubModelPart("sub")
+        sub_model_part.CreateNewNode(11, 0.0, 0.0, 0.0)
+        model_part.CreateNewNode(12, 4.0, 0.0, 0.0)
+        sub_model_part.CreateNewElement("Element2D2N", 11, [11, 2], model_part.GetProperties(1))
+
+        # only the nodes of the SubModelPart are checked
+        self.assertEqual(0, sub_model_part.MergeCoincidentNodes())
+        sub_model_part.AddNodes([1])
+        self.assertEqual(1, sub_model_part.MergeCoincidentNodes())
+
+        self.assertEqual([1, 2, 3, 4, 5, 12], list(model_part.Nodes.keys()))
+        self.assertEqual([1], list(sub_model_part.Nodes.keys()))
+        self.assertEqual([1, 2], [node.Id for node in model_part.GetElement(11).GetNodes()])
+
+        self.assertEqual(1, model_part.MergeCoincidentNodes())
+        self.assertEqual([1, 2, 3, 4, 5], list(model_part.Nodes.keys()))
+
+
+@unittest.skipUnless(numpy_available, "NumPy not available")
+class TestModelPartArrayStorageNodesSpatialIndex(TestModelPartNodesSpatialIndex):
+    def setUp(self):
+        self.use_array_storage = True
+
+    def test_MergeCoincidentNodes_views(self):
+        model_part = self._CreateModelPart()
+        model_part.GetNode(2).X = 0.0
+        node_2 = model_part.GetNode(2)
+        node_3 = model_part.GetNode(3)
+        node_5 = model_part.GetNode(5)
+
+        self.assertEqual(1, model_part.MergeCoincidentNodes())
+
+        # the views of the remaining nodes are moved, the view of the merged node cannot be used anymore
+        self.assertEqual(2.0, node_3.X)
+        self.assertEqual(4.0, node_5.X)
+        self.assertEqual(2, node_2.Id)
+        with self.assertRaisesRegex(RuntimeError, 'Node #2 was removed, it cannot be used anymore!'):
+            node_2.X
+        with self.assertRaisesRegex(RuntimeError, 'Node #2 was removed, it cannot be used anymore!'):
+            node_2.X = 10.0
+        self.assertEqual([0.0, 2.0, 3.0, 4.0], model_part.Nodes.GetCoordinates()[:, 0].tolist())
+
+    def test_MergeCoincidentNodes_while_iterating(self):
+        model_part = self._CreateModelPart()
+        model_part.GetNode(2).X = 0.0
+        with self.assertRaisesRegex(RuntimeError, 'NodesArrayContainer changed during iteration'):
+            for node in model_part.Nodes:
+                if node.Id == 2:
+                    model_part.MergeCoincidentNodes()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest, os
+from unittest.mock import MagicMock, patch
+
+# plugin imports
+from kratos_salome_plugin.model_part import ModelPart
+from kratos_salome_plugin import geometries_io
+from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin.write_mdpa import WriteMdpa
+from kratos_salome_plugin import stream_mdpa
+from kratos_salome_plugin.stream_mdpa import StreamingModelPart, StreamMeshesToMdpa
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+# other imports
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+def CreateMockMesh(nodes, geometries, mesh_description, model_part_name="", with_arrays=False):
+    if with_arrays:
+        mesh_interface_mock = MagicMock(spec=MeshInterface)
+        nodes_arrays = (np.array(list(nodes.keys()), dtype=np.int64), np.array(list(nodes.values()), dtype=np.float64))
+        geometries_arrays = {entity_type : (np.array(list(entities.keys()), dtype=np.int64), np.array(list(entities.values()), dtype=np.int64)) for entity_type, entities in geometries.items()}
+        mesh_interface_mock.GetNodesAndGeometricalEntitiesArrays.return_value = (nodes_arrays, geometries_arrays)
+    else:
+        # the nodes and geometries are only provided as dicts
+        mesh_interface_mock = MagicMock(spec=[name for name in dir(MeshInterface) if name != "GetNodesAndGeometricalEntitiesArrays"])
+        mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, geometries)
+    return geometries_io.Mesh(mesh_interface_mock, mesh_description, model_part_name)
+
+def CreateMeshes(with_arrays=False):
+    # meshes with overlapping nodes and geometries in a hierarchy of SubModelParts
+    nodes_3D = {i+1 : [i+1, i*2, i+3.5] for i in range(33)}
+    geometries_3D = {"Tetra" : {i+1 : [(i+2)%33+1, (i+6)%33+1, (i+4)%33+1, (i+8)%33+1] for i in range(55)}}
+
+    nodes_2D = {i+1 : [i+1, i*2, i+3.5] for i in range(15)}
+    geometries_2D = {"Triangle" : {i+1 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(25)}}
+
+    nodes_1D = {i+1 : [i+18, i*20, i-23.5] for i in range(66, 88)}
+    geometries_1D = {"Edge" : {i+1 : [i+67, i+68] for i in range(12)}}
+    geometries_0D = {"Node" : {x : [x] for x in sorted(nodes_1D.keys())}}
+
+    return [
+        CreateMockMesh(nodes_3D, geometries_3D, {"elements" : {"Tetra" : {"Element3D4N" : 4}}}, "domain", with_arrays),
+        CreateMockMesh(nodes_2D, geometries_2D, {
+            "elements"   : {"Triangle" : {"Element3D3N" : 11}},
+            "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 16}}
+        }, "domain.surface", with_arrays),
+        # same geometries again, the existing entities are added
+        CreateMockMesh(nodes_2D, geometries_2D, {"conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 16}}}, "surface_again", with_arrays),
+        CreateMockMesh(nodes_1D, geometries_1D, {"conditions" : {"Edge" : {"LineCondition3D2N" : 22}}}, "domain.edges", with_arrays),
+        CreateMockMesh(nodes_1D, geometries_0D, {"conditions" : {"Node" : {"PointCondition3D1N" : 22}}}, "domain.edges.points", with_arrays),
+        CreateMockMesh(nodes_3D, geometries_3D, {"elements" : {"Tetra" : {"Element3D4N" : 4}}}, "", with_arrays)
+    ]
+
+
+class TestStreamMdpa(unittest.TestCase):
+    def test_StreamMeshesToMdpa(self):
+        # the file has to be the same as when creating a ModelPart and writing it
+        file_name_ref = "stream_mdpa_ref.mdpa"
+        file_name = "stream_mdpa.mdpa"
+
+        model_part = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part, CreateMeshes())
+        WriteMdpa(model_part, file_name_ref, "some info", write_creation_time=False)
+
+        StreamMeshesToMdpa(CreateMeshes(), file_name, "some info", write_creation_time=False)
+
+        with open(file_name_ref) as ref_file, open(file_name) as out_file:
+            self.assertEqual(ref_file.read(), out_file.read())
+
+        os.remove(file_name_ref)
+        os.remove(file_name)
+
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_StreamMeshesToMdpa_arrays_in_slices(self):
+        # the arrays are written in slices, which must not change the file
+        file_name_ref = "stream_mdpa_arrays_ref.mdpa"
+        file_name = "stream_mdpa_arrays.mdpa"
+
+        model_part = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part, CreateMeshes())
+        WriteMdpa(model_part, file_name_ref, "some info", write_creation_time=False)
+
+        meshes = CreateMeshes(with_arrays=True)
+        with patch.object(stream_mdpa, "STREAM_CHUNK_SIZE", 7):
+            StreamMeshesToMdpa(meshes, file_name, "some info", write_creation_time=False)
+
+        for mesh in meshes:
+            mesh.mesh_interface.GetNodesAndGeometricalEntitiesArrays.assert_called()
+            mesh.mesh_interface.GetNodesAndGeometricalEntities.assert_not_called()
+
+        with open(file_name_ref) as ref_file, open(file_name) as out_file:
+            self.assertEqual(ref_file.read(), out_file.read())
+
+        os.remove(file_name_ref)
+        os.remove(file_name)
+
+    def test_StreamingModelPart_hierarchy(self):
+        with StreamingModelPart() as model_part:
+            geometries_io.GeometriesIO.AddMeshes(model_part, CreateMeshes())
+
+            self.assertEqual(33+22, model_part.NumberOfNodes())
+            self.assertEqual(55+25, model_part.NumberOfElements())
+            self.assertEqual(25+12+22, model_part.NumberOfConditions())
+            self.assertEqual([4, 11, 16, 22], list(model_part.Properties.keys()))
+
+            smp_surface = model_part.GetSubModelPart("domain").GetSubModelPart("surface")
+            self.assertEqual("default.domain.surface", smp_surface.FullName())
+            self.assertEqual(list(range(1, 16)), list(smp_surface.Nodes.keys()))
+            self.assertEqual(list(range(56, 81)), list(smp_surface.Elements.keys()))
+            self.assertEqual(list(range(1, 26)), list(smp_surface.Conditions.keys()))
+
+            # the existing conditions were added
+            smp_surface_again = model_part.GetSubModelPart("surface_again")
+            self.assertEqual(list(range(1, 26)), list(smp_surface_again.Conditions.keys()))
+            self.assertEqual([16], list(smp_surface_again.Properties.keys()))
+
+            self.assertEqual(16, model_part.GetCondition(3).Properties.Id)
+            with self.assertRaisesRegex(RuntimeError, 'Condition index not found: 60'):
+                model_part.GetCondition(60)
+
+    def test_non_consecutive_ids(self):
+        with StreamingModelPart() as model_part:
+            props = model_part.CreateNewProperties(1)
+            model_part.CreateNewNodes([1, 2, 3], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+            model_part.CreateNewElements("Element2D3N", [1], [[1, 2, 3]], props)
+
+            with self.assertRaisesRegex(RuntimeError, 'The Elements have to be created with consecutive Ids, starting with Id 2!'):
+                model_part.CreateNewElements("Element2D3N", [3], [[1, 2, 3]], props)
+
+    def test_existing_nodes_are_written_once(self):
+        file_name = "stream_mdpa_nodes.mdpa"
+        with StreamingModelPart() as model_part:
+            model_part.CreateNewNodes([1, 2], [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+            smp = model_part.CreateSubModelPart("smp")
+            smp.CreateNewNodes([2, 3], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+
+            self.assertEqual(3, model_part.NumberOfNodes())
+            self.assertEqual(2, smp.NumberOfNodes())
+
+            model_part.WriteMdpa(file_name, write_creation_time=False)
+
+        with open(file_name) as mdpa_file:
+            self.assertEqual(3, sum(1 for line in mdpa_file if line.startswith("\t") and "." in line))
+
+        os.remove(file_name)
+
+    def test_WriteMdpa_from_SubModelPart(self):
+        with StreamingModelPart() as model_part:
+            smp = model_part.CreateSubModelPart("smp")
+            with self.assertRaisesRegex(RuntimeError, 'The mdpa file can only be written from the root ModelPart, not from SubModelPart "default.smp"'):
+                smp.WriteMdpa("abc")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,13 +13,16 @@ import initialize_testing_environment
 
 # python imports
 import unittest, os
+from unittest.mock import patch, MagicMock
 
 # plugin imports
 from kratos_salome_plugin.model_part import ModelPart
 from kratos_salome_plugin import write_mdpa
 
 # tests imports
-from testing_utilities import GetTestsDir, CompareMdpaWithReferenceFile, ModelPartForTests
+from testing_utilities import GetTestsDir, CompareMdpaWithReferenceFile, ModelPartForTests, CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
 
 class TestWriteMdpa(unittest.TestCase):
     def test_WriteHeaderMdpa(self):
@@ -153,6 +156,31 @@ class TestWriteMdpa(unittest.TestCase):
 
         CompareMdpaWithReferenceFile(file_name, self)
 
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_WriteEntityDataMdpa_nodes_multiple_data_array_storage(self):
+        mp = ModelPart(use_array_storage=True)
+        for i in range(8):
+            mp.CreateNewNode(i+1, 0.0, 0.0, 0.0) # coordinates do not matter here
+
+        # setting the data in reversed order, the output has to be in the order of the nodes
+        for i in reversed(range(8)):
+            node = mp.GetNode(i+1)
+            node.SetValue("Card", 15.336*i)
+            if i%2==1:
+                node.SetValue("kMui", [2, 3.3, -78.1, i+2]) # vector
+            if i%4==3:
+                node.SetValue("SomeMatrix", [[2, i+2, 3.3], [i+2, 5.3, 7.456]]) # matrix
+                node.SetValue("TheString", "SmallDisp"+str(i))
+            if i==6 or i==7:
+                node.SetValue("CustomDisp", 5*i)
+                node.SetValue("REACTION_X", -2*i)
+
+        file_name = "multiple_entity_data_nodes.mdpa"
+        with open(file_name, 'w') as mdpa_file:
+            write_mdpa._WriteEntityDataMdpa(mp.Nodes, "Nod", mdpa_file)
+
+        CompareMdpaWithReferenceFile(file_name, self)
+
     def test_WriteEntityDataMdpa_elements(self):
         mp = ModelPart()
         mp.CreateNewNode(1, 0.0, 0.0, 0.0) # coordinates do not matter here
@@ -257,10 +285,52 @@ class TestWriteMdpa(unittest.TestCase):
 
         CompareMdpaWithReferenceFile(file_name, self)
 
+    @unittest.skipUnless(numpy_available, "NumPy not available")
+    def test_WriteMdpa_array_storage(self):
+        mp = CreateFullModelPart(use_array_storage=True)
+        additional_header_info = "The very cool model"
+        file_name = "full_model_part.mdpa"
+        write_mdpa.WriteMdpa(mp, file_name, additional_header_info)
+
+        CompareMdpaWithReferenceFile(file_name, self)
 
-def CreateFullModelPart():
+    def test_WriteMdpa_small_chunks(self):
+        # the blocks are written in chunks, checking that the boundaries of the chunks are handled correctly
+        for use_array_storage in [False, True] if numpy_available else [False]:
+            with self.subTest(use_array_storage=use_array_storage):
+                mp = CreateFullModelPart(use_array_storage)
+                additional_header_info = "The very cool model"
+                file_name = "full_model_part.mdpa"
+                with patch.object(write_mdpa, 'CHUNK_SIZE', 2):
+                    write_mdpa.WriteMdpa(mp, file_name, additional_header_info)
+
+                CompareMdpaWithReferenceFile(file_name, self)
+
+    def test_WriteMdpa_multiple_workers(self):
+        # the chunks are formatted in parallel, the file has to be the same as when writing in serial
+        for use_array_storage in [False, True] if numpy_available else [False]:
+            with self.subTest(use_array_storage=use_array_storage):
+                mp = CreateFullModelPart(use_array_storage)
+                additional_header_info = "The very cool model"
+                file_name = "full_model_part.mdpa"
+                with patch.object(write_mdpa, 'CHUNK_SIZE', 2):
+                    write_mdpa.WriteMdpa(mp, file_name, additional_header_info, num_workers=2)
+
+                CompareMdpaWithReferenceFile(file_name, self)
+
+    def test_GetChunkSize(self):
+        executor = MagicMock()
+        self.assertEqual(write_mdpa.CHUNK_SIZE, write_mdpa._GetChunkSize(10**6))
+        self.assertEqual(write_mdpa.CHUNK_SIZE, write_mdpa._GetChunkSize(None, executor))
+        self.assertEqual(write_mdpa.CHUNK_SIZE, write_mdpa._GetChunkSize(10**8, executor))
+        # smaller blocks are split into more chunks, such that all processes are used
+        self.assertEqual(5000, write_mdpa._GetChunkSize(5000*write_mdpa.MAX_PENDING_CHUNKS, executor))
+        self.assertEqual(write_mdpa.MIN_CHUNK_SIZE, write_mdpa._GetChunkSize(10, executor))
+
+
+def CreateFullModelPart(use_array_storage=False):
     # just creating a full ModelPart for testing
-    mp = ModelPart()
+    mp = ModelPart(use_array_storage=use_array_storage)
     mp.SetValue("Card", 15.336)
     mp.SetValue("kMui", [2, 3.3, 15.78, -33.74, 36.01, 72.1])
     mp.SetValue("SomeMatrix", [[2, 3.3, 10.4, 11.2, 0.33], [5.3, 456, 88.123, 101.3, 7.456], [1.129,2.129,3.129,4.129,5.129]])
@@ -17,6 +17,7 @@ import initialize_testing_environment
 from pathlib import Path
 import unittest
 import os
+import threading
 from sys import version_info as py_version_info
 from shutil import rmtree
 
@@ -54,6 +55,30 @@ def CheckIfKratosAvailable():
         except:
             return False
 
+def CheckIfNumpyAvailable():
+    if "NUMPY_AVAILABLE" in os.environ:
+        # this is intended to be used in the CI
+        # there "try-except" might lead to an undiscovered failure
+        return (os.environ["NUMPY_AVAILABLE"] == "1")
+    else:
+        try:
+            import numpy
+            return True
+        except:
+            return False
+
+def CheckIfH5pyAvailable():
+    if "H5PY_AVAILABLE" in os.environ:
+        # this is intended to be used in the CI
+        # there "try-except" might lead to an undiscovered failure
+        return (os.environ["H5PY_AVAILABLE"] == "1")
+    else:
+        try:
+            import h5py
+            return True
+        except:
+            return False
+
 def CheckIfApplicationsAvailable(*application_names):
     raise Exception("This function is untested!")
     if not CheckIfKratosAvailable():
@@ -612,3 +637,111 @@ class ModelPartForTests:
                 props = props_1
 
             mp.CreateNewCondition("SurfaceCondition3D3N", i+1, [i%3+1,i%6+1,i%2+1], props)
+
+
+class SalomeMeshStandIn:
+    """Stand-in for a mesh of Salome (SMESH), for testing the extraction of meshes without Salome
+    It provides the methods that are used by the MeshInterface and counts how often they are called
+    Keyword arguments:
+    nodes -- dict with the coordinates of the nodes {node_id : [x, y, z]}
+    elements -- dict with the connectivities of the elements {element_id : [node_ids]}
+    renumber_in_export -- whether the Ids are renumbered (consecutively) in the exported files, like older versions of Salome do it
+    """
+    def __init__(self, nodes, elements=None, renumber_in_export=False):
+        self.nodes = nodes
+        self.elements = elements if elements is not None else {}
+        self.renumber_in_export = renumber_in_export
+        self.num_calls = {"GetNodeXYZ" : 0, "GetElemNodes" : 0, "ExportPartToDAT" : 0}
+        self.__num_calls_lock = threading.Lock() # the mesh can be accessed from multiple threads
+
+    def GetMesh(self):
+        return self
+
+    def GetNodesId(self):
+        return list(self.nodes.keys())
+
+    def GetNodeIDs(self):
+        return list(self.nodes.keys())
+
+    def GetNodeXYZ(self, node_id):
+        self.__CountCall("GetNodeXYZ")
+        return list(self.nodes[node_id])
+
+    def GetElemNodes(self, element_id):
+        self.__CountCall("GetElemNodes")
+        return list(self.elements[element_id])
+
+    def __CountCall(self, method_name):
+        with self.__num_calls_lock:
+            self.num_calls[method_name] += 1
+
+    def ExportPartToDAT(self, mesh_part, file_name, renumber=True):
+        # the format of the DAT files exported by Salome, the type of the elements is (100*dimension + number of nodes)
+        self.__CountCall("ExportPartToDAT")
+        with open(file_name, "w") as dat_file:
+            dat_file.write("{} {}\n".format(len(self.nodes), len(self.elements)))
+            for i, (node_id, coords) in enumerate(sorted(self.nodes.items())):
+                if self.renumber_in_export:
+                    node_id = i+1
+                dat_file.write("{} {:.14e} {:.14e} {:.14e}\n".format(node_id, *coords))
+            for i, (element_id, connectivity) in enumerate(sorted(self.elements.items())):
+                if self.renumber_in_export:
+                    element_id = i+1
+                dat_file.write("{} {} {} \n".format(element_id, 300+len(connectivity), " ".join(str(node_id) for node_id in connectivity)))
+
+
+def WriteMedFile(file_name, mesh_name, nodes, cells, groups=None, dimension=3, write_ids=True):
+    """Writes a mesh to a MED file (only the datasets that are read by the plugin), for testing the reading of MED files without Salome
+    Keyword arguments:
+    nodes -- dict with the coordinates of the nodes {node_id : [x, y, z]}, written in this order
+    cells -- dict with the connectivities of the entities per type of MED {med_type : {entity_id : [node_ids]}}
+    groups -- dict with the Ids of the nodes and entities in the groups {group_name : (node_ids, entities_ids)}
+    dimension -- the dimension of the coordinates
+    write_ids -- whether the Ids are written, otherwise they are consecutive
+    """
+    import numpy as np
+    import h5py
+    groups = groups if groups is not None else {}
+
+    def GetFamilies(ids, group_index, sign, families):
+        # every combination of groups is a family
+        entities_families = []
+        for entity_id in ids:
+            entity_groups = tuple(name for name in sorted(groups) if entity_id in groups[name][group_index])
+            if len(entity_groups) == 0:
+                entities_families.append(0)
+            else:
+                entities_families.append(families.setdefault(entity_groups, sign*(len(families)+1)))
+        return entities_families
+
+    with h5py.File(file_name, "w") as med_file:
+        mesh = med_file.create_group("ENS_MAA/"+mesh_name)
+        mesh.attrs["ESP"] = dimension
+        mesh.attrs["DIM"] = dimension
+        time_step = mesh.create_group("-0000000000000000001-0000000000000000001")
+
+        node_ids = list(nodes.keys())
+        node_positions = {node_id : i+1 for i, node_id in enumerate(node_ids)}
+        time_step["NOE/COO"] = np.array([coords[:dimension] for coords in nodes.values()], dtype=np.float64).T.ravel()
+        node_families = {}
+        time_step["NOE/FAM"] = GetFamilies(node_ids, 0, 1, node_families)
+        if write_ids:
+            time_step["NOE/NUM"] = np.array(node_ids, dtype=np.int32)
+
+        element_families = {}
+        for med_type, entities in cells.items():
+            connectivities = [[node_positions[node_id] for node_id in connectivity] for connectivity in entities.values()]
+            if med_type == "POG":
+                time_step["MAI/POG/NOD"] = np.array([position for connectivity in connectivities for position in connectivity], dtype=np.int32)
+                time_step["MAI/POG/INN"] = np.cumsum([1]+[len(connectivity) for connectivity in connectivities]).astype(np.int32)
+            else:
+                time_step["MAI/{}/NOD".format(med_type)] = np.array(connectivities, dtype=np.int32).T.ravel()
+            time_step["MAI/{}/FAM".format(med_type)] = GetFamilies(list(entities.keys()), 1, -1, element_families)
+            if write_ids:
+                time_step["MAI/{}/NUM".format(med_type)] = np.array(list(entities.keys()), dtype=np.int32)
+
+        for family_type, families in (("NOEUD", node_families), ("ELEME", element_families)):
+            for entity_groups, family_number in families.items():
+                family = med_file.create_group("FAS/{}/{}/FAM_{}".format(mesh_name, family_type, family_number))
+                family.attrs["NUM"] = family_number
+                family["GRO/NOM"] = np.array([list(name.encode().ljust(80, b"\0")) for name in entity_groups], dtype=np.int8)
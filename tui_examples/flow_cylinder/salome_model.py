@@ -139,14 +139,18 @@ for mesh_factor in [2.0, 1.0, 0.5]:
 
     # https://docs.salome-platform.org/latest/tui/KERNEL/kernel_salome.html
     # saving the study such that it can be loaded in Salome
-    salome.myStudy.SaveAs("flow_cylinder_{}.hdf".format(mesh_factor), False, False) # args: use_multifile, use_acsii
+    study_file_name = "flow_cylinder_{}.hdf".format(mesh_factor)
+    salome.myStudy.SaveAs(study_file_name, False, False) # args: use_multifile, use_acsii
+
+    # the extracted meshes are stored next to the study, hence they are not extracted again if they did not change
+    disk_cache = create_kratos_input_tui.CreateMeshDiskCache(study_file_name)
 
     meshes = [
-        create_kratos_input_tui.SalomeMesh(domain_1, mesh_description_domain, "domain"),
-        create_kratos_input_tui.SalomeMesh(mesh_inlet, mesh_description_wall, "inlet"),
-        create_kratos_input_tui.SalomeMesh(mesh_outlet, mesh_description_wall, "outlet"),
-        create_kratos_input_tui.SalomeMesh(mesh_walls, mesh_description_wall, "walls"),
-        create_kratos_input_tui.SalomeMesh(mesh_cyl_boundary, mesh_description_wall, "cyl_boundary"),
+        create_kratos_input_tui.SalomeMesh(domain_1, mesh_description_domain, "domain", disk_cache),
+        create_kratos_input_tui.SalomeMesh(mesh_inlet, mesh_description_wall, "inlet", disk_cache),
+        create_kratos_input_tui.SalomeMesh(mesh_outlet, mesh_description_wall, "outlet", disk_cache),
+        create_kratos_input_tui.SalomeMesh(mesh_walls, mesh_description_wall, "walls", disk_cache),
+        create_kratos_input_tui.SalomeMesh(mesh_cyl_boundary, mesh_description_wall, "cyl_boundary", disk_cache),
     ]
 
     create_kratos_input_tui.CreateMdpaFile(meshes, "flow_cylinder_{}".format(mesh_factor))